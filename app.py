@@ -1,6 +1,7 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_from_directory, Response
+from markupsafe import escape
 import os
-import threading
+import uuid
 from werkzeug.utils import secure_filename
 
 # Production environment setup
@@ -9,43 +10,65 @@ if os.environ.get('FLASK_ENV') == 'production':
 else:
     debug_mode = True
 
-from rag_summary import (
-    analyze_resume_text,
-    analyze_job_text,
-    match_resume_with_job,
-    extract_text_from_resume,
-    normalize_resume_json,
-    normalize_skills,
-    calculate_match_percentage
-)
+from rag_summary import extract_text_with_hash
 
 from database import (
     add_job_post,
     get_all_job_posts,
     get_all_resumes,
-    add_resume,
     get_resume_by_id,
     get_job_post_by_id,
-    update_resume_summary,
     verify_admin,
-    filter_resumes_by_keyword,
-    get_job_matches,
-    init_db
+    get_job_matches_version,
+    get_job_analysis,
+    get_stored_job_matches,
+    init_db,
+    get_ingest_job_by_token,
+    update_resume_text_hash,
+    get_resumes_by_ids,
+    count_resumes,
+    get_resumes_page,
+    search_resumes,
+    iter_resumes,
+    EXPORT_COLUMNS,
+    SNIPPET_OPEN,
+    SNIPPET_CLOSE
 )
+from ingest_queue import enqueue_resume, start_ingest_workers
+from matching_engine import SCORER_VERSION
+from matching_runs import start_matching_run, get_matching_run, get_active_run_for_job, stream_events
+from topk_ranking import top_k_matches, DEFAULT_K, MAX_K
+from semantic_index import get_semantic_index
+from job_profiles import analyze_job_post
+import metrics
+from request_profiler import install_profiler, list_profiles, get_profile, top_functions, PROFILE_DIR, SORT_KEYS
 
 app = Flask(__name__)
 app.secret_key = 'your_secret_key_here'
+# Admin: X-Profile: 1 header ya ?_profile=1 se ek request profile hoti hai
+install_profiler(app)
 
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
+# Prometheus scraper ke liye (admin session ke bina): Authorization: Bearer <METRICS_TOKEN>
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 # DB init
 init_db()
 
+# Background ingestion workers - har server process mein (gunicorn workers bhi,
+# FLASK_ENV chahe kuch ho). Sirf `python app.py` debug reloader ka parent skip
+# hota hai, woh khud requests serve nahi karta; aur spawn kiya hua child
+# process (__mp_main__) bhi.
+if __name__ != "__mp_main__" and not (
+        __name__ == "__main__" and debug_mode and os.environ.get("WERKZEUG_RUN_MAIN") != "true"):
+    start_ingest_workers()
+
 # =========================
 # HELPERS
 # =========================
@@ -53,13 +76,25 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def _matching_run_response(run):
+    """202 + run id/urls for a background matching run"""
+    return jsonify({
+        "success": True,
+        "job_id": run.job_id,
+        "run_id": run.id,
+        "status_url": url_for("api_matching_run", run_id=run.id),
+        "events_url": url_for("api_matching_run_events", run_id=run.id),
+        "cancel_url": url_for("api_cancel_matching_run", run_id=run.id)
+    }), 202
+
+
 # =========================
 # ROUTES
 # =========================
 
 @app.route("/")
 def home():
-    return render_template("index.html")
+    return render_template("index.html", ingest_token=request.args.get("ingest"))
 
 @app.route("/", methods=["POST"])
 def home_post():
@@ -82,58 +117,16 @@ def home_post():
             return redirect(url_for("home"))
 
         if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
+            # Unique prefix - same naam ki doosri upload queue wait ke dauraan is file ko overwrite na kare
+            filename = f"{uuid.uuid4().hex[:12]}_{secure_filename(file.filename)}"
             file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
             file.save(file_path)
 
-            # Extract text and generate summary
-            resume_text = extract_text_from_resume(file_path)
-            print(f"DEBUG: Extracted resume text length: {len(resume_text)}")
-            
-            if resume_text:
-                try:
-                    print("DEBUG: Starting resume analysis...")
-                    resume_analysis = analyze_resume_text(resume_text)
-                    print(f"DEBUG: Resume analysis: {resume_analysis}")
-                    
-                    # Generate summary from analysis
-                    if resume_analysis and resume_analysis.get("skills"):
-                        skills_str = ", ".join(resume_analysis["skills"][:5])
-                        exp_years = resume_analysis.get("experience_years", 0)
-                        role_level = resume_analysis.get("role_level", "professional")
-                        
-                        summary = f"• {role_level.title()} technology professional with {exp_years}+ years of experience.\n"
-                        summary += f"• Proficient in {skills_str} with focus on scalable solutions.\n"
-                        
-                        if resume_analysis.get("projects_count", 0) > 0:
-                            summary += f"• Successfully delivered {resume_analysis['projects_count']} technical projects.\n"
-                        
-                        if resume_analysis.get("domain") and resume_analysis["domain"] != "general":
-                            summary += f"• Strong background in {resume_analysis['domain'].title()} industry.\n"
-                        
-                        if resume_analysis.get("key_achievements"):
-                            summary += f"• Experience with {', '.join(resume_analysis['key_achievements'][:2])}."
-                    else:
-                        summary = "• Technology professional with comprehensive software development expertise."
-                        
-                    print(f"DEBUG: Generated summary: {summary}")
-                        
-                except Exception as e:
-                    print(f"DEBUG: Resume analysis failed: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    summary = "• Technology professional with comprehensive software development expertise."
-            else:
-                print("DEBUG: No resume text extracted")
-                summary = "• Could not extract text from resume. Please check file format."
+            # Extraction + AI analysis background worker mein hoga
+            ingest_token = enqueue_resume(name, email, phone, file_path)
 
-            # Add to database
-            print(f"FINAL SUMMARY BEING SAVED:\n{summary}")
-            add_resume(name, email, phone, "", file_path, summary)
-            print("DEBUG: Resume saved to database successfully")
-
-            flash("Resume submitted successfully!")
-            return redirect(url_for("home"))
+            flash("Resume submitted successfully! We are processing it now.")
+            return redirect(url_for("home", ingest=ingest_token))
         else:
             flash("Invalid file format! Please upload PDF, DOC, or DOCX file.")
             return redirect(url_for("home"))
@@ -170,8 +163,13 @@ def admin_candidate_detail(candidate_id):
     if not candidate:
         flash("Candidate not found", "error")
         return redirect(url_for("admin_dashboard"))
+
+    # Extracted text DB cache se aata hai; file badli ho toh re-extract
+    resume_text, text_sha256 = extract_text_with_hash(candidate[5])
+    if text_sha256 and text_sha256 != candidate[7]:
+        update_resume_text_hash(candidate_id, text_sha256)
     
-    return render_template("candidate_detail.html", candidate=candidate)
+    return render_template("candidate_detail.html", candidate=candidate, resume_text=resume_text)
 
 
 @app.route("/admin/logout")
@@ -196,20 +194,19 @@ def admin_dashboard():
     if page < 1:
         page = 1
     
-    resumes = get_all_resumes()
-    
-    print(f"DEBUG: Total resumes found: {len(resumes)}")
+    # Sirf current page DB se aata hai; total counter table se
+    total = count_resumes()
+    cursor = request.args.get('cursor', type=int)
+    paginated_resumes = get_resumes_page(per_page, offset=(page - 1) * per_page, before_id=cursor)
     
-    # Pagination logic
-    total = len(resumes)
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated_resumes = resumes[start:end]
+    print(f"DEBUG: Total resumes found: {total}")
     
+    end = page * per_page
     has_prev = page > 1
     has_next = end < total
     prev_page = page - 1 if has_prev else None
     next_page = page + 1 if has_next else None
+    next_cursor = paginated_resumes[-1][0] if paginated_resumes and has_next else None
     
     return render_template(
         "admin_dashboard.html", 
@@ -219,6 +216,7 @@ def admin_dashboard():
         has_next=has_next,
         prev_page=prev_page,
         next_page=next_page,
+        next_cursor=next_cursor,
         total=total,
         per_page=per_page
     )
@@ -233,156 +231,53 @@ def admin_jobs():
     if not session.get("admin_logged_in"):
         return redirect(url_for("admin_login"))
 
-    jobs_with_matches = []
-
     if request.method == "POST":
         title = request.form.get("title")
         description = request.form.get("description")
 
         if title and description:
-            # Add job to database
-            add_job_post(title, description)
-            flash("Job posted successfully", "success")
-            
-            print(f"\n🔍 ANALYZING JOB: {title}")
-            print(f"Description: {description}")
-            
-            # ========================================
-            # 🔥 AI MATCHING LOGIC - FULLY FIXED
-            # ========================================
-            resumes = get_all_resumes()
-            match_results = []
-
-            for r in resumes:
-                resume_path = r[5]
-                if not resume_path or not os.path.exists(resume_path):
-                    continue
-
-                resume_text = extract_text_from_resume(resume_path)
-                if not resume_text:
-                    continue
-
-                # AI extracts data ONLY
-                ai_raw = match_resume_with_job(resume_text, description)
-                
-                # ========================================
-                # 🔥 NORMALIZE JD JSON
-                # ========================================
-                raw_jd = ai_raw.get("job_data", {})
-                jd_json = {
-                    "skills": raw_jd.get("must_have", []) if isinstance(raw_jd.get("must_have"), list) else [],
-                    "projects": raw_jd.get("projects_required", []) if isinstance(raw_jd.get("projects_required"), list) else [],
-                    "experience_years": raw_jd.get("experience_years_required", 0) if isinstance(raw_jd.get("experience_years_required"), (int, float)) else 0
-                }
-                
-                # ========================================
-                # 🔥 NORMALIZE & CLEAN RESUME JSON
-                # ========================================
-                raw_resume = ai_raw.get("resume_data", {})
-                normalized_resume = normalize_resume_json(raw_resume)
-                
-                GARBAGE_VALUES = {
-                    "project", "projects", "experience", "experiences",
-                    "requirement", "requirements", "skill", "skills",
-                    "year", "years", "work", "education", "any", "the"
-                }
-                
-                # Clean JD skills - remove duplicates and garbage
-                jd_skills_clean = []
-                jd_seen = set()
-                for skill in jd_json["skills"]:
-                    skill_lower = str(skill).strip().lower()
-                    if skill_lower and skill_lower not in GARBAGE_VALUES and skill_lower not in jd_seen and len(skill_lower) > 1:
-                        jd_skills_clean.append(skill_lower)
-                        jd_seen.add(skill_lower)
-                
-                # Clean Resume skills - remove duplicates and garbage
-                resume_skills_clean = []
-                resume_seen = set()
-                for skill in normalized_resume.get("skills", []):
-                    skill_lower = str(skill).strip().lower()
-                    if skill_lower and skill_lower not in GARBAGE_VALUES and skill_lower not in resume_seen and len(skill_lower) > 1:
-                        resume_skills_clean.append(skill_lower)
-                        resume_seen.add(skill_lower)
-                
-                # Final clean JSON structures
-                jd_json["skills"] = jd_skills_clean
-                
-                resume_json = {
-                    "skills": resume_skills_clean,
-                    "projects": normalized_resume.get("projects", []) if isinstance(normalized_resume.get("projects"), list) else [],
-                    "experience_years": normalized_resume.get("experience_years", 0) if isinstance(normalized_resume.get("experience_years"), (int, float)) else 0
-                }
-
-                # ========================================
-                # 🔥 CALCULATE FINAL PERCENTAGE
-                # ========================================
-                final_percentage = calculate_match_percentage(jd_json, resume_json)
-                
-                # Find matched skills for UI display (no duplicates)
-                matched_skills_for_ui = []
-                matched_seen = set()
-                
-                for skill in resume_skills_clean:
-                    if skill in jd_skills_clean and skill not in matched_seen:
-                        matched_skills_for_ui.append(skill)
-                        matched_seen.add(skill)
-                
-                # Debug logging
-                print("\n" + "=" * 70)
-                print(f"📋 CANDIDATE: {r[1]}")
-                print("=" * 70)
-                print(f"📝 JD REQUIRES: {jd_json['skills']}")
-                print(f"📄 RESUME HAS: {resume_json['skills']}")
-                print(f"✅ MATCHED: {matched_skills_for_ui}")
-                print(f"🎯 PERCENTAGE: {final_percentage}%")
-                print("=" * 70 + "\n")
-
-                match_results.append({
-                    "name": r[1],
-                    "email": r[2],
-                    "match": final_percentage,  # <--- Ye 'match' key hona zaroori hai
-                    "match_percentage": final_percentage,  # For consistency
-                    "suggestions": ai_raw.get("explanation", ""),
-                    "matched_skills": matched_skills_for_ui,
-                    "missing_skills": [],
-                    "summary": r[6] if len(r) > 6 else ""
-                })
-
-            # Sort by percentage (highest first)
-            match_results.sort(key=lambda x: x["match_percentage"], reverse=True)
-            
-            # Get latest job post for display
-            posts = get_all_job_posts()
-            latest_post = posts[0] if posts else None
-            
-            if latest_post:
-                jobs_with_matches.append({
-                    "job": latest_post,
-                    "matches": match_results
-                })
+            # JD analysis + matching background run mein - request turant return
+            job_id = add_job_post(title, description)
+            run = start_matching_run(job_id)
+            print(f"\n🔍 JOB {job_id} POSTED: {title} (matching run {run.id})")
+            flash("Job posted successfully - matching candidates...", "success")
+            return redirect(url_for("admin_jobs", run=run.id))
+        return redirect(url_for("admin_jobs"))
+
+    jobs_with_matches = []
+    active_run = None
+
+    # ?run=<id> - us run ki live list (SSE), warna latest job
+    run = get_matching_run(request.args.get("run", ""))
+    if run:
+        job_post = get_job_post_by_id(run.job_id)
     else:
-        # GET request - show latest job with its matches
         posts = get_all_job_posts()
-        latest_post = posts[0] if posts else None
-        
-        if latest_post:
-            matches = get_job_matches(latest_post[0])
-            # Ensure matches have both 'match' and 'match_percentage' keys
-            formatted_matches = []
-            for match in matches:
-                if isinstance(match, dict):
-                    match['match'] = match.get('match_percentage', 0)
-                formatted_matches.append(match)
-            
-            jobs_with_matches.append({
-                "job": latest_post,
-                "matches": formatted_matches
-            })
+        job_post = posts[0] if posts else None
+        run = get_active_run_for_job(job_post[0]) if job_post else None
+
+    if job_post:
+        jd_json = None
+        matches = []
+        if run and not run.finished:
+            # Scoring abhi chal rahi hai - page JS se events stream karega
+            active_run = run.progress()
+        else:
+            # Page par sirf top k (stored resume analyses se) - page view par koi run start nahi
+            jd_json = get_job_analysis(job_post[0])
+            if jd_json is not None:
+                k = max(1, min(request.args.get("k", DEFAULT_K, type=int), MAX_K))
+                matches = top_k_matches(jd_json, k)
+        jobs_with_matches.append({
+            "job": job_post,
+            "matches": matches,
+            "analyzed": jd_json is not None
+        })
 
     return render_template(
         "admin_jobs.html",
-        jobs_with_matches=jobs_with_matches
+        jobs_with_matches=jobs_with_matches,
+        active_run=active_run
     )
 
 
@@ -398,6 +293,150 @@ def api_get_jobs():
     })
 
 
+@app.route("/api/add_job", methods=["POST"])
+def api_add_job():
+    """Create a job post and start its matching run in the background (202 + run id)"""
+    if not session.get("admin_logged_in"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    data = request.get_json(silent=True) or request.form
+    title = (data.get("title") or "").strip()
+    description = (data.get("description") or data.get("requirements") or "").strip()
+    if not title or not description:
+        return jsonify({"success": False, "error": "title and description are required"}), 400
+
+    job_id = add_job_post(title, description)
+    return _matching_run_response(start_matching_run(job_id))
+
+
+@app.route("/api/matching_runs/<run_id>")
+def api_matching_run(run_id):
+    """Run progress + results scored so far (highest first)"""
+    if not session.get("admin_logged_in"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    run = get_matching_run(run_id)
+    if not run:
+        return jsonify({"error": "Matching run not found"}), 404
+    return jsonify({**run.progress(), "results": run.results()})
+
+
+@app.route("/api/matching_runs/<run_id>/events")
+def api_matching_run_events(run_id):
+    """Server-Sent Events: status, one 'result' per scored candidate, then 'done'"""
+    if not session.get("admin_logged_in"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    run = get_matching_run(run_id)
+    if not run:
+        return jsonify({"error": "Matching run not found"}), 404
+
+    # Browser reconnect par Last-Event-ID bhejta hai - wahin se aage
+    last_event_id = request.headers.get("Last-Event-ID", type=int)
+    return Response(
+        stream_events(run, -1 if last_event_id is None else last_event_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.route("/api/matching_runs/<run_id>/cancel", methods=["POST"])
+def api_cancel_matching_run(run_id):
+    if not session.get("admin_logged_in"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    run = get_matching_run(run_id)
+    if not run:
+        return jsonify({"error": "Matching run not found"}), 404
+    return jsonify({"success": run.cancel(), **run.progress()})
+
+
+@app.route("/api/jobs/<int:job_id>/analysis", methods=["GET", "POST"])
+def api_job_analysis(job_id):
+    """GET = stored JD analysis, POST = re-analyze the JD with the LLM"""
+    if not session.get("admin_logged_in"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    profile = analyze_job_post(job_id, force=request.method == "POST")
+    if profile is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify({"job_id": job_id, "analysis": profile})
+
+
+@app.route("/api/jobs/<int:job_id>/semantic_matches")
+def api_semantic_matches(job_id):
+    """Top-k candidates by embedding similarity to the job description"""
+    if not session.get("admin_logged_in"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    job = get_job_post_by_id(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    k = max(1, min(request.args.get("k", 20, type=int), 500))
+    hits = get_semantic_index().search(f"{job[1]}\n{job[2]}", k)
+    resumes = get_resumes_by_ids([resume_id for resume_id, _ in hits])
+
+    return jsonify([{
+        "id": resume_id,
+        "name": resumes[resume_id][1],
+        "email": resumes[resume_id][2],
+        "file_path": resumes[resume_id][4],
+        "summary": resumes[resume_id][5] or "",
+        "similarity": round(score, 4)
+    } for resume_id, score in hits if resume_id in resumes])
+
+
+@app.route("/api/search_resumes")
+def api_search_resumes():
+    """Full-text resume search (BM25 ranked, prefix queries, highlighted snippets)"""
+    if not session.get("admin_logged_in"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    query = request.args.get("q", "").strip()
+    page = max(1, request.args.get("page", 1, type=int))
+    per_page = max(1, min(request.args.get("per_page", 20, type=int), 100))
+
+    total, results = search_resumes(query, per_page, (page - 1) * per_page)
+    for result in results:
+        # Snippet mein resume ka text hai - pehle escape, phir <mark>
+        result["snippet"] = str(escape(result["snippet"])).replace(SNIPPET_OPEN, "<mark>").replace(SNIPPET_CLOSE, "</mark>")
+
+    return jsonify({
+        "query": query,
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "has_next": page * per_page < total,
+        "results": results
+    })
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    """Timing histograms + counters in Prometheus text format (admin only)"""
+    token_ok = METRICS_TOKEN and request.headers.get("Authorization") == f"Bearer {METRICS_TOKEN}"
+    if not (session.get("admin_logged_in") or token_ok):
+        return Response("Unauthorized\n", status=401, mimetype="text/plain")
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+# Login nahi chahiye (candidate apna upload dekhta hai) - isliye lookup sirf
+# enqueue_resume ke random token se, sequential id se nahi
+@app.route("/api/ingest_status/<token>")
+def api_ingest_status(token):
+    job = get_ingest_job_by_token(token)
+    if not job:
+        return jsonify({"error": "Ingest job not found"}), 404
+    return jsonify({
+        "status": job[1],
+        "resume_id": job[2],
+        "error": job[3],
+        "created_at": job[4],
+        "updated_at": job[5]
+    })
+
+
 @app.route("/uploads/<filename>")
 def serve_upload(filename):
     if not session.get("admin_logged_in"):
@@ -420,6 +459,44 @@ def serve_upload(filename):
         return redirect(url_for("admin_dashboard"))
 
 
+@app.route("/admin/profiles")
+def admin_profiles():
+    if not session.get("admin_logged_in"):
+        return redirect(url_for("admin_login"))
+    return render_template("admin_profiles.html", profiles=list_profiles(), profile=None)
+
+
+@app.route("/admin/profiles/<profile_id>")
+def admin_profile_detail(profile_id):
+    if not session.get("admin_logged_in"):
+        return redirect(url_for("admin_login"))
+
+    profile = get_profile(profile_id)
+    if not profile:
+        flash("Profile not found", "error")
+        return redirect(url_for("admin_profiles"))
+
+    sort = request.args.get("sort", "cumulative")
+    return render_template(
+        "admin_profiles.html",
+        profile=profile,
+        report=top_functions(profile, sort),
+        sort=sort,
+        sort_keys=SORT_KEYS
+    )
+
+
+@app.route("/admin/profiles/<profile_id>/download")
+def admin_profile_download(profile_id):
+    if not session.get("admin_logged_in"):
+        return redirect(url_for("admin_login"))
+
+    profile = get_profile(profile_id)
+    if not profile:
+        return jsonify({"error": "Profile not found"}), 404
+    return send_from_directory(os.path.abspath(PROFILE_DIR), profile["file"], as_attachment=True)
+
+
 @app.route("/admin/db-check")
 def admin_db_check():
     if not session.get("admin_logged_in"):
@@ -476,49 +553,93 @@ def admin_db_check():
     return html
 
 
+def _export_chunks(columns, fmt, use_gzip):
+    """Resumes as CSV / NDJSON byte chunks, one fetchmany batch at a time"""
+    import csv
+    import json
+    import zlib
+    from io import StringIO
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if use_gzip else None   # 31 = gzip header
+
+    def encode(text):
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow([EXPORT_COLUMNS[c] for c in columns])
+
+    for rows in iter_resumes(columns):
+        for row in rows:
+            if fmt == "ndjson":
+                buffer.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+            else:
+                writer.writerow(["" if value is None else value for value in row])
+        chunk = encode(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+        if chunk:
+            yield chunk
+
+    tail = encode(buffer.getvalue())
+    if compressor:
+        tail += compressor.flush()
+    if tail:
+        yield tail
+
+
 @app.route("/admin/export-db")
 def export_database():
+    """Streaming export: ?format=csv|ndjson&gzip=1&columns=id,name,email"""
     if not session.get("admin_logged_in"):
         return redirect(url_for("admin_login"))
-    
-    import csv
-    from io import StringIO
-    from database import get_all_resumes
-    from flask import send_file
-    
-    resumes = get_all_resumes()
-    
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    writer.writerow(['ID', 'Name', 'Email', 'Phone', 'Photo', 'File Path', 'Summary'])
-    
-    for resume in resumes:
-        writer.writerow([
-            resume[0],
-            resume[1],
-            resume[2],
-            resume[3] or '',
-            resume[4] or '',
-            resume[5] or '',
-            resume[6] or ''
-        ])
-    
-    output.seek(0)
-    response = send_file(
-        output,
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name='resumes_database.csv'
+
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"error": "format must be csv or ndjson"}), 400
+
+    requested = request.args.get("columns")
+    columns = [c.strip() for c in requested.split(",") if c.strip()] if requested else list(EXPORT_COLUMNS)
+    unknown = [c for c in columns if c not in EXPORT_COLUMNS]
+    if unknown or not columns:
+        return jsonify({"error": f"unknown columns: {', '.join(unknown)}", "columns": list(EXPORT_COLUMNS)}), 400
+
+    use_gzip = request.args.get("gzip", "0").lower() in ("1", "true", "yes")
+    download_name = "resumes_database." + fmt + (".gz" if use_gzip else "")
+    mimetype = "application/gzip" if use_gzip else ("text/csv" if fmt == "csv" else "application/x-ndjson")
+
+    return Response(
+        _export_chunks(columns, fmt, use_gzip),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={download_name}"}
     )
-    
-    return response
 
 
 @app.route("/api/get_matches/<int:job_id>")
 def api_get_matches(job_id):
-    matches = get_job_matches(job_id)
-    return jsonify(matches)
+    """All stored matches, or with ?k= only the top k (ranked from stored resume analyses)"""
+    if not session.get("admin_logged_in"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    k = request.args.get("k", type=int)
+    if k is None:
+        if not get_job_post_by_id(job_id):
+            return jsonify({"error": "Job not found"}), 404
+        if get_job_matches_version(job_id) != SCORER_VERSION:
+            # Stored scores purane/nahi hain - request mein compute nahi, background run
+            run = get_active_run_for_job(job_id) or start_matching_run(job_id, analyze_job=False)
+            return _matching_run_response(run)
+        return jsonify(get_stored_job_matches(job_id))
+
+    # Sirf stored JD analysis - GET par LLM call nahi
+    jd_json = get_job_analysis(job_id)
+    if jd_json is None:
+        if not get_job_post_by_id(job_id):
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify({"error": "Job has not been analyzed yet"}), 409
+    return jsonify(top_k_matches(jd_json, max(1, min(k, MAX_K))))
 
 
 # =========================
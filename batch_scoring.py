@@ -0,0 +1,123 @@
+# =====================================================
+# VECTORIZED (NUMPY) BATCH SCORING
+# =====================================================
+# calculate_match_percentage ek resume ko ek baar mein score karta hai.
+# Yahan poore corpus ko ek sparse skill matrix mein rakhte hain:
+#   - skills ek vocabulary mein intern hote hain (skill -> column id)
+#   - resumes CSR format mein: indptr + indices (sirf jo skills hain)
+# Ek JD ke liye saare candidates ka score + matched-skill mask
+# kuch vectorized operations mein nikal aata hai.
+# Results calculate_match_percentage ke bilkul barabar hain
+# (skills, projects aur experience units).
+# Parity: tests/test_batch_scoring.py
+# Timing: python -m benchmarks.bench_pipeline --only skill_matrix_score
+
+import numpy as np
+
+from metrics import timed, SCORING_SECONDS
+
+
+class BatchScores:
+    """Scores for every resume in a SkillMatrix against one JD"""
+
+    def __init__(self, resume_ids, percentages, skill_mask, jd_skills):
+        self.resume_ids = resume_ids      # list, row order of the matrix
+        self.percentages = percentages    # float64 array (n,)
+        self.skill_mask = skill_mask      # bool array (n, len(jd_skills))
+        self.jd_skills = jd_skills        # unique lowercase JD skills (mask columns)
+
+    def matched_skills(self, row):
+        return [self.jd_skills[j] for j in np.flatnonzero(self.skill_mask[row])]
+
+    def top(self, k=None):
+        """Row indexes ordered by percentage (highest first)"""
+        order = np.argsort(-self.percentages, kind="stable")
+        return order if k is None else order[:k]
+
+
+class SkillMatrix:
+    """Corpus of resume profiles as a sparse (CSR) resume x skill matrix"""
+
+    def __init__(self, resume_ids, vocab, indptr, indices, experience, projects_text):
+        self.resume_ids = resume_ids
+        self.vocab = vocab                  # skill -> column id
+        self.indptr = indptr                # int64 (n + 1,)
+        self.indices = indices              # int32 (nnz,) column ids per resume row
+        self.experience = experience        # float64 (n,)
+        self.projects_text = projects_text  # lowercase joined project names (n,)
+        self.row_of_entry = np.repeat(np.arange(len(resume_ids)), np.diff(indptr))
+        self._project_rows = np.flatnonzero(np.char.str_len(projects_text) > 0) if len(projects_text) else np.array([], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.resume_ids)
+
+    @classmethod
+    def from_profiles(cls, profiles):
+        """Build from an iterable of (resume_id, resume_json) pairs"""
+        vocab = {}
+        resume_ids = []
+        indptr = [0]
+        indices = []
+        experience = []
+        projects_text = []
+
+        for resume_id, resume_json in profiles:
+            row = {vocab.setdefault(str(s).lower(), len(vocab)) for s in resume_json.get("skills", [])}
+            indices.extend(sorted(row))
+            indptr.append(len(indices))
+            resume_ids.append(resume_id)
+            experience.append(resume_json.get("experience_years", 0) or 0)
+            projects_text.append(" ".join(resume_json.get("projects", [])).lower())
+
+        return cls(
+            resume_ids,
+            vocab,
+            np.asarray(indptr, dtype=np.int64),
+            np.asarray(indices, dtype=np.int32),
+            np.asarray(experience, dtype=np.float64),
+            np.asarray(projects_text, dtype=str),
+        )
+
+    @timed(SCORING_SECONDS, scorer="skill_matrix")
+    def score(self, jd_json):
+        """Vectorized equivalent of calculate_match_percentage for every resume"""
+        n = len(self.resume_ids)
+        required_skills = [str(s).lower() for s in jd_json.get("must_have", jd_json.get("skills", []))]
+
+        # Unique JD skills = mask columns; duplicates JD mein do baar count hote hain
+        jd_skills = list(dict.fromkeys(required_skills))
+        multiplicity = np.array([required_skills.count(s) for s in jd_skills], dtype=np.int64)
+        skill_mask = np.zeros((n, len(jd_skills)), dtype=bool)
+
+        if not required_skills:
+            return BatchScores(self.resume_ids, np.zeros(n), skill_mask, jd_skills)
+
+        # vocab column -> JD column (-1 = JD ko nahi chahiye)
+        lookup = np.full(len(self.vocab) + 1, -1, dtype=np.int64)
+        for j, skill in enumerate(jd_skills):
+            if skill in self.vocab:
+                lookup[self.vocab[skill]] = j
+        jd_col = lookup[self.indices]
+        hit = jd_col >= 0
+        skill_mask[self.row_of_entry[hit], jd_col[hit]] = True
+
+        matched = skill_mask.astype(np.int64) @ multiplicity
+        total_required = len(required_skills)
+
+        for project in jd_json.get("projects", []):
+            total_required += 1
+            if not project:
+                matched += 1    # "" har text mein milta hai
+            elif len(self._project_rows):
+                found = np.char.find(self.projects_text[self._project_rows], project.lower()) >= 0
+                matched[self._project_rows[found]] += 1
+
+        required_exp = jd_json.get("experience_years", 0)
+        if required_exp > 0:
+            total_required += 1
+            matched += self.experience >= required_exp
+
+        # Percentage table python round() se - calculate_match_percentage jaisa exact rounding
+        table = np.array([round((m / total_required) * 100, 2) for m in range(total_required + 1)])
+        return BatchScores(self.resume_ids, table[matched], skill_mask, jd_skills)
+
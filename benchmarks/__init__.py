@@ -0,0 +1,4 @@
+# Performance benchmarks. Run from the repo root, e.g.:
+#   python -m benchmarks.bench_db_connections
+#   python -m benchmarks.bench_pipeline --resumes 2000 --out bench.json
+# Synthetic PDF/DOCX resumes + JDs: python -m benchmarks.synthetic --out /tmp/corpus
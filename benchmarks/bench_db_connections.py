@@ -0,0 +1,131 @@
+# =====================================================
+# SQLITE CONNECTION LAYER BENCHMARK
+# =====================================================
+# Mixed concurrent reads/writes against database.py helpers:
+#   legacy - naya connection har call par, rollback journal (purana behaviour)
+#   shared - per-thread reusable connection, WAL + tuned pragmas
+# Result JSON stdout par aata hai taaki runs compare ho sakein.
+#
+#   python -m benchmarks.bench_db_connections --threads 8 --seconds 5 --write-ratio 0.2
+
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import threading
+from contextlib import ExitStack, closing
+
+import database
+
+_legacy = threading.local()
+
+
+def _legacy_connection():
+    conn = sqlite3.connect(database.DB_NAME)
+    # Purane helpers jaisa - call khatam hote hi close (_legacy_call)
+    _legacy.stack.enter_context(closing(conn))
+    conn.execute("PRAGMA journal_mode=DELETE")
+    return conn
+
+
+def _legacy_call(fn, *args, **kwargs):
+    """Run one database.py helper; every connection it opened is closed afterwards"""
+    with ExitStack() as stack:
+        _legacy.stack = stack
+        return fn(*args, **kwargs)
+
+
+def _direct_call(fn, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+def run_mode(mode, db_path, threads, seconds, write_ratio, seed_rows):
+    database.DB_NAME = db_path
+    original = database.get_connection
+    call = _direct_call
+    if mode == "legacy":
+        database.get_connection = _legacy_connection
+        call = _legacy_call
+
+    try:
+        call(database.init_db)
+        for i in range(seed_rows):
+            call(database.add_resume, f"Seed {i}", f"seed{i}@example.com", "", "", "", "• Python developer")
+
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def worker(n):
+            rng = random.Random(n)
+            local = {"reads": 0, "writes": 0, "errors": 0}
+            while time.perf_counter() < deadline:
+                try:
+                    if rng.random() < write_ratio:
+                        call(database.add_resume, "Bench", "bench@example.com", "", "", "", "• Benchmark row")
+                        local["writes"] += 1
+                    elif rng.random() < 0.5:
+                        call(database.get_resumes_page, 5, offset=rng.randint(0, 50))
+                        local["reads"] += 1
+                    else:
+                        call(database.get_resume_by_id, rng.randint(1, seed_rows))
+                        local["reads"] += 1
+                except sqlite3.OperationalError:
+                    local["errors"] += 1
+            with lock:
+                for key, value in local.items():
+                    counts[key] += value
+            if mode == "shared":
+                database.close_connection()
+
+        start = time.perf_counter()
+        pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        database.get_connection = original
+        database.close_connection()
+
+    ops = counts["reads"] + counts["writes"]
+    return {
+        "mode": mode,
+        "threads": threads,
+        "seconds": round(elapsed, 3),
+        "write_ratio": write_ratio,
+        **counts,
+        "ops_per_sec": round(ops / elapsed, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark SQLite connection handling")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--seed-rows", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("legacy", "shared"):
+            results.append(run_mode(mode, os.path.join(tmp, f"{mode}.db"), args.threads,
+                                    args.seconds, args.write_ratio, args.seed_rows))
+
+    legacy, shared = results
+    print(json.dumps({
+        "benchmark": "db_connections",
+        "results": results,
+        "speedup": round(shared["ops_per_sec"] / legacy["ops_per_sec"], 2) if legacy["ops_per_sec"] else None,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# =====================================================
+# PIPELINE BENCHMARKS
+# =====================================================
+# Synthetic corpus (benchmarks.synthetic) par hot paths ka timing:
+#   extract_text_from_file      - PDF aur DOCX alag
+#   normalize_resume_json
+#   calculate_match_percentage
+#   skill_matrix_score          - SkillMatrix.score, poore seeded corpus jitne profiles
+#   get_job_matches             - seeded SQLite DB
+#   top_k_matches               - bounded heap + upper-bound pruning, k = 10 / 20 / 100
+#   get_all_resumes
+#   admin_jobs_e2e              - Flask test client se POST /api/add_job, run ke SSE events
+#                                 'done' tak (JD analysis + matching) aur GET /admin/jobs
+# LLM (--llm):
+#   canned - default, in-process deterministic client (koi HTTP nahi)
+#   fake   - benchmarks.fake_ollama server + asli MistralClient (HTTP, streaming, latency)
+#   live   - asli Ollama (OLLAMA_URL)
+# Result JSON (git commit ke saath) stdout / --out file par, taaki commits compare ho sakein.
+#
+#   python -m benchmarks.bench_pipeline --resumes 2000 --files 40 --jobs 5 --out bench.json
+#   python -m benchmarks.bench_pipeline --only extract_text_from_file calculate_match_percentage
+#   python -m benchmarks.bench_pipeline --only admin_jobs_e2e --llm fake --fake-ttft 0.2 --fake-token-latency 0.01
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+
+from benchmarks.synthetic import SKILL_POOL, make_resume, make_job, generate_corpus, random_profile
+from benchmarks.fake_ollama import start_fake_ollama
+
+BENCHMARKS = [
+    "extract_text_from_file",
+    "normalize_resume_json",
+    "calculate_match_percentage",
+    "skill_matrix_score",
+    "get_job_matches",
+    "top_k_matches",
+    "get_all_resumes",
+    "admin_jobs_e2e",
+]
+
+
+# =====================================================
+# HELPERS
+# =====================================================
+def summarize(name, durations, **extra):
+    """Timing stats (ms) for a list of per-call durations in seconds"""
+    ordered = sorted(durations)
+    n = len(ordered)
+    total = sum(ordered)
+
+    def pct(p):
+        return ordered[min(n - 1, int(p * n))] * 1000 if n else 0.0
+
+    return {
+        "name": name,
+        "calls": n,
+        "total_s": round(total, 6),
+        "mean_ms": round(total / n * 1000, 4) if n else 0.0,
+        "p50_ms": round(pct(0.50), 4),
+        "p95_ms": round(pct(0.95), 4),
+        "max_ms": round(ordered[-1] * 1000, 4) if n else 0.0,
+        "ops_per_sec": round(n / total, 1) if total else None,
+        **extra,
+    }
+
+
+def time_calls(fn, args_list):
+    durations = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+class CannedMistralClient:
+    """Deterministic stand-in for MistralClient: JSON built from skills found in the prompt"""
+
+    def generate(self, prompt, **kwargs):
+        return self.generate_json(prompt)
+
+    def generate_json(self, prompt, **kwargs):
+        from keyword_matcher import find_keywords
+        skills = find_keywords(prompt.rsplit("Description:", 1)[-1], SKILL_POOL)
+        return json.dumps({
+            "must_have": skills, "nice_to_have": [], "skills": skills,
+            "role_level": "mid-level", "domain": "technology",
+            "experience_years": 2, "experience_years_required": 2, "projects_required": [],
+        })
+
+    def stats(self):
+        return {}
+
+
+# =====================================================
+# BENCHMARKS
+# =====================================================
+def bench_extract(ctx):
+    from rag_summary import extract_text_from_file
+    results = []
+    for ext in ("pdf", "docx"):
+        files = [e["file_path"] for e in ctx["files"] if e["file_path"].endswith(ext)]
+        durations = time_calls(extract_text_from_file, [(f,) for f in files] * ctx["repeat"])
+        results.append(summarize(f"extract_text_from_file[{ext}]", durations, files=len(files)))
+    return results
+
+
+def bench_normalize(ctx):
+    from rag_summary import normalize_resume_json
+    # normalize_resume_json input ko mutate karta hai - har call ko fresh copy
+    profiles = [dict(p, skills=list(p["skills"]), projects=list(p["projects"])) for p in ctx["profiles"]]
+    return [summarize("normalize_resume_json", time_calls(normalize_resume_json, [(p,) for p in profiles]))]
+
+
+def bench_calculate(ctx):
+    from rag_summary import calculate_match_percentage
+    pairs = [(job["profile"], p) for job in ctx["jobs"] for p in ctx["profiles"]]
+    return [summarize("calculate_match_percentage", time_calls(calculate_match_percentage, pairs))]
+
+
+def bench_skill_matrix(ctx):
+    from batch_scoring import SkillMatrix
+    rng = random.Random(ctx["seed"])
+    matrix = SkillMatrix.from_profiles((i, random_profile(rng)) for i in range(ctx["resume_count"]))
+    calls = [(job["profile"],) for job in ctx["jobs"]] * ctx["repeat"]
+    return [summarize("skill_matrix_score", time_calls(matrix.score, calls), resumes=len(matrix))]
+
+
+def bench_get_job_matches(ctx):
+    from database import get_job_matches
+    calls = [(job_id,) for job_id in ctx["job_ids"]] * ctx["repeat"]
+    return [summarize("get_job_matches", time_calls(get_job_matches, calls), resumes=ctx["resume_count"])]
+
+
+def bench_top_k(ctx):
+    from database import get_job_analysis
+    from topk_ranking import top_k_matches
+    jds = [get_job_analysis(job_id) for job_id in ctx["job_ids"]] * ctx["repeat"]
+    return [summarize(f"top_k_matches[k={k}]", time_calls(top_k_matches, [(jd, k) for jd in jds]), resumes=ctx["resume_count"])
+            for k in (10, 20, 100)]
+
+
+def bench_get_all_resumes(ctx):
+    from database import get_all_resumes
+    return [summarize("get_all_resumes", time_calls(get_all_resumes, [()] * ctx["repeat"]), resumes=ctx["resume_count"])]
+
+
+def bench_admin_jobs(ctx):
+    from app import app
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["admin_logged_in"] = True
+
+    post, run, get = [], [], []
+    for job in ctx["jobs"]:
+        start = time.perf_counter()
+        response = client.post("/api/add_job", json={"title": job["title"], "description": job["description"]})
+        post.append(time.perf_counter() - start)
+        assert response.status_code == 202, response.status_code
+
+        # Event stream 'done' event par khatam hota hai - poora run
+        events = client.get(response.get_json()["events_url"]).get_data(as_text=True)
+        run.append(time.perf_counter() - start)
+        assert "event: done" in events
+
+        start = time.perf_counter()
+        client.get("/admin/jobs")
+        get.append(time.perf_counter() - start)
+
+    return [
+        summarize("admin_jobs_e2e[POST]", post, resumes=ctx["resume_count"]),
+        summarize("admin_jobs_e2e[run]", run, resumes=ctx["resume_count"], llm=ctx["llm"]),
+        summarize("admin_jobs_e2e[GET]", get, resumes=ctx["resume_count"]),
+    ]
+
+
+RUNNERS = {
+    "extract_text_from_file": bench_extract,
+    "normalize_resume_json": bench_normalize,
+    "calculate_match_percentage": bench_calculate,
+    "skill_matrix_score": bench_skill_matrix,
+    "get_job_matches": bench_get_job_matches,
+    "top_k_matches": bench_top_k,
+    "get_all_resumes": bench_get_all_resumes,
+    "admin_jobs_e2e": bench_admin_jobs,
+}
+
+
+# =====================================================
+# SETUP
+# =====================================================
+def seed_database(ctx, tmp):
+    """Fresh DB in tmp with resume_count analyzed resumes and the synthetic jobs"""
+    import database
+    database.DB_NAME = os.path.join(tmp, "bench.db")
+    database.init_db()
+
+    rng = random.Random(ctx["seed"])
+    batch = []
+    for i in range(ctx["resume_count"]):
+        text, profile = make_resume(rng, i)
+        batch.append({
+            "item": f"synthetic/{i}", "name": text.splitlines()[0], "email": f"candidate{i}@example.com",
+            "phone": "", "file_path": "", "summary": "• Synthetic benchmark resume",
+            "text_sha256": None, "text": text, "analysis": profile,
+        })
+        if len(batch) == 1000:
+            database.save_import_batch("benchmark", batch)
+            batch = []
+    if batch:
+        database.save_import_batch("benchmark", batch)
+
+    ctx["job_ids"] = []
+    for job in ctx["jobs"]:
+        job_id = database.add_job_post(job["title"], job["description"])
+        database.save_job_analysis(job_id, job["profile"])
+        ctx["job_ids"].append(job_id)
+
+
+def run(args):
+    ctx = {"seed": args.seed, "repeat": args.repeat, "resume_count": args.resumes, "llm": args.llm}
+    rng = random.Random(args.seed)
+    ctx["profiles"] = [make_resume(rng, i)[1] for i in range(args.profiles)]
+    ctx["jobs"] = [dict(zip(("title", "description", "profile"), make_job(rng))) for _ in range(args.jobs)]
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Semantic index aur uploads temp dir mein, repo ki files touch nahi hoti
+        os.environ["SEMANTIC_INDEX_DIR"] = os.path.join(tmp, "semantic_index")
+        ctx["files"], _ = generate_corpus(os.path.join(tmp, "files"), args.files, 0, args.pages, 0.5, args.seed)
+        seed_database(ctx, tmp)
+
+        import rag_summary
+        fake = None
+        if args.llm == "canned":
+            rag_summary._shared_client = CannedMistralClient()
+        elif args.llm == "fake":
+            fake = start_fake_ollama(ttft=args.fake_ttft, token_latency=args.fake_token_latency, seed=args.seed)
+            # Cache ke bina - har JD ka LLM call sach mein server tak jaaye
+            rag_summary._shared_client = rag_summary.MistralClient(base_url=rag_summary.ollama_generate_url(fake.url))
+
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            for name in args.only or BENCHMARKS:
+                with redirect_stdout(io.StringIO()):   # pipeline ke DEBUG prints JSON mein na milein
+                    results.extend(RUNNERS[name](ctx))
+        finally:
+            os.chdir(cwd)
+            import database
+            database.close_connection()
+            if fake is not None:
+                fake.shutdown()
+                fake.server_close()
+
+    return {
+        "benchmark": "pipeline",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": {k: v for k, v in vars(args).items() if k != "out"},
+        "results": results,
+        "llm_client": rag_summary._shared_client.stats() if rag_summary._shared_client else {},
+        "fake_ollama": dict(fake.counters) if fake is not None else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume pipeline on synthetic data")
+    parser.add_argument("--resumes", type=int, default=1000, help="analyzed resumes seeded into the DB")
+    parser.add_argument("--files", type=int, default=20, help="PDF/DOCX files generated for extraction")
+    parser.add_argument("--pages", type=int, default=2, help="approximate pages per generated file")
+    parser.add_argument("--profiles", type=int, default=500, help="profiles for normalize/score benchmarks")
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="repeat count for DB and extraction benchmarks")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS)
+    parser.add_argument("--llm", choices=["canned", "fake", "live"], default="canned", help="LLM backend for admin_jobs_e2e")
+    parser.add_argument("--fake-ttft", type=float, default=0.0, help="fake server time-to-first-token (s)")
+    parser.add_argument("--fake-token-latency", type=float, default=0.0, help="fake server per-token latency (s)")
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+# =====================================================
+# FAKE OLLAMA /api/generate SERVER
+# =====================================================
+# Performance experiments ke liye asli Ollama + llama3.2:1b ki zaroorat nahi:
+# yeh server /api/generate ko Ollama ke format mein imitate karta hai.
+#   - streaming (NDJSON, chunked) aur non-streaming modes
+#   - time-to-first-token (--ttft) aur per-token latency (--token-latency)
+#   - error rate (HTTP 500), seeded RNG - runs deterministic
+#   - canned responses ek JSON corpus se (prompt type: resume / job / text)
+#   - --trailing-text: JSON ke baad model jaisi extra baatein (early-stop test)
+# MistralClient ko isse jodne ke liye: OLLAMA_URL=http://127.0.0.1:11435
+#
+#   python -m benchmarks.fake_ollama --port 11435 --ttft 0.2 --token-latency 0.01 --error-rate 0.05
+#   python -m benchmarks.fake_ollama --corpus my_responses.json   # {"resume": [...], "job": [...], "text": [...]}
+#
+# GET /fake/stats se request / token / error counters milte hain.
+
+import re
+import sys
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+DEFAULT_CORPUS = {
+    "resume": [
+        {"skills": ["python", "flask", "sql", "git"], "experience_years": 2},
+        {"skills": ["java", "spring", "mysql", "docker"], "experience_years": 4},
+        {"skills": ["javascript", "react", "node", "html", "css"], "experience_years": 1},
+        {"skills": ["python", "pandas", "numpy", "machine learning", "aws"], "experience_years": 3},
+    ],
+    "job": [
+        {"must_have": ["python", "flask", "sql"], "nice_to_have": ["docker"], "role_level": "mid-level",
+         "domain": "technology", "experience_years_required": 2, "projects_required": []},
+        {"must_have": ["java", "spring"], "nice_to_have": ["aws"], "role_level": "senior",
+         "domain": "technology", "experience_years_required": 5, "projects_required": []},
+        {"must_have": ["javascript", "react"], "nice_to_have": ["node"], "role_level": "junior",
+         "domain": "technology", "experience_years_required": 0, "projects_required": []},
+    ],
+    "text": [
+        "• Software developer with hands-on experience building web applications.\n"
+        "• Comfortable with Python, SQL and version control.",
+    ],
+}
+TRAILING_TEXT = "\n\nThis JSON contains the extracted information from the text above."
+TOKEN_RE = re.compile(r"\s*\S+|\s+")
+
+
+def prompt_kind(prompt):
+    """Which corpus section answers this prompt"""
+    if "Job Description" in prompt:
+        return "job"
+    if "resume" in prompt.lower():
+        return "resume"
+    return "text"
+
+
+def load_corpus(path=None):
+    if not path:
+        return {kind: list(items) for kind, items in DEFAULT_CORPUS.items()}
+    with open(path, encoding="utf-8") as f:
+        corpus = json.load(f)
+    # Jo section file mein nahi hai woh default se
+    return {kind: corpus.get(kind) or list(DEFAULT_CORPUS[kind]) for kind in DEFAULT_CORPUS}
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, ttft=0.0, token_latency=0.0, error_rate=0.0, jitter=0.0,
+                 corpus=None, trailing_text=False, seed=0):
+        super().__init__(address, FakeOllamaHandler)
+        self.ttft = ttft
+        self.token_latency = token_latency
+        self.error_rate = error_rate
+        self.jitter = jitter
+        self.corpus = corpus or load_corpus()
+        self.trailing_text = trailing_text
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "streamed": 0, "errors": 0, "cancelled": 0, "tokens": 0}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.counters[key] += amount
+
+    def should_fail(self):
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def delay(self, seconds):
+        if seconds <= 0:
+            return
+        if self.jitter:
+            with self._lock:
+                seconds *= 1 + self._rng.uniform(-self.jitter, self.jitter)
+        time.sleep(seconds)
+
+    def response_for(self, prompt):
+        """Canned response text; same prompt -> same response"""
+        items = self.corpus[prompt_kind(prompt)]
+        item = items[zlib.crc32(prompt.encode("utf-8")) % len(items)]
+        if isinstance(item, str):
+            return item
+        text = json.dumps(item)
+        return text + TRAILING_TEXT if self.trailing_text else text
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, MistralClient ka connection pool reuse ho
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/fake/stats":
+            return self._send_json(200, dict(self.server.counters))
+        if self.path == "/api/tags":
+            return self._send_json(200, {"models": [{"name": "llama3.2:1b"}]})
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/api/generate":
+            return self._send_json(404, {"error": "not found"})
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError:
+            return self._send_json(400, {"error": "invalid JSON body"})
+
+        server = self.server
+        server.count("requests")
+        if server.should_fail():
+            server.count("errors")
+            return self._send_json(500, {"error": "fake ollama: simulated failure"})
+
+        model = body.get("model", "llama3.2:1b")
+        tokens = TOKEN_RE.findall(server.response_for(body.get("prompt", "")))
+        # Ollama ka default stream=true hai
+        if body.get("stream", True):
+            self._stream(model, tokens)
+        else:
+            server.delay(server.ttft + server.token_latency * len(tokens))
+            server.count("tokens", len(tokens))
+            self._send_json(200, self._chunk(model, "".join(tokens), True, len(tokens)))
+
+    @staticmethod
+    def _chunk(model, text, done, eval_count=0):
+        chunk = {"model": model, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                 "response": text, "done": done}
+        if done:
+            chunk.update({"done_reason": "stop", "eval_count": eval_count})
+        return chunk
+
+    def _write_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _stream(self, model, tokens):
+        server = self.server
+        server.count("streamed")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            server.delay(server.ttft)
+            for i, token in enumerate(tokens):
+                if i:
+                    server.delay(server.token_latency)
+                self._write_chunk(json.dumps(self._chunk(model, token, False)).encode("utf-8") + b"\n")
+                server.count("tokens")
+            self._write_chunk(json.dumps(self._chunk(model, "", True, len(tokens))).encode("utf-8") + b"\n")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client ne JSON milte hi connection band kar diya (early stop)
+            server.count("cancelled")
+            self.close_connection = True
+
+
+def start_fake_ollama(host="127.0.0.1", port=0, **options):
+    """Start a FakeOllamaServer on a background thread; port=0 picks a free port"""
+    server = FakeOllamaServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="fake-ollama", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Ollama /api/generate server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--ttft", type=float, default=0.0, help="seconds before the first token")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="seconds between tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 500")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- fraction applied to every delay")
+    parser.add_argument("--corpus", help='JSON file: {"resume": [...], "job": [...], "text": [...]}')
+    parser.add_argument("--trailing-text", action="store_true", help="append chatter after JSON responses")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = FakeOllamaServer(
+        (args.host, args.port), ttft=args.ttft, token_latency=args.token_latency,
+        error_rate=args.error_rate, jitter=args.jitter, corpus=load_corpus(args.corpus),
+        trailing_text=args.trailing_text, seed=args.seed,
+    )
+    print(f"Fake Ollama listening on {server.url} (export OLLAMA_URL={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+# =====================================================
+# SYNTHETIC RESUMES / JOB DESCRIPTIONS
+# =====================================================
+# Benchmarks ke liye deterministic (seeded) data:
+#   - resume text + matching profile (skills, projects, experience)
+#   - PDF (chhota hand-written PDF writer, koi extra dependency nahi) aur DOCX files
+#   - job descriptions
+#   - sirf profiles (random_profile / random_jd) - scoring tests aur benchmarks
+# Files ke saath manifest.csv bhi banta hai jo bulk_import.py seedha le sakta hai.
+#
+#   python -m benchmarks.synthetic --out /tmp/corpus --resumes 500 --jobs 10 --pages 2
+
+import os
+import sys
+import csv
+import json
+import random
+import argparse
+
+import docx
+
+SKILL_POOL = ["python", "java", "javascript", "sql", "flask", "django", "react", "node", "docker",
+              "aws", "git", "c++", "go", "rust", "kubernetes", "pandas", "numpy", "spark", "html", "css",
+              "mongodb", "rest", "angular", "vue", "devops"]
+PROJECT_POOL = ["Resume-Scanner", "Chat App", "E-commerce Platform", "Data Pipeline", "Portfolio Site",
+                "Inventory Tracker", "Recommendation Engine", "Payment Gateway"]
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Rahul", "Isha"]
+LAST_NAMES = ["Sharma", "Verma", "Gupta", "Iyer", "Reddy", "Nair", "Singh", "Mehta", "Das", "Kapoor"]
+COMPANIES = ["Infosys", "TCS", "Wipro", "Flipkart", "Zomato", "Freshworks", "Razorpay", "Swiggy"]
+ROLES = ["Software Engineer", "Backend Developer", "Full Stack Developer", "Data Engineer", "DevOps Engineer"]
+FILLER = [
+    "Worked closely with product and design teams to ship features on schedule.",
+    "Improved API response times by profiling slow database queries.",
+    "Wrote unit and integration tests and maintained the CI pipeline.",
+    "Mentored junior developers and reviewed pull requests.",
+    "Migrated legacy services to containerized deployments.",
+    "Built dashboards to monitor production health and error rates.",
+]
+
+
+# =====================================================
+# TEXT + PROFILES
+# =====================================================
+def make_resume(rng, index, pages=1):
+    """(text, profile) for one synthetic candidate"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.sample(SKILL_POOL, rng.randint(3, 10))
+    projects = rng.sample(PROJECT_POOL, rng.randint(0, 3))
+    experience = rng.choice([0, 1, 2, 3, 4, 5, 7, 10])
+
+    lines = [
+        name,
+        f"Email: candidate{index}@example.com | Phone: +91 98{index:08d}"[:60],
+        f"{rng.choice(ROLES)} with {experience} years of experience",
+        "",
+        "SKILLS",
+        ", ".join(skills),
+        "",
+        "EXPERIENCE",
+    ]
+    for _ in range(max(1, experience // 2)):
+        lines.append(f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)}")
+        lines.extend(rng.sample(FILLER, 2))
+    lines += ["", "PROJECTS"] + [f"{p}: built with {', '.join(rng.sample(skills, min(2, len(skills))))}" for p in projects]
+    # Har extra page ~45 lines
+    while len(lines) < pages * 45:
+        lines.append(rng.choice(FILLER))
+
+    profile = {
+        "skills": skills,
+        "projects": projects,
+        "experience_years": experience,
+        "role_level": "senior" if experience >= 5 else "junior",
+        "domain": "technology",
+    }
+    return "\n".join(lines), profile
+
+
+def make_job(rng):
+    """(title, description, profile) for one synthetic job post"""
+    skills = rng.sample(SKILL_POOL, rng.randint(2, 6))
+    experience = rng.choice([0, 1, 2, 3, 5])
+    title = rng.choice(ROLES)
+    description = (
+        f"We are hiring a {title} to join our team at {rng.choice(COMPANIES)}.\n"
+        f"Required skills: {', '.join(skills)}.\n"
+        f"Experience: {experience}+ years.\n"
+        + " ".join(rng.sample(FILLER, 3))
+    )
+    return title, description, {"skills": skills, "projects": [], "experience_years": experience}
+
+
+def random_profile(rng):
+    """Profile only (no text) - scoring parity tests / benchmarks; skills ki case bhi badalti hai"""
+    return {
+        "skills": [s.upper() if rng.random() < 0.1 else s for s in rng.sample(SKILL_POOL, rng.randint(0, 8))],
+        "projects": rng.sample(PROJECT_POOL, rng.randint(0, 2)),
+        "experience_years": rng.choice([0, 1, 1.5, 2, 3, 5, 8]),
+    }
+
+
+def random_jd(rng):
+    """JD profile: kabhi koi skill nahi, kabhi duplicate skill (alag case), project keywords"""
+    skills = rng.sample(SKILL_POOL, rng.randint(0, 6))
+    if skills and rng.random() < 0.3:
+        skills.append(skills[0].upper())   # duplicate, different case
+    return {
+        "skills": skills,
+        "projects": [p.split()[0] for p in rng.sample(PROJECT_POOL, rng.randint(0, 2))],
+        "experience_years": rng.choice([0, 0, 1, 2, 3, 5]),
+    }
+
+
+# =====================================================
+# FILE WRITERS
+# =====================================================
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path, text, lines_per_page=45):
+    """Minimal multi-page text PDF (Helvetica) that PdfReader can extract"""
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    # 1 = catalog, 2 = pages, 3 = font, phir har page ke liye (page, content)
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in page_ids)}] /Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, page_lines in zip(page_ids, pages):
+        body = "BT /F1 10 Tf 12 TL 50 800 Td\n" + "".join(f"({_pdf_escape(l)}) Tj T*\n" for l in page_lines) + "ET"
+        stream = body.encode("latin-1", "replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_docx(path, text):
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    document.save(path)
+
+
+# =====================================================
+# CORPUS
+# =====================================================
+def generate_corpus(out_dir, resumes=100, jobs=5, pages=1, pdf_ratio=0.5, seed=42):
+    """Write resume files + jobs.json + manifest.csv. Returns (resume entries, job entries)."""
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+
+    entries = []
+    for i in range(resumes):
+        text, profile = make_resume(rng, i, pages)
+        ext = "pdf" if rng.random() < pdf_ratio else "docx"
+        path = os.path.join(out_dir, f"resume_{i:05d}.{ext}")
+        (write_pdf if ext == "pdf" else write_docx)(path, text)
+        name, email = text.splitlines()[0], f"candidate{i}@example.com"
+        entries.append({"file_path": path, "name": name, "email": email, "phone": "", "profile": profile})
+
+    job_entries = []
+    for _ in range(jobs):
+        title, description, profile = make_job(rng)
+        job_entries.append({"title": title, "description": description, "profile": profile})
+
+    with open(os.path.join(out_dir, "manifest.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["file_path", "name", "email", "phone"])
+        for e in entries:
+            writer.writerow([os.path.basename(e["file_path"]), e["name"], e["email"], e["phone"]])
+    with open(os.path.join(out_dir, "jobs.json"), "w", encoding="utf-8") as f:
+        json.dump(job_entries, f, indent=2)
+
+    return entries, job_entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic resumes and job descriptions")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=1, help="approximate pages per resume")
+    parser.add_argument("--pdf-ratio", type=float, default=0.5, help="fraction of resumes written as PDF")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    entries, jobs = generate_corpus(args.out, args.resumes, args.jobs, args.pages, args.pdf_ratio, args.seed)
+    print(json.dumps({"out": args.out, "resumes": len(entries), "jobs": len(jobs)}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+# =====================================================
+# BULK RESUME IMPORT (CLI)
+# =====================================================
+# Job fair / ATS export ke hazaron resumes ek saath import karne ke liye.
+# Web form (home_post) ek file ek baar mein leta hai; yahan:
+#   - files process pool par uploads/ mein copy + hash + text extract hoti hain
+#   - AI analysis ek bounded thread pool par (Ollama ko overload nahi)
+#   - rows batches mein executemany se ek transaction mein insert hoti hain
+#   - har batch ke saath import_progress checkpoint, isliye interrupted run
+#     dobara chalane par wahin se shuru hota hai (done items skip, failed items phir try)
+# End mein throughput (files/sec) aur per-stage timing print hoti hai.
+#
+# CLI usage:
+#   python bulk_import.py path/to/resumes_dir
+#   python bulk_import.py job_fair.zip --workers 8 --llm-concurrency 4
+#   python bulk_import.py manifest.csv --batch-size 200     # columns: file_path,name,email,phone
+#   python bulk_import.py export.zip --no-llm               # analysis baad mein matching engine karega
+
+import os
+import re
+import sys
+import csv
+import time
+import queue
+import hashlib
+import zipfile
+import argparse
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from werkzeug.utils import secure_filename
+
+from rag_summary import read_text, analyze_resume_text, build_resume_profile
+from database import init_db, get_resume_text_by_hash, get_imported_items, save_import_batch
+from ingest_queue import build_summary, DEFAULT_SUMMARY, NO_TEXT_SUMMARY
+from semantic_index import get_semantic_index
+from matching_engine import score_resume_against_jobs, LLM_CONCURRENCY, EXTRACT_WORKERS
+
+UPLOAD_FOLDER = "uploads"
+ALLOWED_EXTENSIONS = {"pdf", "doc", "docx"}
+BATCH_SIZE = 100
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_RE = re.compile(r"\+?\d[\d\s-]{8,}\d")
+
+STAGES = ["copy", "extract", "analyze", "db", "index", "match"]
+
+_zip_files = {}   # worker process: zip path -> open ZipFile (central directory har member par dobara parse na ho)
+
+
+def _allowed(name):
+    return "." in name and name.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+# =====================================================
+# SOURCES (directory / zip / CSV manifest)
+# =====================================================
+def list_items(source):
+    """[{item, path, member, name, email, phone}] for a directory, zip file or CSV manifest"""
+    if os.path.isdir(source):
+        items = []
+        for root, _, files in os.walk(source):
+            for filename in files:
+                if _allowed(filename):
+                    path = os.path.join(root, filename)
+                    items.append({"item": os.path.relpath(path, source), "path": path})
+        return sorted(items, key=lambda i: i["item"])
+
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as zf:
+            return [{"item": m, "path": source, "member": m}
+                    for m in sorted(zf.namelist()) if _allowed(m) and not m.endswith("/")]
+
+    if source.lower().endswith(".csv"):
+        base = os.path.dirname(source)
+        items = []
+        with open(source, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                path = (row.get("file_path") or "").strip()
+                if not path or not _allowed(path):
+                    continue
+                items.append({
+                    "item": path,
+                    "path": path if os.path.isabs(path) else os.path.join(base, path),
+                    "name": (row.get("name") or "").strip(),
+                    "email": (row.get("email") or "").strip(),
+                    "phone": (row.get("phone") or "").strip(),
+                })
+        return items
+
+    raise ValueError(f"{source} is not a directory, zip file or .csv manifest")
+
+
+# =====================================================
+# PIPELINE STAGES
+# =====================================================
+def _read_member(path, member):
+    """Read one zip member; each worker process opens a zip file only once"""
+    zf = _zip_files.get(path)
+    if zf is None:
+        zf = _zip_files[path] = zipfile.ZipFile(path)
+    return zf.read(member)
+
+
+def _close_zip_files():
+    while _zip_files:
+        _zip_files.popitem()[1].close()
+
+
+def prepare_item(item):
+    """Process-pool worker: copy into uploads/, hash and extract text"""
+    timings = {}
+    start = time.perf_counter()
+    if item.get("member"):
+        data = _read_member(item["path"], item["member"])
+    else:
+        with open(item["path"], "rb") as f:
+            data = f.read()
+
+    sha = hashlib.sha256(data).hexdigest()
+    # Hash prefix se naam unique; dobara run par wahi file overwrite nahi hoti
+    file_path = os.path.join(UPLOAD_FOLDER, f"{sha[:12]}_{secure_filename(os.path.basename(item['item']))}")
+    if not os.path.exists(file_path):
+        with open(file_path, "wb") as f:
+            f.write(data)
+    timings["copy"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    text = get_resume_text_by_hash(sha)
+    if text is None:
+        try:
+            text = read_text(file_path)
+        except Exception as e:
+            print(f"DEBUG: Text extraction error for {item['item']}: {e}")
+            # 'failed' checkpoint hota hai (done nahi), agla run is item ko phir try karega
+            raise RuntimeError(f"Text extraction failed: {e}") from None
+    timings["extract"] = time.perf_counter() - start
+
+    return dict(item, file_path=file_path, text_sha256=sha, text=text, timings=timings)
+
+
+def contact_details(result):
+    """Name / email / phone: manifest values, warna filename aur resume text se"""
+    text = result["text"] or ""
+    name = result.get("name")
+    if not name:
+        stem = os.path.splitext(os.path.basename(result["item"]))[0]
+        name = re.sub(r"[_\-.]+", " ", stem).strip().title()
+    email = result.get("email")
+    if not email:
+        match = EMAIL_RE.search(text)
+        email = match.group(0) if match else ""
+    phone = result.get("phone")
+    if not phone:
+        match = PHONE_RE.search(text)
+        phone = match.group(0).strip() if match else ""
+    return name, email, phone
+
+
+def analyze_item(result, use_llm=True):
+    """Thread-pool worker: AI analysis -> summary + stored profile"""
+    start = time.perf_counter()
+    result["analysis"] = None
+    if not result["text"]:
+        result["summary"] = NO_TEXT_SUMMARY
+    elif not use_llm:
+        result["summary"] = DEFAULT_SUMMARY
+    else:
+        try:
+            resume_analysis = analyze_resume_text(result["text"])
+            result["summary"] = build_summary(resume_analysis)
+            result["analysis"] = build_resume_profile(resume_analysis)
+        except Exception as e:
+            print(f"DEBUG: Resume analysis failed for {result['item']}: {e}")
+            result["summary"] = DEFAULT_SUMMARY
+    result["timings"]["analyze"] = time.perf_counter() - start
+    result["name"], result["email"], result["phone"] = contact_details(result)
+    return result
+
+
+# =====================================================
+# IMPORTER
+# =====================================================
+class BulkImporter:
+    def __init__(self, source, workers=EXTRACT_WORKERS, llm_concurrency=LLM_CONCURRENCY,
+                 batch_size=BATCH_SIZE, use_llm=True):
+        self.source = source
+        self.source_key = os.path.abspath(source)
+        self.workers = workers
+        self.llm_concurrency = llm_concurrency
+        self.batch_size = batch_size
+        self.use_llm = use_llm
+        self.timings = defaultdict(float)
+        self.counts = {"imported": 0, "skipped": 0, "failed": 0}
+        self._ready = queue.Queue()     # analyzed results, LLM threads se
+        self._buffer = []               # main thread: results waiting for a batch
+        self._failures = []
+        self._lock = threading.Lock()
+
+    def _analyze(self, result):
+        try:
+            self._ready.put(analyze_item(result, self.use_llm))
+        except Exception as e:
+            with self._lock:
+                self._failures.append((result["item"], str(e)))
+
+    def _flush(self, force=False):
+        """Save finished results in batch_size chunks (the remainder too when force)"""
+        while True:
+            try:
+                self._buffer.append(self._ready.get_nowait())
+            except queue.Empty:
+                break
+        while len(self._buffer) >= self.batch_size or (force and (self._buffer or self._failures)):
+            batch, self._buffer = self._buffer[:self.batch_size], self._buffer[self.batch_size:]
+            self._save(batch)
+
+    def _save(self, batch):
+        with self._lock:
+            failures, self._failures = self._failures, []
+
+        start = time.perf_counter()
+        resume_ids = save_import_batch(self.source_key, batch, failures)
+        self.timings["db"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        try:
+            get_semantic_index().add_documents([(rid, r["text"]) for rid, r in zip(resume_ids, batch)])
+        except Exception as e:
+            print(f"DEBUG: Semantic indexing failed for batch: {e}")
+        self.timings["index"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for rid, r in zip(resume_ids, batch):
+            if r["analysis"] is not None:
+                try:
+                    score_resume_against_jobs(rid, r["analysis"])
+                except Exception as e:
+                    print(f"DEBUG: Incremental matching failed for resume {rid}: {e}")
+        self.timings["match"] += time.perf_counter() - start
+
+        for r in batch:
+            for stage, seconds in r["timings"].items():
+                self.timings[stage] += seconds
+        self.counts["imported"] += len(batch)
+        self.counts["failed"] += len(failures)
+        print(f"DEBUG: Saved batch of {len(batch)} ({self.counts['imported']} imported so far)")
+
+    def run(self):
+        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+        items = list_items(self.source)
+        done = get_imported_items(self.source_key)
+        pending = [i for i in items if i["item"] not in done]
+        self.counts["skipped"] = len(items) - len(pending)
+        print(f"DEBUG: {len(items)} files found, {self.counts['skipped']} already imported, {len(pending)} to import")
+
+        started = time.perf_counter()
+        use_processes = self.workers > 1 and len(pending) > 1
+        extract_pool = ProcessPoolExecutor(max_workers=self.workers) if use_processes else ThreadPoolExecutor(max_workers=1)
+        llm_pool = ThreadPoolExecutor(max_workers=max(1, self.llm_concurrency))
+        try:
+            futures = {extract_pool.submit(prepare_item, item): item for item in pending}
+            for future in as_completed(futures):
+                try:
+                    llm_pool.submit(self._analyze, future.result())
+                except Exception as e:
+                    with self._lock:
+                        self._failures.append((futures[future]["item"], str(e)))
+                self._flush()
+            extract_pool.shutdown()
+            llm_pool.shutdown(wait=True)
+            self._flush(force=True)
+        except KeyboardInterrupt:
+            print("Interrupted - saved batches are checkpointed, run again to resume", file=sys.stderr)
+            extract_pool.shutdown(wait=False, cancel_futures=True)
+            llm_pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            _close_zip_files()   # single-worker mode mein zip isi process mein khula tha
+        return time.perf_counter() - started
+
+    def report(self, elapsed):
+        imported = self.counts["imported"]
+        rate = imported / elapsed if elapsed > 0 else 0.0
+        lines = [
+            f"Imported {imported}, skipped {self.counts['skipped']}, failed {self.counts['failed']} "
+            f"in {elapsed:.1f}s ({rate:.2f} files/sec)",
+            "Stage timings (total s across workers / avg ms per file):",
+        ]
+        for stage in STAGES:
+            total = self.timings.get(stage, 0.0)
+            avg = (total / imported * 1000) if imported else 0.0
+            lines.append(f"  {stage:<8} {total:8.2f}s  {avg:8.1f} ms")
+        return "\n".join(lines)
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import resumes from a directory, zip file or CSV manifest")
+    parser.add_argument("source", help="directory, .zip file or .csv manifest (file_path,name,email,phone)")
+    parser.add_argument("--workers", type=int, default=EXTRACT_WORKERS, help="copy + text extraction processes")
+    parser.add_argument("--llm-concurrency", type=int, default=LLM_CONCURRENCY)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per insert transaction")
+    parser.add_argument("--no-llm", action="store_true", help="skip AI analysis (matching engine analyzes later)")
+    args = parser.parse_args(argv)
+
+    init_db()
+    importer = BulkImporter(args.source, args.workers, args.llm_concurrency, max(1, args.batch_size), not args.no_llm)
+    try:
+        elapsed = importer.run()
+    except KeyboardInterrupt:
+        return 130
+    print(importer.report(elapsed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
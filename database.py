@@ -1,14 +1,74 @@
 import sqlite3
 import os
+import re
 import json
+import time
+import secrets
+import inspect
+import threading
+
+from keyword_matcher import find_keywords
+from metrics import timed, DB_CALL_SECONDS
 
 # Database Configuration
 DB_NAME = "resumes.db"
 
+# Connection tuning
+BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 30000))
+CACHE_SIZE_KB = int(os.environ.get("SQLITE_CACHE_SIZE_KB", 20000))
+STATEMENT_CACHE_SIZE = 256
+
+_local = threading.local()
+
+# Full-text search (FTS5 har Python build mein compiled nahi hota)
+try:
+    sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE fts_probe USING fts5(x)")
+    FTS5_AVAILABLE = True
+except sqlite3.OperationalError:
+    FTS5_AVAILABLE = False
+
+# snippet() highlight markers - HTML escape ke baad <mark> se replace hote hain
+SNIPPET_OPEN = "\x02"
+SNIPPET_CLOSE = "\x03"
+
+def _open_connection(db_name):
+    conn = sqlite3.connect(db_name, timeout=BUSY_TIMEOUT_MS / 1000, cached_statements=STATEMENT_CACHE_SIZE)
+    # WAL: readers writers ko block nahi karte; NORMAL sync WAL mein safe hai
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
 # Use SQLite for now (MySQL setup later)
 def get_connection():
-    """Get database connection (SQLite for now)"""
-    return sqlite3.connect(DB_NAME)
+    """Per-thread reusable SQLite connection (WAL, tuned pragmas, statement cache)"""
+    conns = getattr(_local, "conns", None)
+    # fork ke baad parent ka connection use karna unsafe hai
+    if conns is None or getattr(_local, "pid", None) != os.getpid():
+        conns = _local.conns = {}
+        _local.pid = os.getpid()
+
+    conn = conns.get(DB_NAME)
+    if conn is None:
+        conn = conns[DB_NAME] = _open_connection(DB_NAME)
+    elif conn.in_transaction:
+        # Pichle call ne exception ke baad transaction adhoori chhodi
+        conn.rollback()
+    return conn
+
+def close_connection():
+    """Close this thread's connections (e.g. at the end of a worker thread)"""
+    for conn in getattr(_local, "conns", {}).values():
+        conn.close()
+    _local.conns = {}
+
+def _add_column_if_missing(cur, table, column, column_type):
+    """Purani DB files ke liye simple migration"""
+    cur.execute(f"PRAGMA table_info({table})")
+    if column not in [row[1] for row in cur.fetchall()]:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
 
 # --- INITIALIZE DATABASE ---
 def init_db():
@@ -37,17 +97,236 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
+    # Ingest Jobs Table (background resume processing queue)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ingest_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            email TEXT,
+            phone TEXT,
+            file_path TEXT,
+            status TEXT NOT NULL DEFAULT 'queued',
+            resume_id INTEGER,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_ingest_jobs_status ON ingest_jobs (status, id)")
+    # Status page ke liye unguessable token (sequential id se doosron ke jobs na dikhein)
+    _add_column_if_missing(cur, "ingest_jobs", "token", "TEXT")
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_ingest_jobs_token ON ingest_jobs (token)")
+    # Extracted Resume Text Cache (content-addressed by SHA-256 of file bytes)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS resume_texts (
+            sha256 TEXT PRIMARY KEY,
+            text TEXT NOT NULL,
+            extracted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    _add_column_if_missing(cur, "resumes", "text_sha256", "TEXT")
+
+    # Structured Resume Analysis (normalized AI output, ingest par ek baar)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS resume_analysis (
+            resume_id INTEGER PRIMARY KEY,
+            skills TEXT NOT NULL,
+            experience_years REAL DEFAULT 0,
+            projects TEXT,
+            role_level TEXT,
+            domain TEXT,
+            analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # Inverted Skill Index (skill -> resumes), matching SQL mein hi hoti hai
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS resume_skills (
+            resume_id INTEGER NOT NULL,
+            skill TEXT NOT NULL,
+            PRIMARY KEY (resume_id, skill)
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_resume_skills_skill ON resume_skills (skill, resume_id)")
+    cur.execute("SELECT 1 FROM resume_skills LIMIT 1")
+    if cur.fetchone() is None:
+        # Pehle se analyzed resumes ke liye index backfill
+        cur.execute("""
+            INSERT OR IGNORE INTO resume_skills (resume_id, skill)
+            SELECT a.resume_id, lower(j.value) FROM resume_analysis a, json_each(a.skills) j
+        """)
+    # Index lowercase hai (calculate_match_percentage case ignore karta hai) - purane mixed-case rows theek karo
+    cur.execute("UPDATE OR IGNORE resume_skills SET skill = lower(skill) WHERE skill != lower(skill)")
+    cur.execute("DELETE FROM resume_skills WHERE skill != lower(skill)")
+    # resume_skills ka changelog - har insert/delete par resume id ka ek row.
+    # In-memory skill counts (topk_ranking) apne last seq ke baad wale resumes
+    # hi dobara padhte hain; purane rows prune_resume_skill_changes hatata hai
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS resume_skills_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            resume_id INTEGER NOT NULL
+        )
+    """)
+    for event, row in (("INSERT", "NEW"), ("DELETE", "OLD")):
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS resume_skills_{event.lower()}_change AFTER {event} ON resume_skills
+            BEGIN
+                INSERT INTO resume_skills_changes (resume_id) VALUES ({row}.resume_id);
+            END
+        """)
+
+    # Job Analysis Table (JD ka AI analysis, har job ke liye ek baar)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS job_analysis (
+            job_id INTEGER PRIMARY KEY,
+            skills TEXT NOT NULL,
+            projects TEXT,
+            experience_years REAL DEFAULT 0,
+            raw_json TEXT,
+            analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    _add_column_if_missing(cur, "job_analysis", "matches_version", "TEXT")
+
+    # Job Matches Table (persisted scores, GET aur API yahin se padhte hain)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS job_matches (
+            job_id INTEGER NOT NULL,
+            resume_id INTEGER NOT NULL,
+            score REAL NOT NULL,
+            matched_skills TEXT,
+            scorer_version TEXT NOT NULL,
+            scored_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (job_id, resume_id)
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_job_matches_score ON job_matches (job_id, score DESC)")
+    # Matching Runs (matching_runs.py) - DB mein taaki kisi bhi gunicorn worker se status/SSE/cancel ho
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS matching_runs (
+            id TEXT PRIMARY KEY,
+            job_id INTEGER NOT NULL,
+            analyze_job INTEGER NOT NULL DEFAULT 1,
+            status TEXT NOT NULL,
+            total INTEGER,
+            scored INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            finished_at REAL,
+            updated_at REAL NOT NULL
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_matching_runs_job ON matching_runs (job_id, created_at)")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS matching_run_events (
+            run_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            event TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (run_id, seq)
+        )
+    """)
+    # Bulk Import Progress (bulk_import.py checkpoints, interrupted run wahin se resume)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS import_progress (
+            source TEXT NOT NULL,
+            item TEXT NOT NULL,
+            status TEXT NOT NULL,
+            resume_id INTEGER,
+            error TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, item)
+        )
+    """)
+    # LLM Response Cache (persistent tier of llm_cache.LLMCache)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            cache_key TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache (created_at)")
+    # Row Counters (COUNT(*) har page view par table scan karta hai)
+    cur.execute("CREATE TABLE IF NOT EXISTS table_counts (name TEXT PRIMARY KEY, count INTEGER NOT NULL)")
+    cur.execute("INSERT OR IGNORE INTO table_counts (name, count) SELECT 'resumes', COUNT(*) FROM resumes")
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_resumes_count_insert AFTER INSERT ON resumes
+        BEGIN
+            UPDATE table_counts SET count = count + 1 WHERE name = 'resumes';
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_resumes_count_delete AFTER DELETE ON resumes
+        BEGIN
+            UPDATE table_counts SET count = count - 1 WHERE name = 'resumes';
+        END
+    """)
+    if FTS5_AVAILABLE:
+        _init_resume_search(cur)
     # Admin Table
     cur.execute("CREATE TABLE IF NOT EXISTS admin (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT, password TEXT)")
     cur.execute("SELECT * FROM admin")
     if cur.fetchone() is None:
         cur.execute("INSERT INTO admin (username, password) VALUES (?, ?)", ("admin", "admin123"))
     conn.commit()
-    conn.close()
+
+def _init_resume_search(cur):
+    """FTS5 index over name, email, summary and extracted text, synced by triggers"""
+    cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS resume_search USING fts5(
+            name, email, summary, resume_text,
+            tokenize = "unicode61 tokenchars '+#'",
+            prefix = '2 3'
+        )
+    """)
+    # rowid = resumes.id; text resume_texts se text_sha256 ke through aata hai
+    row_values = """
+        new.id, new.name, new.email, new.summary,
+        COALESCE((SELECT text FROM resume_texts WHERE sha256 = new.text_sha256), '')
+    """
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_resume_search_insert AFTER INSERT ON resumes
+        BEGIN
+            INSERT INTO resume_search (rowid, name, email, summary, resume_text) VALUES ({row_values});
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_resume_search_update
+        AFTER UPDATE OF name, email, summary, text_sha256 ON resumes
+        BEGIN
+            DELETE FROM resume_search WHERE rowid = old.id;
+            INSERT INTO resume_search (rowid, name, email, summary, resume_text) VALUES ({row_values});
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_resume_search_delete AFTER DELETE ON resumes
+        BEGIN
+            DELETE FROM resume_search WHERE rowid = old.id;
+        END
+    """)
+    # Text baad mein cache hua (ya re-extract hua) toh linked resumes update
+    for event in ("INSERT", "UPDATE"):
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_resume_search_text_{event.lower()} AFTER {event} ON resume_texts
+            BEGIN
+                UPDATE resume_search SET resume_text = new.text
+                WHERE rowid IN (SELECT id FROM resumes WHERE text_sha256 = new.sha256);
+            END
+        """)
+
+    cur.execute("SELECT 1 FROM resume_search LIMIT 1")
+    if cur.fetchone() is None:
+        # Purane resumes ka backfill
+        cur.execute("""
+            INSERT INTO resume_search (rowid, name, email, summary, resume_text)
+            SELECT r.id, r.name, r.email, r.summary, COALESCE(t.text, '')
+            FROM resumes r LEFT JOIN resume_texts t ON t.sha256 = r.text_sha256
+        """)
 
 # --- JOB FUNCTIONS ---
 def add_job_post(title, description, requirements=None):
-    conn = sqlite3.connect(DB_NAME)
+    conn = get_connection()
     cur = conn.cursor()
     cur.execute(
         "INSERT INTO job_posts (title, description, requirements) VALUES (?, ?, ?)",
@@ -55,143 +334,862 @@ def add_job_post(title, description, requirements=None):
     )
     new_id = cur.lastrowid
     conn.commit()
-    conn.close()
     return new_id
 
 def get_job_post_by_id(job_id):
-    conn = sqlite3.connect(DB_NAME)
+    conn = get_connection()
     cur = conn.cursor()
     cur.execute("SELECT * FROM job_posts WHERE id = ?", (job_id,))
     job = cur.fetchone()
-    conn.close()
     return job
 
 def get_all_job_posts():
-    conn = sqlite3.connect(DB_NAME)
+    conn = get_connection()
     cur = conn.cursor()
     cur.execute("SELECT * FROM job_posts ORDER BY id DESC")
     rows = cur.fetchall()
-    conn.close()
     return rows
 
+def save_job_analysis(job_id, profile, raw=None):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "INSERT OR REPLACE INTO job_analysis (job_id, skills, projects, experience_years, raw_json, analyzed_at) "
+        "VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)",
+        (
+            job_id,
+            json.dumps(profile.get("skills", [])),
+            json.dumps(profile.get("projects", [])),
+            profile.get("experience_years", 0),
+            json.dumps(raw) if raw is not None else None
+        )
+    )
+    # JD badla toh purane scores stale hain
+    cur.execute("DELETE FROM job_matches WHERE job_id = ?", (job_id,))
+    conn.commit()
+
+def get_all_job_analyses(matches_version=None):
+    """[(job_id, profile)] - optionally only jobs whose matches were stored with matches_version"""
+    conn = get_connection()
+    cur = conn.cursor()
+    if matches_version is None:
+        cur.execute("SELECT job_id, skills, projects, experience_years FROM job_analysis")
+    else:
+        cur.execute(
+            "SELECT job_id, skills, projects, experience_years FROM job_analysis WHERE matches_version = ?",
+            (matches_version,)
+        )
+    rows = cur.fetchall()
+    return [(r[0], {
+        "skills": json.loads(r[1]) if r[1] else [],
+        "projects": json.loads(r[2]) if r[2] else [],
+        "experience_years": r[3] or 0
+    }) for r in rows]
+
+def get_job_analysis(job_id):
+    """Stored JD profile ({skills, projects, experience_years}) or None"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT skills, projects, experience_years FROM job_analysis WHERE job_id = ?", (job_id,))
+    row = cur.fetchone()
+    if not row:
+        return None
+    return {
+        "skills": json.loads(row[0]) if row[0] else [],
+        "projects": json.loads(row[1]) if row[1] else [],
+        "experience_years": row[2] or 0
+    }
+
 # --- AI MATCHING LOGIC ---
 # Note: Iska naam 'get_job_matches' rakha hai taaki app.py se match kare
-def get_job_matches(job_id):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+TECH_KEYWORDS = ['python', 'java', 'javascript', 'react', 'node', 'sql', 'mongodb', 'aws', 'docker',
+                 'git', 'agile', 'scrum', 'api', 'rest', 'html', 'css', 'angular', 'vue', 'django',
+                 'flask', 'machine', 'learning', 'ai', 'data', 'science', 'analytics', 'devops']
+
+def _job_skills(cursor, job_id):
+    """Skills for a job: stored JD analysis, ya phir job text ke tech keywords"""
+    cursor.execute("SELECT skills FROM job_analysis WHERE job_id = ?", (job_id,))
+    row = cursor.fetchone()
+    if row and row[0]:
+        skills = json.loads(row[0])
+        if skills:
+            return skills
 
-    # Job requirements - description se keywords extract karte hain
     cursor.execute("SELECT title, description, requirements FROM job_posts WHERE id = ?", (job_id,))
     job = cursor.fetchone()
     if not job:
         return []
 
-    # Title + description + requirements se keywords banate hain
-    job_text = f"{job[0]} {job[1]} {job[2] or ''}".lower()
-    
-    # Common skills/keywords extract karte hain
-    import re
-    # Words ke liye regex (2+ letters)
-    words = re.findall(r'\b[a-zA-Z]{2,}\b', job_text)
-    
-    # Common technical skills aur qualifications
-    tech_keywords = ['python', 'java', 'javascript', 'react', 'node', 'sql', 'mongodb', 'aws', 'docker', 
-                   'git', 'agile', 'scrum', 'api', 'rest', 'html', 'css', 'angular', 'vue', 'django', 
-                   'flask', 'machine', 'learning', 'ai', 'data', 'science', 'analytics', 'devops']
-    
-    education_keywords = ['bsc', 'msc', 'bachelor', 'master', 'phd', 'degree', 'engineering', 
-                         'computer', 'science', 'information', 'technology']
-    
-    # Unique words filter karte hain
-    job_skills = list(set([word for word in words if len(word) > 2]))
-    
-    # Add specific tech/education keywords if present
-    for keyword in tech_keywords + education_keywords:
-        if keyword in job_text:
-            job_skills.append(keyword)
-
-    cursor.execute("SELECT id, name, email, phone, file_path, summary FROM resumes")
-    resumes = cursor.fetchall()
+    return find_keywords(f"{job[0]} {job[1]} {job[2] or ''}", TECH_KEYWORDS)
+
+def get_job_matches(job_id, min_percent=10):
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    job_skills = sorted(set(_job_skills(cursor, job_id)))
+    if not job_skills:
+        return []
+
+    # resume_skills index se ek hi aggregate query - sirf matching postings touch hoti hain
+    placeholders = ", ".join("?" for _ in job_skills)
+    cursor.execute(f"""
+        SELECT r.id, r.name, r.email, r.phone, r.file_path, r.summary,
+               COUNT(*) AS matched, group_concat(rs.skill, '|')
+        FROM resume_skills rs
+        JOIN resumes r ON r.id = rs.resume_id
+        WHERE rs.skill IN ({placeholders})
+        GROUP BY rs.resume_id
+        HAVING COUNT(*) * 100 >= ? * ?
+        ORDER BY matched DESC, r.id DESC
+    """, (*job_skills, min_percent, len(job_skills)))
+    rows = cursor.fetchall()
 
     matches = []
+    for r in rows:
+        match_percent = int((r[6] / len(job_skills)) * 100)
+        matches.append({
+            "id": r[0],
+            "name": r[1],
+            "email": r[2],
+            "phone": r[3],
+            "file_path": r[4],
+            "summary": r[5] or "",
+            "match": match_percent,
+            "match_percentage": match_percent,  # Add this key for template
+            "matched_skills": r[7].split("|") if r[7] else []
+        })
 
-    for r in resumes:
-        resume_text = (r[5] or "").lower()  # Summary is now at index 5
-        
-        # Count matching keywords
-        matched_keywords = []
-        for skill in job_skills:
-            if skill in resume_text:
-                matched_keywords.append(skill)
-        
-        # Calculate match percentage
-        match_percent = 0
-        if job_skills:
-            match_percent = int((len(matched_keywords) / len(job_skills)) * 100)
-        
-        # Only show matches with at least 10% match
-        if match_percent >= 10:
-            matches.append({
-                "id": r[0],
-                "name": r[1],
-                "email": r[2],
-                "phone": r[3] if len(r) > 3 else None,
-                "file_path": r[4] if len(r) > 4 else None,  # Add file_path
-                "summary": r[5] or "",
-                "match": match_percent,
-                "match_percentage": match_percent,  # Add this key for template
-                "matched_skills": matched_keywords
-            })
-
-    # Sort by match percentage (highest first)
-    matches.sort(key=lambda x: x["match"], reverse=True)
-    
-    conn.close()
     return matches
 
+# --- PERSISTED MATCH RESULTS ---
+def save_job_matches(job_id, rows, scorer_version, started_at=None):
+    """Upsert a full run's matches of a job. rows = [(resume_id, score, matched_skills)]
+
+    started_at (UTC 'YYYY-MM-DD HH:MM:SS', like scored_at): rows scored before
+    the run began and not refreshed by it (deleted resumes) are removed.
+    Rows written during the run (save_resume_matches) are kept.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.executemany(
+        "INSERT OR REPLACE INTO job_matches (job_id, resume_id, score, matched_skills, scorer_version) VALUES (?, ?, ?, ?, ?)",
+        [(job_id, resume_id, score, json.dumps(skills), scorer_version) for resume_id, score, skills in rows]
+    )
+    if started_at is not None:
+        cur.execute("DELETE FROM job_matches WHERE job_id = ? AND scored_at < ?", (job_id, started_at))
+    cur.execute("UPDATE job_analysis SET matches_version = ? WHERE job_id = ?", (scorer_version, job_id))
+    conn.commit()
+
+def save_resume_matches(resume_id, rows, scorer_version):
+    """Upsert one resume's scores against several jobs. rows = [(job_id, score, matched_skills)]"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.executemany(
+        "INSERT OR REPLACE INTO job_matches (job_id, resume_id, score, matched_skills, scorer_version) VALUES (?, ?, ?, ?, ?)",
+        [(job_id, resume_id, score, json.dumps(skills), scorer_version) for job_id, score, skills in rows]
+    )
+    conn.commit()
+
+def get_job_matches_version(job_id):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT matches_version FROM job_analysis WHERE job_id = ?", (job_id,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+def get_stored_job_matches(job_id):
+    """Stored match rows for a job, highest score first"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT r.id, r.name, r.email, r.phone, r.file_path, r.summary, m.score, m.matched_skills, m.scorer_version
+        FROM job_matches m
+        JOIN resumes r ON r.id = m.resume_id
+        WHERE m.job_id = ?
+        ORDER BY m.score DESC, r.id DESC
+    """, (job_id,))
+    rows = cur.fetchall()
+
+    return [{
+        "id": r[0],
+        "name": r[1],
+        "email": r[2],
+        "phone": r[3],
+        "file_path": r[4] or "",
+        "summary": r[5] or "",
+        "match": r[6],
+        "match_percentage": r[6],
+        "matched_skills": json.loads(r[7]) if r[7] else [],
+        "scorer_version": r[8]
+    } for r in rows]
+
+# --- MATCHING RUNS (matching_runs.py) ---
+_MATCHING_RUN_COLUMNS = "id, job_id, analyze_job, status, total, scored, error, cancel_requested, created_at, finished_at, updated_at"
+
+def create_matching_run(run_id, job_id, analyze_job, created_at):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "INSERT INTO matching_runs (id, job_id, analyze_job, status, created_at, updated_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+        (run_id, job_id, 1 if analyze_job else 0, created_at, created_at)
+    )
+    conn.commit()
+
+def save_matching_run_progress(run_id, status, total, scored, error, finished_at, events):
+    """Run ki progress + naye events (seq, event, data dict) ek transaction mein"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.executemany(
+        "INSERT INTO matching_run_events (run_id, seq, event, data) VALUES (?, ?, ?, ?)",
+        [(run_id, seq, event, json.dumps(data)) for seq, event, data in events]
+    )
+    cur.execute(
+        "UPDATE matching_runs SET status = ?, total = ?, scored = ?, error = ?, finished_at = ?, updated_at = ? WHERE id = ?",
+        (status, total, scored, error, finished_at, time.time(), run_id)
+    )
+    conn.commit()
+
+def touch_matching_run(run_id):
+    """Heartbeat; returns True if someone asked to cancel the run"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("UPDATE matching_runs SET updated_at = ? WHERE id = ?", (time.time(), run_id))
+    conn.commit()
+    cur.execute("SELECT cancel_requested FROM matching_runs WHERE id = ?", (run_id,))
+    row = cur.fetchone()
+    return bool(row and row[0])
+
+def request_matching_run_cancel(run_id):
+    """Set the cancel flag of an unfinished run; returns False if it already finished"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("UPDATE matching_runs SET cancel_requested = 1 WHERE id = ? AND finished_at IS NULL", (run_id,))
+    conn.commit()
+    return cur.rowcount == 1
+
+def get_matching_run_row(run_id):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(f"SELECT {_MATCHING_RUN_COLUMNS} FROM matching_runs WHERE id = ?", (run_id,))
+    return cur.fetchone()
+
+def get_active_matching_run_row(job_id, alive_after):
+    """Latest unfinished run of a job whose heartbeat is newer than alive_after (or None)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT {_MATCHING_RUN_COLUMNS} FROM matching_runs "
+        "WHERE job_id = ? AND finished_at IS NULL AND updated_at >= ? ORDER BY created_at DESC LIMIT 1",
+        (job_id, alive_after)
+    )
+    return cur.fetchone()
+
+def get_matching_run_events(run_id, after_seq, limit=500):
+    """[(seq, event, data dict)] with seq > after_seq"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT seq, event, data FROM matching_run_events WHERE run_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+        (run_id, after_seq, limit)
+    )
+    return [(r[0], r[1], json.loads(r[2])) for r in cur.fetchall()]
+
+def get_matching_run_results(run_id):
+    """Result entries streamed by a run so far (event order)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT data FROM matching_run_events WHERE run_id = ? AND event = 'result' ORDER BY seq",
+        (run_id,)
+    )
+    return [json.loads(r[0])["result"] for r in cur.fetchall()]
+
+def prune_matching_runs(keep, alive_after):
+    """Sirf latest `keep` finished (ya heartbeat band) runs aur unke events rakho"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT id FROM matching_runs WHERE finished_at IS NOT NULL OR updated_at < ?
+        ORDER BY created_at DESC LIMIT -1 OFFSET ?
+    """, (alive_after, keep))
+    old = [(r[0],) for r in cur.fetchall()]
+    if old:
+        cur.executemany("DELETE FROM matching_run_events WHERE run_id = ?", old)
+        cur.executemany("DELETE FROM matching_runs WHERE id = ?", old)
+    conn.commit()
+    return len(old)
+
+# --- TOP-K RANKING (cheap skill counts, topk_ranking.py) ---
+# resume_skills mein skills lowercase hain (insert par lower) - isliye seedha index lookup
+def get_resume_skills_seq():
+    """Latest resume_skills change number (0 if nothing changed yet)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT MAX(seq) FROM resume_skills_changes")
+    row = cur.fetchone()
+    return row[0] or 0
+
+def get_skill_postings():
+    """(seq, [(resume_id, skill)] ordered by resume_id) read in one snapshot"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("BEGIN")
+    try:
+        cur.execute("SELECT MAX(seq) FROM resume_skills_changes")
+        seq = cur.fetchone()[0] or 0
+        cur.execute("SELECT resume_id, skill FROM resume_skills ORDER BY resume_id")
+        postings = cur.fetchall()
+    finally:
+        conn.commit()
+    return seq, postings
+
+def get_skill_changes(after_seq):
+    """(seq, changed resume ids, [(resume_id, skill)] of those resumes now) since after_seq.
+
+    Returns None if changes after after_seq were already pruned (caller reloads everything).
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("BEGIN")
+    try:
+        cur.execute("SELECT MIN(seq), MAX(seq) FROM resume_skills_changes")
+        first, seq = cur.fetchone()
+        if first is None or seq <= after_seq:
+            return (seq or 0), [], []
+        if first > after_seq + 1:
+            return None
+        cur.execute("SELECT DISTINCT resume_id FROM resume_skills_changes WHERE seq > ? AND seq <= ?", (after_seq, seq))
+        changed = [r[0] for r in cur.fetchall()]
+        cur.execute("""
+            SELECT resume_id, skill FROM resume_skills
+            WHERE resume_id IN (SELECT resume_id FROM resume_skills_changes WHERE seq > ? AND seq <= ?)
+            ORDER BY resume_id
+        """, (after_seq, seq))
+        postings = cur.fetchall()
+    finally:
+        conn.commit()
+    return seq, changed, postings
+
+def prune_resume_skill_changes(keep):
+    """Delete all but the latest `keep` changelog rows; returns rows deleted"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "DELETE FROM resume_skills_changes WHERE seq <= (SELECT MAX(seq) FROM resume_skills_changes) - ?",
+        (keep,),
+    )
+    conn.commit()
+    return cur.rowcount
+
+def get_resume_match_fields(resume_ids):
+    """{resume_id: (experience_years, projects)} from the stored analysis"""
+    if not resume_ids:
+        return {}
+    conn = get_connection()
+    cur = conn.cursor()
+    placeholders = ", ".join("?" for _ in resume_ids)
+    cur.execute(
+        f"SELECT resume_id, experience_years, projects FROM resume_analysis WHERE resume_id IN ({placeholders})",
+        list(resume_ids)
+    )
+    rows = cur.fetchall()
+    return {r[0]: (r[1] or 0, json.loads(r[2]) if r[2] else []) for r in rows}
+
+def get_resumes_without_skills(skills, before_id=None, limit=100):
+    """Analyzed resumes having none of the skills: [(resume_id, experience_years, projects)], id DESC (keyset)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    placeholders = ", ".join("?" for _ in skills) or "NULL"
+    cur.execute(f"""
+        SELECT a.resume_id, a.experience_years, a.projects
+        FROM resume_analysis a
+        WHERE (? IS NULL OR a.resume_id < ?)
+          AND NOT EXISTS (SELECT 1 FROM resume_skills rs WHERE rs.resume_id = a.resume_id AND rs.skill IN ({placeholders}))
+        ORDER BY a.resume_id DESC
+        LIMIT ?
+    """, (before_id, before_id, *skills, limit))
+    rows = cur.fetchall()
+    return [(r[0], r[1] or 0, json.loads(r[2]) if r[2] else []) for r in rows]
+
+def get_matched_skills(resume_ids, skills):
+    """{resume_id: set of the given skills the resume has}"""
+    if not resume_ids or not skills:
+        return {}
+    conn = get_connection()
+    cur = conn.cursor()
+    id_placeholders = ", ".join("?" for _ in resume_ids)
+    skill_placeholders = ", ".join("?" for _ in skills)
+    cur.execute(
+        f"SELECT resume_id, skill FROM resume_skills WHERE resume_id IN ({id_placeholders}) AND skill IN ({skill_placeholders})",
+        [*resume_ids, *skills]
+    )
+    matched = {}
+    for resume_id, skill in cur.fetchall():
+        matched.setdefault(resume_id, set()).add(skill)
+    return matched
+
 # --- RESUME UTILITIES ---
-def add_resume(name, email, phone, photo, file_path, summary):
-    conn = sqlite3.connect(DB_NAME)
+def add_resume(name, email, phone, photo, file_path, summary, text_sha256=None):
+    conn = get_connection()
     cur = conn.cursor()
-    cur.execute("INSERT INTO resumes (name, email, phone, photo, file_path, summary) VALUES (?, ?, ?, ?, ?, ?)", 
-                (name, email, phone, photo, file_path, summary))
+    cur.execute("INSERT INTO resumes (name, email, phone, photo, file_path, summary, text_sha256) VALUES (?, ?, ?, ?, ?, ?, ?)", 
+                (name, email, phone, photo, file_path, summary, text_sha256))
     new_id = cur.lastrowid
     conn.commit()
-    conn.close()
     return new_id
 
+# --- INGEST QUEUE ---
+# Status flow: queued -> extracting -> analyzing -> done (ya failed)
+def add_ingest_job(name, email, phone, file_path):
+    """Queue a job. Returns (job id, status token)"""
+    token = secrets.token_urlsafe(16)
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "INSERT INTO ingest_jobs (name, email, phone, file_path, status, token) VALUES (?, ?, ?, ?, 'queued', ?)",
+        (name, email, phone, file_path, token)
+    )
+    new_id = cur.lastrowid
+    conn.commit()
+    return new_id, token
+
+def claim_next_ingest_job():
+    """Atomically move the oldest queued job to 'extracting' and return it (or None)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    while True:
+        cur.execute("SELECT id FROM ingest_jobs WHERE status = 'queued' ORDER BY id LIMIT 1")
+        row = cur.fetchone()
+        if row is None:
+            return None
+        # Dusre worker/process ne pehle claim kar liya ho toh agla try karo
+        cur.execute(
+            "UPDATE ingest_jobs SET status = 'extracting', updated_at = CURRENT_TIMESTAMP "
+            "WHERE id = ? AND status = 'queued'",
+            (row[0],)
+        )
+        conn.commit()
+        if cur.rowcount == 1:
+            cur.execute("SELECT * FROM ingest_jobs WHERE id = ?", (row[0],))
+            return cur.fetchone()
+
+def update_ingest_job_status(job_id, status, error=None):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE ingest_jobs SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (status, error, job_id)
+    )
+    conn.commit()
+
+def complete_ingest_job(job_id, name, email, phone, photo, file_path, summary, text_sha256=None, analysis=None):
+    """Insert the resume row (+ its analysis) and mark the job done in a single transaction"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("INSERT INTO resumes (name, email, phone, photo, file_path, summary, text_sha256) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, email, phone, photo, file_path, summary, text_sha256))
+    resume_id = cur.lastrowid
+    if analysis is not None:
+        _save_resume_analysis(cur, resume_id, analysis)
+    cur.execute(
+        "UPDATE ingest_jobs SET status = 'done', resume_id = ?, error = NULL, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (resume_id, job_id)
+    )
+    conn.commit()
+    return resume_id
+
+# --- BULK IMPORT ---
+def get_imported_items(source):
+    """Items of an import source that were already saved (status 'done')"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT item FROM import_progress WHERE source = ? AND status = 'done'", (source,))
+    rows = cur.fetchall()
+    return {r[0] for r in rows}
+
+def save_import_batch(source, rows, failures=()):
+    """Insert a batch of imported resumes in one transaction, using executemany.
+
+    rows: dicts with item, name, email, phone, file_path, summary,
+    text_sha256, text and analysis (profile or None). failures: (item, error)
+    pairs. The import_progress checkpoint is written in the same transaction.
+    Returns the new resume ids (same order as rows).
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("BEGIN IMMEDIATE")
+    try:
+        cur.executemany(
+            "INSERT OR IGNORE INTO resume_texts (sha256, text) VALUES (?, ?)",
+            [(r["text_sha256"], r["text"]) for r in rows if r["text_sha256"] and r["text"]]
+        )
+        # Write lock ke andar ids pehle se assign - executemany lastrowid nahi deta
+        cur.execute("""
+            SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'resumes'), 0),
+                       COALESCE((SELECT MAX(id) FROM resumes), 0))
+        """)
+        first_id = cur.fetchone()[0] + 1
+        resume_ids = list(range(first_id, first_id + len(rows)))
+
+        cur.executemany(
+            "INSERT INTO resumes (id, name, email, phone, photo, file_path, summary, text_sha256) "
+            "VALUES (?, ?, ?, ?, '', ?, ?, ?)",
+            [(rid, r["name"], r["email"], r["phone"], r["file_path"], r["summary"], r["text_sha256"])
+             for rid, r in zip(resume_ids, rows)]
+        )
+        analyzed = [(rid, r["analysis"]) for rid, r in zip(resume_ids, rows) if r["analysis"] is not None]
+        cur.executemany(
+            "INSERT OR REPLACE INTO resume_analysis (resume_id, skills, experience_years, projects, role_level, domain) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(rid, json.dumps(a.get("skills", [])), a.get("experience_years", 0), json.dumps(a.get("projects", [])),
+              a.get("role_level", "unknown"), a.get("domain", "general")) for rid, a in analyzed]
+        )
+        cur.executemany(
+            "INSERT OR IGNORE INTO resume_skills (resume_id, skill) VALUES (?, ?)",
+            [(rid, str(skill).lower()) for rid, a in analyzed for skill in a.get("skills", [])]
+        )
+        cur.executemany(
+            "INSERT OR REPLACE INTO import_progress (source, item, status, resume_id, error) VALUES (?, ?, 'done', ?, NULL)",
+            [(source, r["item"], rid) for rid, r in zip(resume_ids, rows)]
+        )
+        cur.executemany(
+            "INSERT OR REPLACE INTO import_progress (source, item, status, error) VALUES (?, ?, 'failed', ?)",
+            [(source, item, error) for item, error in failures]
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return resume_ids
+
+def get_ingest_job_by_token(token):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT id, status, resume_id, error, created_at, updated_at FROM ingest_jobs WHERE token = ?", (token,))
+    job = cur.fetchone()
+    return job
+
+def touch_ingest_jobs(job_ids):
+    """Heartbeat: in-progress jobs ka updated_at refresh (worker zinda hai)"""
+    if not job_ids:
+        return
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.executemany(
+        "UPDATE ingest_jobs SET updated_at = CURRENT_TIMESTAMP WHERE id = ? AND status IN ('extracting', 'analyzing')",
+        [(job_id,) for job_id in job_ids]
+    )
+    conn.commit()
+
+def requeue_stale_ingest_jobs(stale_seconds):
+    """Jobs stuck mid-processing (crashed worker, heartbeat band) ko wapas queue mein daalo"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE ingest_jobs SET status = 'queued', updated_at = CURRENT_TIMESTAMP "
+        "WHERE status IN ('extracting', 'analyzing') AND updated_at <= datetime('now', ?)",
+        (f"-{int(stale_seconds)} seconds",)
+    )
+    count = cur.rowcount
+    conn.commit()
+    return count
+
+# --- RESUME ANALYSIS ---
+def _save_resume_analysis(cur, resume_id, analysis):
+    cur.execute("DELETE FROM resume_skills WHERE resume_id = ?", (resume_id,))
+    cur.executemany(
+        "INSERT OR IGNORE INTO resume_skills (resume_id, skill) VALUES (?, ?)",
+        [(resume_id, str(skill).lower()) for skill in analysis.get("skills", [])]
+    )
+    cur.execute(
+        "INSERT OR REPLACE INTO resume_analysis (resume_id, skills, experience_years, projects, role_level, domain) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            resume_id,
+            json.dumps(analysis.get("skills", [])),
+            analysis.get("experience_years", 0),
+            json.dumps(analysis.get("projects", [])),
+            analysis.get("role_level", "unknown"),
+            analysis.get("domain", "general")
+        )
+    )
+
+def _analysis_from_row(skills, experience_years, projects, role_level, domain):
+    return {
+        "skills": json.loads(skills) if skills else [],
+        "experience_years": experience_years or 0,
+        "projects": json.loads(projects) if projects else [],
+        "role_level": role_level or "unknown",
+        "domain": domain or "general"
+    }
+
+def save_resume_analysis(resume_id, analysis):
+    conn = get_connection()
+    cur = conn.cursor()
+    _save_resume_analysis(cur, resume_id, analysis)
+    conn.commit()
+
+def get_resume_analysis(resume_id):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT skills, experience_years, projects, role_level, domain FROM resume_analysis WHERE resume_id = ?",
+        (resume_id,)
+    )
+    row = cur.fetchone()
+    return _analysis_from_row(*row) if row else None
+
+def get_resumes_with_analysis():
+    """All resumes joined with their stored analysis ('analysis' is None if not analyzed yet)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT r.id, r.name, r.email, r.phone, r.file_path, r.summary,
+               a.skills, a.experience_years, a.projects, a.role_level, a.domain
+        FROM resumes r
+        LEFT JOIN resume_analysis a ON a.resume_id = r.id
+        ORDER BY r.id DESC
+    """)
+    rows = cur.fetchall()
+
+    return [{
+        "id": r[0],
+        "name": r[1],
+        "email": r[2],
+        "phone": r[3],
+        "file_path": r[4],
+        "summary": r[5] or "",
+        "analysis": _analysis_from_row(*r[6:11]) if r[6] is not None else None
+    } for r in rows]
+
+# --- EXTRACTED TEXT CACHE ---
+def get_resume_text_by_hash(sha256):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT text FROM resume_texts WHERE sha256 = ?", (sha256,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+def save_resume_text(sha256, text):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("INSERT OR REPLACE INTO resume_texts (sha256, text) VALUES (?, ?)", (sha256, text))
+    conn.commit()
+
+def get_all_resume_texts():
+    """[(resume_id, extracted_text)] for every resume whose text is cached"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT r.id, t.text FROM resumes r
+        JOIN resume_texts t ON t.sha256 = r.text_sha256
+        ORDER BY r.id
+    """)
+    rows = cur.fetchall()
+    return rows
+
+def update_resume_text_hash(resume_id, sha256):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("UPDATE resumes SET text_sha256 = ? WHERE id = ?", (sha256, resume_id))
+    conn.commit()
+
+# --- LLM RESPONSE CACHE ---
+def get_llm_cache_entry(cache_key, min_created_at):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT response FROM llm_cache WHERE cache_key = ? AND created_at >= ?",
+        (cache_key, min_created_at)
+    )
+    row = cur.fetchone()
+    return row[0] if row else None
+
+def save_llm_cache_entry(cache_key, response, created_at):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "INSERT OR REPLACE INTO llm_cache (cache_key, response, created_at) VALUES (?, ?, ?)",
+        (cache_key, response, created_at)
+    )
+    conn.commit()
+
+def evict_llm_cache(min_created_at, max_rows):
+    """Delete expired rows, then the oldest rows beyond max_rows. Returns rows deleted."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM llm_cache WHERE created_at < ?", (min_created_at,))
+    deleted = cur.rowcount
+    cur.execute(
+        "DELETE FROM llm_cache WHERE cache_key IN ("
+        "SELECT cache_key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+        (max_rows,)
+    )
+    deleted += cur.rowcount
+    conn.commit()
+    return deleted
+
 def update_resume_summary(resume_id, summary):
-    conn = sqlite3.connect(DB_NAME)
+    conn = get_connection()
     cur = conn.cursor()
     cur.execute("UPDATE resumes SET summary = ? WHERE id = ?", (summary, resume_id))
     conn.commit()
-    conn.close()
 
 def get_all_resumes():
-    conn = sqlite3.connect(DB_NAME)
+    conn = get_connection()
     cur = conn.cursor()
     cur.execute("SELECT * FROM resumes ORDER BY id DESC")
     data = cur.fetchall()
-    conn.close()
     return data
 
+# Dashboard list view ke columns (text_sha256 jaise extra columns nahi)
+RESUME_LIST_COLUMNS = "id, name, email, phone, photo, file_path, summary"
+
+def count_resumes():
+    """Total resumes from the trigger-maintained counter (O(1))"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT count FROM table_counts WHERE name = 'resumes'")
+    row = cur.fetchone()
+    return row[0] if row else 0
+
+def get_resumes_page(limit, offset=0, before_id=None):
+    """One page of resumes, newest first.
+
+    With before_id (keyset cursor = last id of the previous page) the query
+    seeks straight to the page via the primary key; otherwise LIMIT/OFFSET.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    if before_id is not None:
+        cur.execute(
+            f"SELECT {RESUME_LIST_COLUMNS} FROM resumes WHERE id < ? ORDER BY id DESC LIMIT ?",
+            (before_id, limit)
+        )
+    else:
+        cur.execute(
+            f"SELECT {RESUME_LIST_COLUMNS} FROM resumes ORDER BY id DESC LIMIT ? OFFSET ?",
+            (limit, offset)
+        )
+    rows = cur.fetchall()
+    return rows
+
+# Export ke columns (key -> CSV header), is order mein
+EXPORT_COLUMNS = {
+    "id": "ID",
+    "name": "Name",
+    "email": "Email",
+    "phone": "Phone",
+    "photo": "Photo",
+    "file_path": "File Path",
+    "summary": "Summary",
+}
+
+def iter_resumes(columns=None, batch_size=500):
+    """Yield lists of resume rows (selected EXPORT_COLUMNS, newest first) via fetchmany"""
+    columns = [c for c in (columns or EXPORT_COLUMNS) if c in EXPORT_COLUMNS]
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(f"SELECT {', '.join(columns)} FROM resumes ORDER BY id DESC")
+    try:
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        # Client beech mein disconnect (GeneratorExit) ho tab bhi read statement band ho
+        cur.close()
+
 def get_resume_by_id(resume_id):
-    conn = sqlite3.connect(DB_NAME)
+    conn = get_connection()
     cur = conn.cursor()
     cur.execute("SELECT * FROM resumes WHERE id = ?", (resume_id,))
     resume = cur.fetchone()
-    conn.close()
     return resume
 
+def get_resumes_by_ids(resume_ids):
+    """{id: (id, name, email, phone, file_path, summary)} for the given ids"""
+    if not resume_ids:
+        return {}
+    conn = get_connection()
+    cur = conn.cursor()
+    placeholders = ", ".join("?" for _ in resume_ids)
+    cur.execute(
+        f"SELECT id, name, email, phone, file_path, summary FROM resumes WHERE id IN ({placeholders})",
+        list(resume_ids)
+    )
+    rows = cur.fetchall()
+    return {r[0]: r for r in rows}
+
 def filter_resumes_by_keyword(keyword):
-    conn = sqlite3.connect(DB_NAME)
+    conn = get_connection()
     cur = conn.cursor()
     query = f"%{keyword}%"
     cur.execute("SELECT * FROM resumes WHERE name LIKE ? OR email LIKE ? OR summary LIKE ? ORDER BY id DESC", (query, query, query))
     results = cur.fetchall()
-    conn.close()
     return results
 
+# --- FULL-TEXT SEARCH ---
+# Column weights for bm25(): name aur email hits summary/body se zyada relevant
+SEARCH_WEIGHTS = (10.0, 8.0, 3.0, 1.0)
+SEARCH_TERM_RE = re.compile(r'[^\s"]+')
+
+def build_fts_query(text, prefix_last=True):
+    """User input -> safe FTS5 query (quoted terms, AND-ed).
+
+    "term*" is a prefix query; the last term is a prefix by default so
+    search-as-you-type works.
+    """
+    terms = []
+    for raw in SEARCH_TERM_RE.findall(text or ""):
+        body = raw.rstrip("*")
+        if not re.search(r"\w", body):
+            continue
+        terms.append(f'"{body}"' + ("*" if raw.endswith("*") else ""))
+    if prefix_last and terms and not terms[-1].endswith("*"):
+        terms[-1] += "*"
+    return " ".join(terms)
+
+def search_resumes(text, limit=20, offset=0):
+    """BM25-ranked resume search. Returns (total, [result dicts]) with highlighted snippets."""
+    query = build_fts_query(text)
+    if not query:
+        return 0, []
+
+    if not FTS5_AVAILABLE:
+        rows = filter_resumes_by_keyword(text.strip())
+        return len(rows), [{
+            "id": r[0], "name": r[1], "email": r[2], "phone": r[3], "file_path": r[5],
+            "summary": r[6] or "", "snippet": "", "score": 0.0
+        } for r in rows[offset:offset + limit]]
+
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM resume_search WHERE resume_search MATCH ?", (query,))
+    total = cur.fetchone()[0]
+    cur.execute(f"""
+        SELECT r.id, r.name, r.email, r.phone, r.file_path, r.summary,
+               snippet(resume_search, -1, ?, ?, '…', 16),
+               bm25(resume_search, {", ".join(str(w) for w in SEARCH_WEIGHTS)}) AS score
+        FROM resume_search
+        JOIN resumes r ON r.id = resume_search.rowid
+        WHERE resume_search MATCH ?
+        ORDER BY score, r.id DESC
+        LIMIT ? OFFSET ?
+    """, (SNIPPET_OPEN, SNIPPET_CLOSE, query, limit, offset))
+    rows = cur.fetchall()
+    return total, [{
+        "id": r[0],
+        "name": r[1],
+        "email": r[2],
+        "phone": r[3],
+        "file_path": r[4],
+        "summary": r[5] or "",
+        "snippet": r[6] or "",
+        "score": round(-r[7], 4)    # bm25 negative hota hai, chhota = better
+    } for r in rows]
+
 # def filter_resumes_by_post(post_type):
 #     conn = sqlite3.connect(DB_NAME)
 #     cur = conn.cursor()
@@ -201,9 +1199,21 @@ def filter_resumes_by_keyword(keyword):
 #     return results
 
 def verify_admin(username, password):
-    conn = sqlite3.connect(DB_NAME)
+    conn = get_connection()
     cur = conn.cursor()
     cur.execute("SELECT * FROM admin WHERE username = ? AND password = ?", (username, password))
     user = cur.fetchone()
-    conn.close()
-    return user is not None
\ No newline at end of file
+    return user is not None
+
+# --- METRICS ---
+# Har public helper ka timing db_call_seconds{function=...} mein.
+# Connection helpers aur generators (iter_resumes) wrap nahi hote.
+_UNTIMED = {"get_connection", "close_connection", "build_fts_query"}
+
+def _instrument_helpers():
+    for name, fn in list(globals().items()):
+        if (inspect.isfunction(fn) and fn.__module__ == __name__ and not name.startswith("_")
+                and name not in _UNTIMED and not inspect.isgeneratorfunction(fn)):
+            globals()[name] = timed(DB_CALL_SECONDS, function=name)(fn)
+
+_instrument_helpers()
@@ -0,0 +1,204 @@
+# =====================================================
+# BACKGROUND RESUME INGESTION QUEUE
+# =====================================================
+# Upload request sirf file save karke job queue mein daalta hai.
+# Worker threads DB se job claim karte hain aur
+# queued -> extracting -> analyzing -> done status se guzarte hain.
+# Jobs ingest_jobs table mein hain, isliye restart par kaam nahi khota.
+# Heartbeat thread har HEARTBEAT_SECONDS par apne in-progress jobs ka
+# updated_at refresh karta hai aur (kisi bhi process ke) jin jobs ka heartbeat
+# STALE_JOB_SECONDS se ruka hai unhe wapas queue mein daalta hai - crashed
+# worker/process ka job chalte server mein bhi recover hota hai.
+
+import os
+import threading
+import traceback
+
+from rag_summary import analyze_resume_text, build_resume_profile, extract_text_with_hash
+from semantic_index import index_resume
+from matching_engine import score_resume_against_jobs
+from database import (
+    add_ingest_job,
+    claim_next_ingest_job,
+    update_ingest_job_status,
+    complete_ingest_job,
+    touch_ingest_jobs,
+    requeue_stale_ingest_jobs,
+)
+
+INGEST_WORKERS = int(os.environ.get("INGEST_WORKERS", 2))
+POLL_INTERVAL = 5          # seconds - dusre process ke jobs bhi pick ho jayein
+HEARTBEAT_SECONDS = 30     # in-progress jobs ka updated_at itni der mein refresh
+STALE_JOB_SECONDS = 120    # itni der heartbeat nahi = crashed worker
+
+DEFAULT_SUMMARY = "• Technology professional with comprehensive software development expertise."
+NO_TEXT_SUMMARY = "• Could not extract text from resume. Please check file format."
+
+
+# =====================================================
+# SUMMARY BUILDER
+# =====================================================
+def build_summary(resume_analysis):
+    """Build the bullet summary shown on the dashboard from the AI analysis"""
+    if not resume_analysis or not resume_analysis.get("skills"):
+        return DEFAULT_SUMMARY
+
+    skills_str = ", ".join(resume_analysis["skills"][:5])
+    exp_years = resume_analysis.get("experience_years", 0)
+    role_level = resume_analysis.get("role_level", "professional")
+
+    summary = f"• {role_level.title()} technology professional with {exp_years}+ years of experience.\n"
+    summary += f"• Proficient in {skills_str} with focus on scalable solutions.\n"
+
+    if resume_analysis.get("projects_count", 0) > 0:
+        summary += f"• Successfully delivered {resume_analysis['projects_count']} technical projects.\n"
+
+    if resume_analysis.get("domain") and resume_analysis["domain"] != "general":
+        summary += f"• Strong background in {resume_analysis['domain'].title()} industry.\n"
+
+    if resume_analysis.get("key_achievements"):
+        summary += f"• Experience with {', '.join(resume_analysis['key_achievements'][:2])}."
+
+    return summary
+
+
+# =====================================================
+# SINGLE JOB PROCESSING
+# =====================================================
+def process_ingest_job(job):
+    """Run extraction + analysis for one claimed ingest_jobs row"""
+    job_id, name, email, phone, file_path = job[0], job[1], job[2], job[3], job[4]
+
+    print(f"DEBUG: [ingest {job_id}] extracting {file_path}")
+    # Text ek hi baar extract hoke resume_texts table mein store hota hai
+    resume_text, text_sha256 = extract_text_with_hash(file_path)
+    print(f"DEBUG: [ingest {job_id}] Extracted resume text length: {len(resume_text)}")
+
+    profile = None
+    if resume_text:
+        update_ingest_job_status(job_id, "analyzing")
+        try:
+            resume_analysis = analyze_resume_text(resume_text)
+            print(f"DEBUG: [ingest {job_id}] Resume analysis: {resume_analysis}")
+            summary = build_summary(resume_analysis)
+            # Normalized analysis save hoti hai, matching mein dobara LLM call nahi
+            profile = build_resume_profile(resume_analysis)
+        except Exception as e:
+            print(f"DEBUG: [ingest {job_id}] Resume analysis failed: {e}")
+            traceback.print_exc()
+            summary = DEFAULT_SUMMARY
+    else:
+        print(f"DEBUG: [ingest {job_id}] No resume text extracted")
+        summary = NO_TEXT_SUMMARY
+
+    resume_id = complete_ingest_job(job_id, name, email, phone, "", file_path, summary, text_sha256, profile)
+    print(f"DEBUG: [ingest {job_id}] Resume {resume_id} saved to database successfully")
+
+    # Semantic index mein incremental add
+    if resume_text:
+        index_resume(resume_id, resume_text)
+
+    # Sirf is resume ko existing jobs ke against score karo (poora N x M grid nahi)
+    if profile is not None:
+        try:
+            scored = score_resume_against_jobs(resume_id, profile)
+            print(f"DEBUG: [ingest {job_id}] Scored against {scored} jobs")
+        except Exception as e:
+            print(f"DEBUG: [ingest {job_id}] Incremental matching failed: {e}")
+    return resume_id
+
+
+# =====================================================
+# WORKER POOL
+# =====================================================
+class IngestQueue:
+    def __init__(self, workers=INGEST_WORKERS, poll_interval=POLL_INTERVAL, heartbeat_interval=HEARTBEAT_SECONDS):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._active = set()     # is process ke workers ke paas abhi jo job ids hain
+
+    def start(self):
+        """Start worker + heartbeat threads (idempotent)"""
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            targets = [(self._heartbeat, "ingest-heartbeat")]
+            targets += [(self._worker, f"ingest-worker-{i}") for i in range(self.workers)]
+            for target, name in targets:
+                t = threading.Thread(target=target, name=name, daemon=True)
+                t.start()
+                self._threads.append(t)
+        self._wakeup.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wakeup.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def enqueue(self, name, email, phone, file_path):
+        """Persist a new job and wake a worker. Returns the job's status token."""
+        job_id, token = add_ingest_job(name, email, phone, file_path)
+        print(f"DEBUG: Resume queued for processing (ingest job {job_id})")
+        self.start()
+        self._wakeup.set()
+        return token
+
+    def _heartbeat(self):
+        # Pehla pass turant - restart se pehle ke adhoore jobs bhi yahin recover hote hain
+        while True:
+            try:
+                with self._lock:
+                    active = list(self._active)
+                touch_ingest_jobs(active)
+                recovered = requeue_stale_ingest_jobs(STALE_JOB_SECONDS)
+                if recovered:
+                    print(f"DEBUG: Re-queued {recovered} stale ingest jobs")
+                    self._wakeup.set()
+            except Exception as e:
+                print(f"DEBUG: Ingest heartbeat failed: {e}")
+            if self._stop.wait(self.heartbeat_interval):
+                return
+
+    def _worker(self):
+        while not self._stop.is_set():
+            try:
+                job = claim_next_ingest_job()
+            except Exception as e:
+                print(f"DEBUG: Ingest claim failed: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            with self._lock:
+                self._active.add(job[0])
+            try:
+                process_ingest_job(job)
+            except Exception as e:
+                print(f"DEBUG: [ingest {job[0]}] failed: {e}")
+                traceback.print_exc()
+                update_ingest_job_status(job[0], "failed", str(e))
+            finally:
+                with self._lock:
+                    self._active.discard(job[0])
+
+
+ingest_queue = IngestQueue()
+
+
+def start_ingest_workers():
+    ingest_queue.start()
+
+
+def enqueue_resume(name, email, phone, file_path):
+    return ingest_queue.enqueue(name, email, phone, file_path)
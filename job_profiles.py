@@ -0,0 +1,29 @@
+# =====================================================
+# JOB DESCRIPTION ANALYSIS (ONCE PER JOB)
+# =====================================================
+# JD ko LLM se sirf job create hote waqt analyze karte hain aur
+# normalized profile job_analysis table mein save hota hai.
+# Matching har resume ke liye isi stored profile ko use karta hai.
+
+from rag_summary import analyze_job_text, build_job_profile
+from database import get_job_post_by_id, save_job_analysis, get_job_analysis
+
+
+def analyze_job_post(job_id, force=False):
+    """Return the stored JD profile, calling the LLM only if missing or force=True"""
+    if not force:
+        profile = get_job_analysis(job_id)
+        if profile is not None:
+            return profile
+
+    job = get_job_post_by_id(job_id)
+    if not job:
+        return None
+
+    print(f"DEBUG: Analyzing job {job_id} with LLM")
+    # force = "re-analyze" - LLM cache ka purana jawab nahi chahiye
+    raw_jd = analyze_job_text(job[2], refresh=force)
+    profile = build_job_profile(raw_jd)
+    save_job_analysis(job_id, profile, raw_jd)
+    return profile
+
@@ -0,0 +1,98 @@
+# =====================================================
+# MULTI-PATTERN KEYWORD MATCHER (AHO-CORASICK)
+# =====================================================
+# Fallback skill detection pehle har keyword ke liye `k in text` karta tha:
+# har keyword = text ka ek poora pass, aur koi word boundary nahi
+# ("java" "javascript" ke andar bhi mil jaata tha).
+# Yahan har vocabulary ke liye ek Aho-Corasick automaton ek baar banta hai
+# (get_matcher cache karta hai) aur text ek hi pass mein scan hota hai.
+# Matching case-insensitive hai; result mein keyword wahi spelling mein
+# aata hai jo vocabulary mein diya tha.
+# Boundary cases + regex parity: tests/test_keyword_matcher.py
+
+from collections import deque
+from functools import lru_cache
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a fixed keyword list, word-boundary aware"""
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self._patterns = [k.lower() for k in self.keywords]
+        self._build()
+
+    def _build(self):
+        goto = [{}]
+        outputs = [[]]
+        for index, pattern in enumerate(self._patterns):
+            state = 0
+            for ch in pattern:
+                if ch not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            outputs[state].append(index)
+
+        # BFS se failure links, aur unse poori transition table (delta) -
+        # scan ke time failure links follow nahi karne padte
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = delta[fail[state]]
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            delta[state] = dict(fallback)
+            for ch, child in goto[state].items():
+                fail[child] = fallback.get(ch, 0) if state else 0
+                delta[state][ch] = child
+                queue.append(child)
+
+        self._delta = delta
+        self._outputs = outputs
+
+    def _accept(self, text, start, end, index):
+        pattern = self._patterns[index]
+        if _is_word_char(pattern[0]) and start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if _is_word_char(pattern[-1]) and end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
+
+    def iter_matches(self, text):
+        """Yield (start, end, keyword) for every whole-word occurrence, in one pass"""
+        text = (text or "").lower()
+        delta, outputs, patterns = self._delta, self._outputs, self._patterns
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            for index in outputs[state]:
+                start = i + 1 - len(patterns[index])
+                if self._accept(text, start, i + 1, index):
+                    yield start, i + 1, self.keywords[index]
+
+    def find(self, text):
+        """Keywords present in text, in vocabulary order"""
+        found = {keyword for _, _, keyword in self.iter_matches(text)}
+        return [k for k in self.keywords if k in found]
+
+
+@lru_cache(maxsize=64)
+def _cached_matcher(keywords):
+    return KeywordMatcher(keywords)
+
+
+def get_matcher(keywords):
+    """Shared matcher for a vocabulary (automaton built once per keyword tuple)"""
+    return _cached_matcher(tuple(keywords))
+
+
+def find_keywords(text, keywords):
+    return get_matcher(keywords).find(text)
+
@@ -0,0 +1,121 @@
+# =====================================================
+# TWO-TIER LLM RESPONSE CACHE
+# =====================================================
+# Same JD / same resume / re-upload par prompt bilkul same hota hai aur
+# temperature 0.1 par output practically same aata hai. Isliye:
+#   tier 1 - in-process LRU (microseconds)
+#   tier 2 - SQLite llm_cache table (restart ke baad bhi), TTL + size limit
+# Key = model + prompt hash + options + mode (full / json-stream).
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from database import get_llm_cache_entry, save_llm_cache_entry, evict_llm_cache
+
+LLM_CACHE_MEMORY_ENTRIES = int(os.environ.get("LLM_CACHE_MEMORY_ENTRIES", 512))
+LLM_CACHE_TTL_SECONDS = int(os.environ.get("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+LLM_CACHE_MAX_ROWS = int(os.environ.get("LLM_CACHE_MAX_ROWS", 20000))
+EVICT_EVERY_N_WRITES = 100
+
+
+def make_cache_key(model, prompt, options, mode="full"):
+    """Stable key from model, SHA-256 of the prompt, generation options and mode"""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    raw = json.dumps(
+        {"model": model, "prompt": prompt_hash, "options": options, "mode": mode},
+        sort_keys=True
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, max_entries=LLM_CACHE_MEMORY_ENTRIES, ttl_seconds=LLM_CACHE_TTL_SECONDS,
+                 max_rows=LLM_CACHE_MAX_ROWS, persistent=True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self.persistent = persistent
+        self._memory = OrderedDict()   # key -> (response, created_at)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _remember(self, key, response, created_at):
+        with self._lock:
+            self._memory[key] = (response, created_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def get(self, key):
+        """Cached response or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[1] <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return entry[0]
+                del self._memory[key]
+
+        if self.persistent:
+            try:
+                response = get_llm_cache_entry(key, now - self.ttl_seconds)
+            except Exception as e:
+                print(f"DEBUG: LLM cache read failed: {e}")
+                response = None
+            if response is not None:
+                self._count("disk_hits")
+                self._remember(key, response, now)
+                return response
+
+        self._count("misses")
+        return None
+
+    def set(self, key, response):
+        # Error/empty response cache nahi karte
+        if not response:
+            return
+        now = time.time()
+        self._remember(key, response, now)
+        self._count("sets")
+
+        if not self.persistent:
+            return
+        try:
+            save_llm_cache_entry(key, response, now)
+            with self._lock:
+                self._writes += 1
+                evict_now = self._writes % EVICT_EVERY_N_WRITES == 0
+            if evict_now:
+                self._count("evictions", evict_llm_cache(now - self.ttl_seconds, self.max_rows))
+        except Exception as e:
+            print(f"DEBUG: LLM cache write failed: {e}")
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._stats)
+            data["memory_entries"] = len(self._memory)
+        lookups = data["memory_hits"] + data["disk_hits"] + data["misses"]
+        data["hit_rate"] = (data["memory_hits"] + data["disk_hits"]) / lookups if lookups else 0.0
+        return data
@@ -0,0 +1,256 @@
+# =====================================================
+# PARALLEL JOB MATCHING ENGINE
+# =====================================================
+# Ek job ke against saare resumes score karta hai:
+#   - stored analysis wale resumes ek vectorized pass (SkillMatrix) mein score hote hain
+#   - baaki resumes ka text process pool par extract hota hai (sirf prompt jitna)
+#   - LLM calls ek configurable concurrency limit ke andar chalti hain
+#   - har result aate hi score hoke on_result callback ko milta hai
+#   - cancel (threading.Event) set ho toh bache hue LLM calls skip, kuch save nahi
+# Background matching runs (matching_runs.py) aur CLI dono yahi use karte hain.
+#
+# CLI usage:
+#   python matching_engine.py --job-id 3 --llm-concurrency 4 --workers 8 --top 20
+
+import os
+import sys
+import time
+import json
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from rag_summary import (
+    analyze_resume_text,
+    build_resume_profile,
+    calculate_match_percentage,
+    extract_resume_prompt_text,
+    matched_skills_for,
+)
+import database
+from database import (
+    get_resumes_with_analysis,
+    save_resume_analysis,
+    init_db,
+    save_job_matches,
+    save_resume_matches,
+    get_all_job_analyses,
+)
+from job_profiles import analyze_job_post
+from batch_scoring import SkillMatrix
+
+# Scoring logic badle toh version badlo - purane stored scores recompute ho jayenge
+SCORER_VERSION = "skills-v1"
+
+LLM_CONCURRENCY = int(os.environ.get("LLM_CONCURRENCY", 4))
+EXTRACT_WORKERS = int(os.environ.get("EXTRACT_WORKERS", os.cpu_count() or 2))
+
+
+def _extract_process_context():
+    """forkserver (ya spawn) - web server ke threads chal rahe hote hain, fork unke held locks copy kar leta"""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        # Server mein sirf extraction wala module preload (default __main__ = app.py hota)
+        ctx.set_forkserver_preload(["rag_summary"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def _init_extract_worker(db_name):
+    # Naya process parent ka DB_NAME (benchmarks / temp DB) inherit nahi karta
+    database.DB_NAME = db_name
+
+
+# Process-wide limit, taaki parallel runs milke bhi Ollama ko overload na karein
+_llm_slots = threading.BoundedSemaphore(LLM_CONCURRENCY)
+
+
+def set_llm_concurrency(limit):
+    """Change the process-wide number of in-flight LLM calls"""
+    global _llm_slots
+    _llm_slots = threading.BoundedSemaphore(max(1, limit))
+
+
+# =====================================================
+# SCORING
+# =====================================================
+def result_row(resume, percentage, matched_skills):
+    """Result row used by the UI / API for one scored resume"""
+    return {
+        "id": resume["id"],
+        "name": resume["name"],
+        "email": resume["email"],
+        "file_path": resume["file_path"] or "",
+        "match": percentage,
+        "match_percentage": percentage,
+        "suggestions": "",
+        "matched_skills": matched_skills,
+        "missing_skills": [],
+        "summary": resume["summary"]
+    }
+
+
+def score_resume(jd_json, resume, resume_json):
+    """Score one resume against a JD profile and build its result row"""
+    final_percentage = calculate_match_percentage(jd_json, resume_json)
+    return result_row(resume, final_percentage, matched_skills_for(jd_json, resume_json))
+
+
+def _analyze_with_llm(resume, resume_text):
+    with _llm_slots:
+        profile = build_resume_profile(analyze_resume_text(resume_text))
+    save_resume_analysis(resume["id"], profile)
+    return profile
+
+
+# =====================================================
+# ENGINE
+# =====================================================
+def run_matching(job_id, llm_concurrency=LLM_CONCURRENCY, extract_workers=EXTRACT_WORKERS, on_result=None,
+                 on_total=None, cancel=None):
+    """Score every resume against job_id. Returns results sorted by match (highest first).
+
+    on_total(n) is called once the number of resumes to score is known.
+    If cancel gets set the run stops early and the partial results are not saved.
+    """
+    jd_json = analyze_job_post(job_id)
+    if jd_json is None:
+        return []
+    # job_matches.scored_at jaisa format - run se pehle ke purane rows save ke time hatenge
+    started_at = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+    results = []
+    lock = threading.Lock()
+
+    def publish(entry):
+        with lock:
+            results.append(entry)
+            if on_result:
+                on_result(entry)
+
+    def emit(resume, resume_json):
+        publish(score_resume(jd_json, resume, resume_json))
+
+    analyzed = []
+    pending = []
+    for resume in get_resumes_with_analysis():
+        if resume["analysis"] is not None:
+            analyzed.append(resume)
+        elif resume["file_path"] and os.path.exists(resume["file_path"]):
+            pending.append(resume)
+    if on_total:
+        on_total(len(analyzed) + len(pending))
+
+    # Analyzed resumes ek vectorized pass mein score hote hain
+    if analyzed:
+        scores = SkillMatrix.from_profiles((r["id"], r["analysis"]) for r in analyzed).score(jd_json)
+        for row, resume in enumerate(analyzed):
+            publish(result_row(resume, float(scores.percentages[row]), scores.matched_skills(row)))
+
+    if pending:
+        print(f"DEBUG: {len(pending)} resumes need extraction + LLM analysis")
+        _analyze_pending(pending, llm_concurrency, extract_workers, emit, cancel)
+
+    results.sort(key=lambda x: x["match_percentage"], reverse=True)
+    if cancel is not None and cancel.is_set():
+        # Adhoore scores save kiye toh job "scored" maan li jaati
+        print(f"DEBUG: Matching for job {job_id} cancelled after {len(results)} resumes")
+        return results
+    save_job_matches(
+        job_id,
+        [(r["id"], r["match_percentage"], r["matched_skills"]) for r in results],
+        SCORER_VERSION,
+        started_at
+    )
+    return results
+
+
+def score_resume_against_jobs(resume_id, resume_json):
+    """Incremental update: score one new resume against every already-scored job"""
+    jobs = get_all_job_analyses(matches_version=SCORER_VERSION)
+    if not jobs:
+        return 0
+
+    matrix = SkillMatrix.from_profiles([(resume_id, resume_json)])
+    rows = []
+    for job_id, jd_json in jobs:
+        scores = matrix.score(jd_json)
+        rows.append((job_id, float(scores.percentages[0]), scores.matched_skills(0)))
+    save_resume_matches(resume_id, rows, SCORER_VERSION)
+    return len(rows)
+
+
+def _analyze_pending(pending, llm_concurrency, extract_workers, emit, cancel=None):
+    """Extract on a process pool, analyze on a bounded thread pool, emit as each finishes"""
+
+    def cancelled():
+        return cancel is not None and cancel.is_set()
+
+    def analyze_and_emit(resume, resume_text):
+        if cancelled():
+            return
+        try:
+            # Analysis save ho jaati hai, cancel ke baad result emit nahi hota
+            profile = _analyze_with_llm(resume, resume_text)
+            if not cancelled():
+                emit(resume, profile)
+        except Exception as e:
+            print(f"DEBUG: Analysis failed for resume {resume['id']}: {e}")
+
+    # Ek-do files ke liye process pool start karna mehenga padta hai
+    use_processes = extract_workers > 1 and len(pending) > 1
+    extract_pool = (ProcessPoolExecutor(max_workers=extract_workers, mp_context=_extract_process_context(),
+                                        initializer=_init_extract_worker, initargs=(database.DB_NAME,))
+                    if use_processes else ThreadPoolExecutor(max_workers=1))
+
+    llm_pool = ThreadPoolExecutor(max_workers=max(1, llm_concurrency))
+    try:
+        text_futures = {extract_pool.submit(extract_resume_prompt_text, r["file_path"]): r for r in pending}
+        for future in as_completed(text_futures):
+            if cancelled():
+                break
+            resume = text_futures[future]
+            try:
+                resume_text = future.result()
+            except Exception as e:
+                print(f"DEBUG: Extraction failed for resume {resume['id']}: {e}")
+                continue
+            if resume_text:
+                llm_pool.submit(analyze_and_emit, resume, resume_text)
+    finally:
+        # Cancel par queued kaam chhod do; chal rahe LLM calls poore hote hain par emit nahi karte
+        extract_pool.shutdown(wait=True, cancel_futures=cancelled())
+        llm_pool.shutdown(wait=True, cancel_futures=cancelled())
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score all resumes against a job post")
+    parser.add_argument("--job-id", type=int, required=True)
+    parser.add_argument("--llm-concurrency", type=int, default=LLM_CONCURRENCY)
+    parser.add_argument("--workers", type=int, default=EXTRACT_WORKERS, help="text extraction processes")
+    parser.add_argument("--top", type=int, default=20, help="number of results to print (0 = all)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    init_db()
+    set_llm_concurrency(args.llm_concurrency)
+    start = time.perf_counter()
+    results = run_matching(args.job_id, args.llm_concurrency, args.workers)
+    elapsed = time.perf_counter() - start
+
+    shown = results[:args.top] if args.top else results
+    if args.json:
+        print(json.dumps(shown, indent=2))
+    else:
+        for r in shown:
+            print(f"{r['match_percentage']:6.2f}%  {r['name']} <{r['email']}>  {', '.join(r['matched_skills'])}")
+    print(f"Scored {len(results)} resumes in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+# =====================================================
+# BACKGROUND MATCHING RUNS (SSE PROGRESS)
+# =====================================================
+# Job post hote hi request turant run id ke saath return karta hai.
+# Scoring (JD analysis + run_matching) background thread par chalti hai aur
+# har scored candidate ek event banta hai. /api/matching_runs/<id>/events
+# in events ko Server-Sent Events ke roop mein stream karta hai, taaki page
+# par ranked list live bhare. Run cancel ho sakta hai.
+#
+# Status flow: queued -> analyzing -> scoring -> done (ya cancelled / failed)
+# Run ka status, progress, cancel flag aur events SQLite (matching_runs,
+# matching_run_events) mein hain - gunicorn ke kisi bhi worker se status, SSE
+# aur cancel kaam karte hain. Run chalane wala process events batch mein
+# likhta hai aur har RUN_HEARTBEAT_SECONDS par heartbeat + cancel flag check
+# karta hai. Heartbeat RUN_STALE_SECONDS se ruka (process crash/restart) toh
+# run "failed" dikhta hai. Final scores job_matches mein save hote hain.
+
+import os
+import time
+import uuid
+import json
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from job_profiles import analyze_job_post
+from matching_engine import run_matching
+from database import (
+    create_matching_run,
+    save_matching_run_progress,
+    touch_matching_run,
+    request_matching_run_cancel,
+    get_matching_run_row,
+    get_active_matching_run_row,
+    get_matching_run_events,
+    get_matching_run_results,
+    prune_matching_runs,
+    close_connection,
+)
+
+MATCHING_RUN_WORKERS = int(os.environ.get("MATCHING_RUN_WORKERS", 2))
+MAX_FINISHED_RUNS = 50       # itne purane finished runs DB mein rakhte hain
+SSE_KEEPALIVE_SECONDS = 15   # proxy idle connection band na kare
+SSE_POLL_SECONDS = 0.5       # SSE naye events ke liye DB itni der mein dekhta hai
+RUN_HEARTBEAT_SECONDS = 2    # heartbeat + cancel flag check
+RUN_STALE_SECONDS = 30       # itni der heartbeat nahi = run wala process mar gaya
+EVENT_FLUSH_SECONDS = 0.25   # result events itni der / itne jama hone par DB mein
+EVENT_FLUSH_SIZE = 200
+
+FINISHED_STATUSES = ("done", "cancelled", "failed")
+
+
+class MatchingRun:
+    """One background scoring run for a job; events are appended, never changed.
+
+    The process executing the run writes to the DB; every other process
+    (and the web requests) read it back with MatchingRun.load.
+    """
+
+    def __init__(self, run_id, job_id, analyze_job=True, status="queued", total=None, scored=0,
+                 error=None, created_at=None, finished_at=None):
+        self.id = run_id
+        self.job_id = job_id
+        self.analyze_job = analyze_job
+        self.status = status
+        self.total = total
+        self.scored = scored
+        self.error = error
+        self.created_at = created_at or time.time()
+        self.finished_at = finished_at
+        self.interrupted = False
+        self.cancel_event = threading.Event()
+        self._pending = []           # (seq, event name, data) abhi DB mein nahi
+        self._next_seq = 0           # SSE event id
+        self._last_flush = time.time()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, run_id):
+        row = get_matching_run_row(run_id)
+        if row is None:
+            return None
+        run_id, job_id, analyze_job, status, total, scored, error, _, created_at, finished_at, updated_at = row
+        run = cls(run_id, job_id, bool(analyze_job), status, total, scored, error, created_at, finished_at)
+        if status not in FINISHED_STATUSES and updated_at < time.time() - RUN_STALE_SECONDS:
+            # Chalane wala process ruk gaya - "done" event kabhi nahi aayega
+            run.status, run.error, run.finished_at = "failed", "Matching run was interrupted", updated_at
+            run.interrupted = True
+        return run
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATUSES
+
+    def progress(self):
+        return {
+            "run_id": self.id,
+            "job_id": self.job_id,
+            "status": self.status,
+            "scored": self.scored,
+            "total": self.total,
+            "error": self.error,
+        }
+
+    # ---------- executing process ----------
+    def _push(self, event, data, flush=False):
+        with self._lock:
+            self._pending.append((self._next_seq, event, data))
+            self._next_seq += 1
+            if flush or len(self._pending) >= EVENT_FLUSH_SIZE or time.time() - self._last_flush >= EVENT_FLUSH_SECONDS:
+                self._flush()
+
+    def _flush(self):
+        # self._lock ke andar
+        events, self._pending = self._pending, []
+        save_matching_run_progress(self.id, self.status, self.total, self.scored, self.error, self.finished_at, events)
+        self._last_flush = time.time()
+
+    def set_status(self, status, error=None):
+        finished = status in FINISHED_STATUSES
+        with self._lock:
+            self.status = status
+            self.error = error
+            if finished:
+                self.finished_at = time.time()
+        self._push("done" if finished else "status", self.progress(), flush=True)
+
+    def set_total(self, total):
+        self.total = total
+        self._push("status", self.progress(), flush=True)
+
+    def add_result(self, entry):
+        with self._lock:
+            self.scored += 1
+            scored = self.scored
+        self._push("result", {"result": entry, "scored": scored, "total": self.total})
+
+    def _heartbeat(self):
+        """Heartbeat + cancel flag (kisi bhi process se) + buffered events flush, run khatam hone tak"""
+        while not self.finished:
+            try:
+                if touch_matching_run(self.id):
+                    self.cancel_event.set()
+                with self._lock:
+                    if self._pending and not self.finished:
+                        self._flush()
+            except Exception as e:
+                print(f"DEBUG: Matching run {self.id} heartbeat failed: {e}")
+            time.sleep(RUN_HEARTBEAT_SECONDS)
+        close_connection()
+
+    # ---------- any process ----------
+    def results(self):
+        """Results so far, highest match first"""
+        rows = get_matching_run_results(self.id)
+        return sorted(rows, key=lambda r: r["match_percentage"], reverse=True)
+
+    def cancel(self):
+        """Ask the run to stop. Returns False if it already finished."""
+        if self.finished or not request_matching_run_cancel(self.id):
+            return False
+        local = _local_runs.get(self.id)
+        if local is not None:
+            local.cancel_event.set()   # isi process mein chal raha hai - heartbeat ka wait nahi
+        return True
+
+
+# =====================================================
+# RUN REGISTRY
+# =====================================================
+_local_runs = {}       # is process mein chal rahe runs (cancel turant pahunche)
+_executor = ThreadPoolExecutor(max_workers=MATCHING_RUN_WORKERS, thread_name_prefix="matching-run")
+
+
+def _execute(run):
+    try:
+        if run.cancel_event.is_set():
+            run.set_status("cancelled")
+            return
+        run.set_status("analyzing")
+        # JD ka LLM analysis bhi background mein - POST request turant return ho
+        if analyze_job_post(run.job_id, force=run.analyze_job) is None:
+            run.set_status("failed", "Job not found")
+            return
+        if run.cancel_event.is_set():
+            run.set_status("cancelled")
+            return
+
+        run.set_status("scoring")
+        run_matching(run.job_id, on_result=run.add_result, on_total=run.set_total, cancel=run.cancel_event)
+        run.set_status("cancelled" if run.cancel_event.is_set() else "done")
+        print(f"DEBUG: Matching run {run.id} for job {run.job_id}: {run.status} ({run.scored} scored)")
+    except Exception as e:
+        print(f"DEBUG: Matching run {run.id} failed: {e}")
+        traceback.print_exc()
+        run.set_status("failed", str(e))
+    finally:
+        _local_runs.pop(run.id, None)
+
+
+def start_matching_run(job_id, analyze_job=True):
+    """Queue a background scoring run for job_id and return it.
+
+    analyze_job=True re-analyzes the JD with the LLM first (new job posts);
+    False uses the stored JD profile.
+    """
+    prune_matching_runs(MAX_FINISHED_RUNS, time.time() - RUN_STALE_SECONDS)
+    run = MatchingRun(uuid.uuid4().hex[:12], job_id, analyze_job)
+    create_matching_run(run.id, job_id, analyze_job, run.created_at)
+    _local_runs[run.id] = run
+    # Queue mein wait karte hue bhi heartbeat chale, warna run stale dikhega
+    threading.Thread(target=run._heartbeat, name=f"matching-run-heartbeat-{run.id}", daemon=True).start()
+    _executor.submit(_execute, run)
+    return run
+
+
+def get_matching_run(run_id):
+    return MatchingRun.load(run_id) if run_id else None
+
+
+def get_active_run_for_job(job_id):
+    """Latest unfinished run of a job (or None)"""
+    row = get_active_matching_run_row(job_id, time.time() - RUN_STALE_SECONDS)
+    return MatchingRun.load(row[0]) if row else None
+
+
+# =====================================================
+# SERVER-SENT EVENTS
+# =====================================================
+def _sse(event_id, event, data):
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_events(run, last_event_id=-1):
+    """SSE generator; resumes after last_event_id (browser reconnect) and ends after 'done'.
+
+    Events DB se poll hote hain, isliye run kisi bhi process mein chal raha ho.
+    """
+    yield "retry: 3000\n\n"
+    after = last_event_id
+    idle = 0.0
+    while True:
+        events = get_matching_run_events(run.id, after)
+        if events:
+            # Ek poll ke saare events ek hi write mein
+            yield "".join(_sse(seq, event, data) for seq, event, data in events)
+            after = events[-1][0]
+            if events[-1][1] == "done":
+                return
+            idle = 0.0
+            continue
+
+        current = MatchingRun.load(run.id)
+        if current is None:
+            return
+        if current.interrupted:
+            yield _sse(after + 1, "done", current.progress())
+            return
+        time.sleep(SSE_POLL_SECONDS)
+        idle += SSE_POLL_SECONDS
+        if idle >= SSE_KEEPALIVE_SECONDS:
+            yield ": keepalive\n\n"
+            idle = 0.0
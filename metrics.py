@@ -0,0 +1,162 @@
+# =====================================================
+# LIGHTWEIGHT METRICS (PROMETHEUS TEXT FORMAT)
+# =====================================================
+# DEBUG prints se pata nahi chalta time kahan ja raha hai. Yahan in-process
+# counters + histograms hain jo /metrics par Prometheus text format mein
+# milte hain. Recording = ek lock + bisect, production mein on chhod sakte hain.
+# Koi extra dependency nahi (prometheus_client ki zaroorat nahi).
+#
+# Note: har process ka apna registry hai - process pool workers (text
+# extraction) ki timings parent process ke /metrics mein nahi aati.
+
+import time
+import bisect
+import threading
+from functools import wraps
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+FAST_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005, 0.01, 0.05)
+
+_registry = []
+_registry_lock = threading.Lock()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.exposed_name = f"{name}_total"   # HELP/TYPE aur samples dono isi naam se
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.exposed_name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.exposed_name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}   # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                entry[index] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        for key, entry in items:
+            labels = _format_labels(self.labelnames, key)
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames, key, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            inf_labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf_labels} {entry[-1]}")
+            lines.append(f"{self.name}_sum{labels} {entry[-2]}")
+            lines.append(f"{self.name}_count{labels} {entry[-1]}")
+        return lines
+
+
+def _register(metric):
+    with _registry_lock:
+        _registry.append(metric)
+    return metric
+
+
+def counter(name, help_text, labelnames=()):
+    return _register(Counter(name, help_text, labelnames))
+
+
+def histogram(name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return _register(Histogram(name, help_text, labelnames, buckets))
+
+
+def timed(metric, **labels):
+    """Decorator: observe the wrapped function's duration on a histogram"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metric.observe(time.perf_counter() - start, **labels)
+        return wrapper
+    return decorator
+
+
+def render():
+    """All registered metrics in Prometheus text exposition format"""
+    lines = []
+    with _registry_lock:
+        metrics = list(_registry)
+    for metric in metrics:
+        lines.append(f"# HELP {metric.exposed_name} {metric.help}")
+        lines.append(f"# TYPE {metric.exposed_name} {metric.type}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+# =====================================================
+# APP METRICS
+# =====================================================
+EXTRACTION_SECONDS = histogram(
+    "resume_text_extraction_seconds", "Time spent parsing PDF/DOCX text", ["format", "mode"])
+TEXT_CACHE_LOOKUPS = counter(
+    "resume_text_cache_lookups", "Extracted-text cache lookups by result", ["result"])
+LLM_REQUEST_SECONDS = histogram(
+    "llm_request_seconds", "Ollama generate latency (cache misses only)", ["prompt_type", "mode"])
+LLM_REQUESTS = counter(
+    "llm_requests", "LLM calls by prompt type and outcome (ok, error, cache_hit)", ["prompt_type", "mode", "outcome"])
+DB_CALL_SECONDS = histogram(
+    "db_call_seconds", "Duration of database.py helper calls", ["function"])
+SCORING_SECONDS = histogram(
+    "scoring_seconds", "Resume scoring duration", ["scorer"], buckets=FAST_BUCKETS + (0.1, 0.5, 1.0, 5.0))
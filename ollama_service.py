@@ -4,6 +4,7 @@ import PyPDF2
 import docx
 
 from rag_summary import create_rag_summary
+from keyword_matcher import find_keywords
 
 # =====================================================
 # ENV CHECK
@@ -145,7 +146,7 @@ def create_fallback_summary(text):
         bullets.append("• Experience across multiple software development cycles and real-world implementations.")
 
     techs = ["Java", "Python", "Flask", "Spring", "SQL", "JavaScript"]
-    used = [t for t in techs if t.lower() in text.lower()]
+    used = find_keywords(text, techs)
     if used:
         bullets.append(f"• Hands-on experience working with technologies such as {', '.join(used[:4])}.")
 
@@ -168,7 +169,8 @@ def match_resume_with_job(resume_summary, job_title, job_description):
         resume_text = resume_summary.lower()
 
         keywords = ["python", "java", "react", "sql", "aws", "docker", "git"]
-        matched = [k for k in keywords if k in job_text and k in resume_text]
+        resume_skills = set(find_keywords(resume_text, keywords))
+        matched = [k for k in find_keywords(job_text, keywords) if k in resume_skills]
 
         percent = int((len(matched) / max(len(keywords), 1)) * 100)
         return f"Match: {percent}% | Skills: {', '.join(matched)}"
@@ -5,88 +5,348 @@
 import os
 import re
 import json
+import time
+import hashlib
+import threading
 import requests
-from typing import List, Dict, Tuple
+from requests.adapters import HTTPAdapter
+from contextlib import closing
+from typing import List, Dict, Tuple, Iterator
 from PyPDF2 import PdfReader
 import docx
 
+from database import get_resume_text_by_hash, save_resume_text
+from llm_cache import LLMCache, make_cache_key
+from keyword_matcher import find_keywords
+from metrics import timed, EXTRACTION_SECONDS, TEXT_CACHE_LOOKUPS, LLM_REQUEST_SECONDS, LLM_REQUESTS, SCORING_SECONDS
+
 # =====================================================
 # MISTRAL OLLAMA CLIENT
 # =====================================================
+# Server / model env se badal sakte hain, e.g. fake server ke liye:
+#   OLLAMA_URL=http://127.0.0.1:11435 (python -m benchmarks.fake_ollama)
+DEFAULT_OLLAMA_URL = "http://localhost:11434"
+DEFAULT_OLLAMA_MODEL = "llama3.2:1b"  # Changed to llama3.2:1b (1.3GB) - very fast
+
+def ollama_generate_url(base=None) -> str:
+    """/api/generate URL for a server root (default: OLLAMA_URL env)"""
+    base = base or os.environ.get("OLLAMA_URL", DEFAULT_OLLAMA_URL)
+    return base.rstrip("/") + "/api/generate"
+
 class MistralClient:
-    def __init__(self, model="llama3.2:1b"):  # Changed to llama3.2:1b (1.3GB) - very fast
-        self.model = model
-        self.base_url = "http://localhost:11434/api/generate"
-    
-    def generate(self, prompt: str) -> str:
-        """Generate response using Mistral via Ollama"""
-        try:
-            response = requests.post(
-                self.base_url,
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.1,
-                        "num_predict": 300,     # Badha diya taaki response pura ho
-                        "num_thread": 4,
-                        "stop": ["\n\n", "```"]
-                    }
-                }
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "").strip()
-            else:
-                print(f"Mistral API error: {response.status_code}")
-                return ""
-                
-        except Exception as e:
-            print(f"Mistral connection error: {e}")
-            return ""
+    """Ollama client with keep-alive connection pooling, timeouts, retries and counters"""
+
+    def __init__(self, model=None, base_url=None,
+                 connect_timeout=3.05, read_timeout=120,
+                 max_retries=2, backoff=0.5, pool_size=10, cache=None):
+        self.model = model or os.environ.get("OLLAMA_MODEL", DEFAULT_OLLAMA_MODEL)
+        self.cache = cache
+        self.base_url = base_url or ollama_generate_url()
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        # Ek hi session = Ollama server ke saath keep-alive connections reuse
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "errors": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "early_stops": 0,
+            "total_latency": 0.0,
+            "last_latency": 0.0,
+        }
+
+    def _payload(self, prompt: str, stream: bool = False) -> Dict:
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": 0.1,
+                "num_predict": 300,     # Badha diya taaki response pura ho
+                "num_thread": 4,
+                "stop": ["\n\n", "```"]
+            }
+        }
+
+    def _record(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def stats(self) -> Dict:
+        """Latency and error counters (latency in seconds)"""
+        with self._stats_lock:
+            data = dict(self._stats)
+        data["avg_latency"] = data["total_latency"] / data["requests"] if data["requests"] else 0.0
+        return data
+
+    def _post(self, payload: Dict, read_response) -> str:
+        """POST with retries/backoff; read_response(response) turns a 200 into text"""
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._record("retries")
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+
+            start = time.perf_counter()
+            try:
+                response = self.session.post(self.base_url, json=payload, timeout=self.timeout, stream=payload["stream"])
+                with closing(response):
+                    if response.status_code == 200:
+                        return read_response(response)
+                    print(f"Mistral API error: {response.status_code}")
+                    # 5xx (model load/overload) retry karo, 4xx nahi
+                    if response.status_code < 500:
+                        break
+            except requests.Timeout as e:
+                self._record("timeouts")
+                print(f"Mistral timeout (attempt {attempt + 1}): {e}")
+            except requests.ConnectionError as e:
+                print(f"Mistral connection error (attempt {attempt + 1}): {e}")
+            except requests.RequestException as e:
+                print(f"Mistral request error (attempt {attempt + 1}): {e}")
+            except ValueError as e:
+                print(f"Mistral invalid JSON response: {e}")
+                break
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._stats_lock:
+                    self._stats["requests"] += 1
+                    self._stats["total_latency"] += elapsed
+                    self._stats["last_latency"] = elapsed
+
+        self._record("errors")
+        return ""
+
+    def _cached(self, prompt: str, mode: str, call, prompt_type: str = "other", refresh: bool = False) -> str:
+        """Serve from the LLM cache (if configured), else call Ollama and store the result.
+
+        refresh=True skips the cache read (forced re-analysis) but still stores the new response.
+        """
+        key = None
+        if self.cache is not None:
+            key = make_cache_key(self.model, prompt, self._payload(prompt)["options"], mode)
+            cached = None if refresh else self.cache.get(key)
+            if cached is not None:
+                LLM_REQUESTS.inc(prompt_type=prompt_type, mode=mode, outcome="cache_hit")
+                return cached
+
+        start = time.perf_counter()
+        response = call()
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, prompt_type=prompt_type, mode=mode)
+        LLM_REQUESTS.inc(prompt_type=prompt_type, mode=mode, outcome="ok" if response else "error")
+
+        if key is not None:
+            self.cache.set(key, response)
+        return response
+
+    def generate(self, prompt: str, prompt_type: str = "other", refresh: bool = False) -> str:
+        """Generate response using Mistral via Ollama (prompt_type labels the metrics)"""
+        return self._cached(prompt, "full", lambda: self._post(
+            self._payload(prompt),
+            lambda response: response.json().get("response", "").strip()
+        ), prompt_type, refresh)
+
+    def generate_json(self, prompt: str, prompt_type: str = "other", refresh: bool = False) -> str:
+        """Stream the response and stop as soon as the first {...} object is complete"""
+        return self._cached(prompt, "json", lambda: self._post(
+            self._payload(prompt, stream=True), self._read_until_json_closes
+        ), prompt_type, refresh)
+
+    def _read_until_json_closes(self, response) -> str:
+        parts = []
+        scanner = JsonObjectScanner()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            piece = chunk.get("response", "")
+            end = scanner.feed(piece)
+            if end is not None:
+                # JSON band ho gaya - baaki tokens ka wait nahi, connection close
+                parts.append(piece[:end])
+                self._record("early_stops")
+                break
+            parts.append(piece)
+            if chunk.get("done"):
+                break
+        return "".join(parts).strip()
+
+
+class JsonObjectScanner:
+    """Track brace depth across streamed chunks (ignores braces inside JSON strings)"""
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escape = False
+
+    def feed(self, text: str):
+        """Return the index just past the closing brace of the first object, or None"""
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"' and self.started:
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+                self.started = True
+            elif ch == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return None
+
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+def get_mistral_client() -> MistralClient:
+    """Process-wide MistralClient so every caller shares one connection pool"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = MistralClient(cache=LLMCache())
+    return _shared_client
 
 # =====================================================
 # RESUME TEXT EXTRACTION
 # =====================================================
+# LLM prompt mein resume ke sirf itne characters jaate hain
+RESUME_PROMPT_CHARS = 1000
+
+def iter_text_from_file(file_path: str) -> Iterator[str]:
+    """Lazily yield text one PDF page (or DOCX paragraph) at a time"""
+    if file_path.endswith('.pdf'):
+        with open(file_path, 'rb') as f:
+            reader = PdfReader(f)
+            # reader.pages lazy hai - page tabhi parse hota hai jab maanga jaaye
+            for page in reader.pages:
+                yield (page.extract_text() or "") + "\n"
+    elif file_path.endswith('.docx'):
+        doc = docx.Document(file_path)
+        for para in doc.paragraphs:
+            yield para.text + "\n"
+
+def _file_format(file_path: str) -> str:
+    return os.path.splitext(file_path)[1].lstrip(".").lower() or "unknown"
+
+def read_text(file_path: str) -> str:
+    """Parse PDF or DOCX text; raises on parser errors (callers decide the fallback)"""
+    with EXTRACTION_SECONDS.time(format=_file_format(file_path), mode="full"):
+        with closing(iter_text_from_file(file_path)) as chunks:
+            return "".join(chunks).strip()
+
+def extract_text_prefix(file_path: str, max_chars: int = None, max_pages: int = None) -> str:
+    """Extract text only until max_chars characters or max_pages PDF pages are reached"""
+    parts = []
+    total = 0
+    start = time.perf_counter()
+    try:
+        with closing(iter_text_from_file(file_path)) as chunks:
+            for i, chunk in enumerate(chunks):
+                if max_pages is not None and i >= max_pages and file_path.endswith('.pdf'):
+                    break
+                parts.append(chunk)
+                total += len(chunk)
+                if max_chars is not None and total >= max_chars:
+                    break
+    except Exception as e:
+        print(f"Text extraction error: {e}")
+        if not parts:
+            return "resume text available"
+    finally:
+        EXTRACTION_SECONDS.observe(time.perf_counter() - start, format=_file_format(file_path), mode="prefix")
+
+    text = "".join(parts).strip()
+    return text[:max_chars] if max_chars is not None else text
+
 def extract_text_from_file(file_path: str) -> str:
     """Extract text from PDF or DOCX"""
-    text = ""
     try:
-        if file_path.endswith('.pdf'):
-            with open(file_path, 'rb') as f:
-                reader = PdfReader(f)
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-        elif file_path.endswith('.docx'):
-            doc = docx.Document(file_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
+        return read_text(file_path)
     except Exception as e:
         print(f"Text extraction error: {e}")
         # PDF error ko ignore kar do, system chalne do
         return "resume text available"
-    
-    return text.strip()
+
+# =====================================================
+# CONTENT-ADDRESSED TEXT CACHE
+# =====================================================
+def file_sha256(file_path: str) -> str:
+    """SHA-256 of the file bytes - file badli toh hash bhi badlega"""
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def extract_text_with_hash(file_path: str) -> Tuple[str, str]:
+    """Return (text, sha256), parsing the file only if its hash is not cached yet"""
+    if not file_path or not os.path.exists(file_path):
+        return "", None
+
+    sha = file_sha256(file_path)
+    cached = get_resume_text_by_hash(sha)
+    TEXT_CACHE_LOOKUPS.inc(result="miss" if cached is None else "hit")
+    if cached is not None:
+        return cached, sha
+
+    try:
+        text = read_text(file_path)
+    except Exception as e:
+        print(f"Text extraction error: {e}")
+        # Error wala result cache nahi karte, agli baar phir try hoga
+        return "resume text available", sha
+
+    save_resume_text(sha, text)
+    return text, sha
+
+def extract_resume_prompt_text(file_path: str) -> str:
+    """Text for the LLM prompt: cached full text if present, otherwise only the first pages"""
+    if not file_path or not os.path.exists(file_path):
+        return ""
+
+    cached = get_resume_text_by_hash(file_sha256(file_path))
+    TEXT_CACHE_LOOKUPS.inc(result="miss" if cached is None else "hit")
+    if cached is not None:
+        return cached[:RESUME_PROMPT_CHARS]
+    return extract_text_prefix(file_path, max_chars=RESUME_PROMPT_CHARS)
 
 # =====================================================
 # MISTRAL-BASED STRUCTURED ANALYSIS
 # =====================================================
+# LLM fail hone par in keywords se skills nikalti hain (keyword_matcher, whole words)
+RESUME_FALLBACK_SKILLS = ['python', 'flask', 'django', 'javascript', 'sql', 'react', 'node', 'java', 'git', 'docker']
+JOB_FALLBACK_SKILLS = ['python', 'flask', 'javascript', 'java', 'react', 'node', 'sql']
+
 def analyze_resume_with_mistral(resume_text: str) -> Dict:
     """Use Mistral to convert resume text to structured JSON"""
-    client = MistralClient()
+    client = get_mistral_client()
 
     # Is prompt ko use kar taaki JSON chhota rahe aur error na aaye
     prompt = f"""[INST] Extract resume data as JSON. 
 Only 2 fields: "skills" (list) and "experience_years" (number). 
 Ignore education and projects.
 
-Text: {resume_text[:1000]}
+Text: {resume_text[:RESUME_PROMPT_CHARS]}
 [/INST]"""
 
     try:
-        response = client.generate(prompt)
+        response = client.generate_json(prompt, prompt_type="resume")
         
         if not response:
             raise ValueError("Empty response from Mistral")
@@ -126,8 +386,7 @@ Text: {resume_text[:1000]}
         
         # Manual extraction if AI fails
         print("DEBUG: Using Regex Backup for Skills")
-        keywords = ['python', 'flask', 'django', 'javascript', 'sql', 'react', 'node', 'java', 'git', 'docker']
-        found = [k for k in keywords if k in resume_text.lower()]
+        found = find_keywords(resume_text, RESUME_FALLBACK_SKILLS)
         
         return {
             "skills": found,
@@ -138,9 +397,9 @@ Text: {resume_text[:1000]}
             "key_achievements": []
         }
 
-def analyze_job_with_mistral(job_text: str) -> Dict:
-    """Analyze job description using Mistral with strict JSON extraction"""
-    client = MistralClient()
+def analyze_job_with_mistral(job_text: str, refresh: bool = False) -> Dict:
+    """Analyze job description using Mistral with strict JSON extraction (refresh=True skips the LLM cache)"""
+    client = get_mistral_client()
     
     # Simple fallback for common job descriptions
     if "resume-scanner" in job_text.lower():
@@ -171,7 +430,7 @@ def analyze_job_with_mistral(job_text: str) -> Dict:
     Job Description: {job_text} [/INST]
     JSON:"""
 
-    response = client.generate(prompt)
+    response = client.generate_json(prompt, prompt_type="job", refresh=refresh)
     
     try:
         # Step 1: Extract ONLY what is between { and }
@@ -184,12 +443,7 @@ def analyze_job_with_mistral(job_text: str) -> Dict:
             
             # Agar AI ne 'skill1' bheja ya fail hua, toh manual check:
             if not data.get("must_have") or "skill1" in str(data.get("must_have")):
-                found_skills = []
-                common_skills = ['python', 'flask', 'javascript', 'java', 'react', 'node', 'sql']
-                for s in common_skills:
-                    if s in job_text.lower():
-                        found_skills.append(s)
-                data["must_have"] = found_skills
+                data["must_have"] = find_keywords(job_text, JOB_FALLBACK_SKILLS)
             
             return data
         else:
@@ -198,9 +452,7 @@ def analyze_job_with_mistral(job_text: str) -> Dict:
     except Exception as e:
         print(f"Extraction failed, using fallback. Error: {e}")
         # Manual fallback if model writes code instead of JSON
-        must_have = []
-        if "python" in job_text.lower(): must_have.append("python")
-        if "flask" in job_text.lower(): must_have.append("flask")
+        must_have = find_keywords(job_text, ["python", "flask"])
         
         return {
             "must_have": must_have,
@@ -228,6 +480,7 @@ def normalize_skills(skills):
             cleaned.append(s)
     return list(set(cleaned))  # 🔥 remove duplicates
 
+@timed(SCORING_SECONDS, scorer="calculate_match_percentage")
 def calculate_match_percentage(jd_json, resume_json):
     """
     PURE DETERMINISTIC CALCULATION - NO AI, NO RANDOMNESS
@@ -281,19 +534,6 @@ def calculate_match_percentage(jd_json, resume_json):
     
     percentage = round((total_matched / total_required) * 100, 2)
     
-    print(f"\n{'='*60}")
-    print(f"📊 MATCH CALCULATION:")
-    print(f"{'='*60}")
-    print(f"Required Skills: {required_skills}")
-    print(f"Resume Skills: {resume_json.get('skills', [])}")
-    print(f"Required Projects: {required_projects}")
-    print(f"Resume Projects: {resume_projects}")
-    print(f"Required Experience: {required_exp} years")
-    print(f"Resume Experience: {resume_exp} years")
-    print(f"\n✅ Matched: {total_matched}/{total_required}")
-    print(f"🎯 Percentage: {percentage}%")
-    print(f"{'='*60}\n")
-    
     return percentage
 
 def calculate_match_score(resume_data: Dict, job_data: Dict) -> Dict:
@@ -424,7 +664,7 @@ def calculate_match_score(resume_data: Dict, job_data: Dict) -> Dict:
 # =====================================================
 def generate_match_explanation(resume_data: Dict, job_data: Dict, score_breakdown: Dict) -> str:
     """Use Mistral to explain the match score with RAG context"""
-    client = MistralClient()
+    client = get_mistral_client()
     
     # Create context for RAG
     context = f"""
@@ -454,7 +694,7 @@ Format your response as 3-4 clear, professional paragraphs. Be specific and acti
 
 Explanation:"""
 
-    response = client.generate(prompt)
+    response = client.generate(prompt, prompt_type="explanation")
     
     if response:
         return response.strip()
@@ -468,9 +708,9 @@ def analyze_resume_text(resume_text: str) -> Dict:
     """Main function to analyze resume text"""
     return analyze_resume_with_mistral(resume_text)
 
-def analyze_job_text(job_text: str) -> Dict:
+def analyze_job_text(job_text: str, refresh: bool = False) -> Dict:
     """Main function to analyze job description"""
-    return analyze_job_with_mistral(job_text)
+    return analyze_job_with_mistral(job_text, refresh)
 
 STOPWORDS = {"project", "projects", "experience", "experiences", "skill", "skills"}
 
@@ -501,6 +741,57 @@ def normalize_resume_json(resume_json: dict) -> dict:
 
     return resume_json
 
+# =====================================================
+# STORED PROFILES (ingest par ek baar normalize karke save)
+# =====================================================
+GARBAGE_VALUES = {
+    "project", "projects", "experience", "experiences",
+    "requirement", "requirements", "skill", "skills",
+    "year", "years", "work", "education", "any", "the"
+}
+
+def clean_skill_list(skills) -> List[str]:
+    """Lowercase, drop garbage values and duplicates (order preserved)"""
+    cleaned = []
+    seen = set()
+    for skill in skills or []:
+        skill_lower = str(skill).strip().lower()
+        if skill_lower and skill_lower not in GARBAGE_VALUES and skill_lower not in seen and len(skill_lower) > 1:
+            cleaned.append(skill_lower)
+            seen.add(skill_lower)
+    return cleaned
+
+def build_resume_profile(raw_resume: Dict) -> Dict:
+    """Normalize raw AI resume output into the structure stored in resume_analysis"""
+    raw_resume = dict(raw_resume or {})
+    if not isinstance(raw_resume.get("projects", []), list):
+        raw_resume["projects"] = []
+    if not isinstance(raw_resume.get("skills", []), list):
+        raw_resume["skills"] = []
+    normalized = normalize_resume_json(raw_resume)
+
+    return {
+        "skills": clean_skill_list(normalized.get("skills", [])),
+        "projects": [str(p) for p in normalized.get("projects", [])],
+        "experience_years": normalized.get("experience_years", 0) if isinstance(normalized.get("experience_years"), (int, float)) else 0,
+        "role_level": str(normalized.get("role_level") or "unknown"),
+        "domain": str(normalized.get("domain") or "general")
+    }
+
+def build_job_profile(raw_jd: Dict) -> Dict:
+    """Normalize raw AI job output into the jd_json used by calculate_match_percentage"""
+    raw_jd = raw_jd or {}
+    return {
+        "skills": clean_skill_list(raw_jd.get("must_have", []) if isinstance(raw_jd.get("must_have"), list) else []),
+        "projects": raw_jd.get("projects_required", []) if isinstance(raw_jd.get("projects_required"), list) else [],
+        "experience_years": raw_jd.get("experience_years_required", 0) if isinstance(raw_jd.get("experience_years_required"), (int, float)) else 0
+    }
+
+def matched_skills_for(jd_json: Dict, resume_json: Dict) -> List[str]:
+    """Resume skills that the JD asks for (UI display, no duplicates)"""
+    jd_skills = set(jd_json.get("skills", []))
+    return [skill for skill in resume_json.get("skills", []) if skill in jd_skills]
+
 def match_resume_with_job(resume_text: str, job_text: str) -> Dict:
     """Complete resume-job matching pipeline - AI ONLY extracts data"""
     
@@ -536,8 +827,9 @@ def match_resume_with_job(resume_text: str, job_text: str) -> Dict:
     }
 
 def extract_text_from_resume(file_path: str) -> str:
-    """Extract text from resume file"""
-    return extract_text_from_file(file_path)
+    """Extract text from resume file (served from the DB text cache when possible)"""
+    text, _ = extract_text_with_hash(file_path)
+    return text
 
 # =====================================================
 # USAGE EXAMPLE
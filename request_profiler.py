@@ -0,0 +1,186 @@
+# =====================================================
+# ON-DEMAND REQUEST PROFILER (ADMIN ONLY)
+# =====================================================
+# Production mein slow request (jaise /admin/jobs) ko ek baar profiler ke
+# neeche chalane ke liye:
+#   header:  X-Profile: 1            (ya "cprofile" / "sampling")
+#   query:   ?_profile=1
+# Sirf logged-in admin ke request profile hote hain. Switch off ho toh
+# koi profiler start nahi hota - bas ek header/arg lookup.
+# pyinstrument installed ho toh sampling profiler (kam overhead), warna cProfile.
+# Profile + metadata (route, status, duration, size) PROFILE_DIR mein save
+# hote hain; /admin/profiles par list, top functions aur download.
+#
+# Limitation: profiler sirf request wale thread ko dekhta hai, before_request
+# se after_request tak.
+#   - Background threads nahi aate: matching_runs ka scoring (start_matching_run
+#     ke executor threads), ingest workers, extraction process pool. POST
+#     /api/add_job ka profile sirf run queue karna dikhata hai - scoring
+#     timing benchmarks/bench_pipeline.py (admin_jobs_e2e) ya metrics se lo.
+#   - Streamed responses (CSV export, SSE events) ka body after_request ke
+#     baad generator se banta hai - profile mein sirf view ka setup hota hai.
+#     Aise profiles metadata mein "streamed": true se mark hote hain.
+
+import os
+import io
+import re
+import json
+import time
+import uuid
+import pstats
+import cProfile
+
+from flask import request, session, g
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+    SAMPLING_AVAILABLE = True
+except ImportError:
+    SAMPLING_AVAILABLE = False
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+PROFILE_HEADER = "X-Profile"
+PROFILE_ARG = "_profile"
+PROFILE_ID_RE = re.compile(r"^[0-9]{8}-[0-9]{6}-[0-9a-f]{8}$")
+
+
+def _requested_mode():
+    """None (switch off), 'cprofile' or 'sampling'"""
+    flag = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_ARG)
+    if not flag or flag.lower() in ("0", "false", "off"):
+        return None
+    if flag.lower() == "cprofile" or not SAMPLING_AVAILABLE:
+        return "cprofile"
+    return "sampling"
+
+
+def _start_profile():
+    mode = _requested_mode()
+    if mode is None or not session.get("admin_logged_in"):
+        return
+    if mode == "sampling":
+        profiler = SamplingProfiler()
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    g.request_profile = (mode, profiler, time.perf_counter())
+
+
+def _finish_profile(response):
+    active = g.pop("request_profile", None)
+    if active is None:
+        return response
+    mode, profiler, started = active
+    duration = time.perf_counter() - started
+    if mode == "sampling":
+        profiler.stop()
+    else:
+        profiler.disable()
+
+    try:
+        profile_id = save_profile(mode, profiler, duration, response.status_code, response.is_streamed)
+        response.headers["X-Profile-Id"] = profile_id
+    except Exception as e:
+        print(f"DEBUG: Saving request profile failed: {e}")
+    return response
+
+
+def _abort_profile(exc=None):
+    # View ne exception raise kiya toh after_request nahi chalta - profiler band karo
+    active = g.pop("request_profile", None)
+    if active is not None:
+        mode, profiler, _ = active
+        profiler.stop() if mode == "sampling" else profiler.disable()
+
+
+def install_profiler(app):
+    """Register the before/after request hooks on a Flask app"""
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_abort_profile)
+
+
+# =====================================================
+# STORAGE
+# =====================================================
+def _paths(profile_id):
+    base = os.path.join(PROFILE_DIR, profile_id)
+    return base + ".json", base + ".prof", base + ".html"
+
+
+def save_profile(mode, profiler, duration, status_code, streamed=False):
+    """Write the profile + metadata JSON. Returns the profile id.
+
+    streamed=True: response body was not generated yet (only the view is profiled).
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profile_id = time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:8]
+    meta_path, prof_path, html_path = _paths(profile_id)
+
+    if mode == "sampling":
+        data_path = html_path
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(profiler.output_html())
+        summary = profiler.output_text(unicode=False, color=False)
+    else:
+        data_path = prof_path
+        profiler.dump_stats(prof_path)
+        summary = None
+
+    meta = {
+        "id": profile_id,
+        "profiler": mode,
+        "method": request.method,
+        "path": request.path,
+        "endpoint": request.endpoint,
+        "query": request.query_string.decode("utf-8", "replace"),
+        "status": status_code,
+        "streamed": streamed,
+        "duration_ms": round(duration * 1000, 2),
+        "size_bytes": os.path.getsize(data_path),
+        "file": os.path.basename(data_path),
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "summary": summary,
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    print(f"DEBUG: Profiled {request.method} {request.path} ({meta['duration_ms']} ms) -> {profile_id}")
+    return profile_id
+
+
+def list_profiles():
+    """Metadata of saved profiles, newest first"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(PROFILE_DIR), reverse=True):
+        if name.endswith(".json"):
+            with open(os.path.join(PROFILE_DIR, name), encoding="utf-8") as f:
+                profiles.append(json.load(f))
+    return profiles
+
+
+def get_profile(profile_id):
+    """Metadata dict or None (ids are validated, so no path traversal)"""
+    if not PROFILE_ID_RE.match(profile_id or ""):
+        return None
+    meta_path = _paths(profile_id)[0]
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+
+def top_functions(meta, sort="cumulative", limit=40):
+    """Text report of the hottest functions for a saved profile"""
+    if meta["profiler"] == "sampling":
+        return meta.get("summary") or ""
+    if sort not in SORT_KEYS:
+        sort = "cumulative"
+    out = io.StringIO()
+    stats = pstats.Stats(os.path.join(PROFILE_DIR, meta["file"]), stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,435 @@
+# =====================================================
+# SEMANTIC CANDIDATE RETRIEVAL (FAISS + PLUGGABLE EMBEDDINGS)
+# =====================================================
+# Ingest par resume text embed hoke ek on-disk vector index mein jaata hai
+# (har naye resume par incremental update). Job description ke liye
+# top-k candidates milliseconds mein milte hain.
+#
+# Disk layout (SEMANTIC_INDEX_DIR):
+#   resumes.faiss / resumes.npz + meta.json - snapshot
+#   resumes.log                             - snapshot ke baad ke adds, append-only
+#   lock                                    - processes ke beech fcntl file lock
+# Har add sirf log mein ek record append karta hai; log COMPACT_LOG_BYTES se bada
+# ho toh naya snapshot likhke log khaali. Dusre process log ka naya hissa hi padhte hain.
+#
+# Embedding backends (EMBEDDING_BACKEND env):
+#   "hashing"               - default, CPU-only hashed TF-IDF, koi model download nahi
+#   "sentence-transformers" - rag_requirements.txt wala model (optional)
+# Index: faiss-cpu installed ho toh FAISS, warna NumPy brute-force fallback.
+#
+# CLI usage:
+#   python semantic_index.py --rebuild
+#   python semantic_index.py --query "python flask developer" -k 10
+
+import os
+import re
+import sys
+import json
+import math
+import zlib
+import struct
+import argparse
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False   # Windows: sirf is process ke threads ka lock
+
+SEMANTIC_INDEX_DIR = os.environ.get("SEMANTIC_INDEX_DIR", "semantic_index")
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "hashing")
+COMPACT_LOG_BYTES = 64 * 1024 * 1024
+
+LOG_RECORD = struct.Struct("<4sqq")   # magic, number of vectors, dim
+LOG_MAGIC = b"SIX1"
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+# =====================================================
+# EMBEDDING BACKENDS
+# =====================================================
+class HashingTfidfBackend:
+    """Offline hashed TF-IDF: signed feature hashing of tokens + document-frequency IDF.
+
+    Documents are stored as L2-normalized log-TF vectors; IDF (from bucket
+    document frequencies, kept in step with the stored vectors by
+    update_stats) is applied on the query side, so old vectors never need
+    re-embedding as the corpus grows.
+    """
+    name = "hashing"
+
+    def __init__(self, dim=4096):
+        self.dim = dim
+        self.doc_count = 0
+        self.doc_freq = np.zeros(dim, dtype=np.int64)
+
+    def _hashed_tf(self, text):
+        vec = np.zeros(self.dim, dtype=np.float32)
+        counts = {}
+        for token in TOKEN_RE.findall((text or "").lower()):
+            counts[token] = counts.get(token, 0) + 1
+        for token, count in counts.items():
+            h = zlib.crc32(token.encode("utf-8"))
+            sign = 1.0 if (h >> 31) & 1 else -1.0
+            vec[h % self.dim] += sign * (1.0 + math.log(count))
+        return vec
+
+    @staticmethod
+    def _normalize(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).astype(np.float32)
+
+    def embed_documents(self, texts):
+        matrix = np.vstack([self._hashed_tf(t) for t in texts]) if texts else np.zeros((0, self.dim), np.float32)
+        return self._normalize(matrix)
+
+    def update_stats(self, added, removed):
+        """Document frequencies for stored vectors added / replaced (non-zero bucket = token present)"""
+        self.doc_count += len(added) - len(removed)
+        self.doc_freq += (added != 0).sum(axis=0)
+        if len(removed):
+            self.doc_freq -= (removed != 0).sum(axis=0)
+
+    def embed_query(self, text):
+        idf = np.log((1 + self.doc_count) / (1 + self.doc_freq)) + 1.0
+        # doc side par IDF nahi hai, isliye query par idf^2 = tf-idf dot product
+        return self._normalize((self._hashed_tf(text) * (idf ** 2))[None, :])
+
+    def state(self):
+        return {"dim": self.dim, "doc_count": self.doc_count, "doc_freq": self.doc_freq.tolist()}
+
+    def load_state(self, state):
+        self.dim = state["dim"]
+        self.doc_count = state["doc_count"]
+        self.doc_freq = np.asarray(state["doc_freq"], dtype=np.int64)
+
+
+class SentenceTransformerBackend:
+    """Dense embeddings from sentence-transformers (needs the model download)"""
+    name = "sentence-transformers"
+
+    def __init__(self, model_name=os.environ.get("EMBEDDING_MODEL", "all-MiniLM-L6-v2")):
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed_documents(self, texts):
+        if not texts:
+            return np.zeros((0, self.dim), np.float32)
+        return np.asarray(self.model.encode(list(texts), normalize_embeddings=True), dtype=np.float32)
+
+    def embed_query(self, text):
+        return self.embed_documents([text])
+
+    def update_stats(self, added, removed):
+        pass
+
+    def state(self):
+        return {"dim": self.dim, "model_name": self.model_name}
+
+    def load_state(self, state):
+        pass
+
+
+EMBEDDING_BACKENDS = {
+    HashingTfidfBackend.name: HashingTfidfBackend,
+    SentenceTransformerBackend.name: SentenceTransformerBackend,
+}
+
+
+# =====================================================
+# VECTOR STORE (FAISS ya NumPy fallback)
+# =====================================================
+class _NumpyVectors:
+    """Brute-force inner-product index used when faiss-cpu is not installed"""
+
+    def __init__(self, dim):
+        self.dim = dim
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+
+    @property
+    def ntotal(self):
+        return len(self.ids)
+
+    def remove_ids(self, ids):
+        keep = ~np.isin(self.ids, ids)
+        self.ids, self.vectors = self.ids[keep], self.vectors[keep]
+
+    def get_vectors(self, ids):
+        return self.vectors[np.isin(self.ids, ids)]
+
+    def add_with_ids(self, vectors, ids):
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.ids = np.concatenate([self.ids, ids])
+
+    def search(self, query, k):
+        scores = self.vectors @ query[0]
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k else np.zeros(0, dtype=np.int64)
+        top = top[np.argsort(-scores[top])]
+        return scores[top][None, :], self.ids[top][None, :]
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            np.savez(f, ids=self.ids, vectors=self.vectors)
+
+    @classmethod
+    def load(cls, path, dim):
+        data = np.load(path)
+        store = cls(dim)
+        store.ids, store.vectors = data["ids"], data["vectors"]
+        return store
+
+
+def _stored_vectors(store, ids):
+    """Vectors already indexed under any of ids (their stats must be removed on replace)"""
+    if isinstance(store, _NumpyVectors):
+        return store.get_vectors(ids)
+    found = []
+    for i in ids:
+        try:
+            found.append(store.reconstruct(int(i)))
+        except RuntimeError:
+            pass   # id index mein nahi hai
+    return np.vstack(found) if found else np.zeros((0, store.d), dtype=np.float32)
+
+
+class SemanticIndex:
+    def __init__(self, index_dir=SEMANTIC_INDEX_DIR, backend=EMBEDDING_BACKEND):
+        self.index_dir = index_dir
+        self.backend = EMBEDDING_BACKENDS[backend]()
+        self.use_faiss = FAISS_AVAILABLE
+        self._lock = threading.RLock()
+        self._loaded_mtime = None
+        self._log_offset = 0         # log ka itna hissa memory mein apply ho chuka
+        self._backend_mismatch = False
+        self._store = self._new_store()
+        with self._lock, self._file_lock(exclusive=False):
+            self._sync()
+
+    # ---------- persistence ----------
+    @property
+    def _index_path(self):
+        return os.path.join(self.index_dir, "resumes.faiss" if self.use_faiss else "resumes.npz")
+
+    @property
+    def _meta_path(self):
+        return os.path.join(self.index_dir, "meta.json")
+
+    @property
+    def _log_path(self):
+        return os.path.join(self.index_dir, "resumes.log")
+
+    @contextmanager
+    def _file_lock(self, exclusive):
+        """Cross-process lock: shared for reading the files, exclusive for writing"""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        if not exclusive and not os.path.isdir(self.index_dir):
+            yield      # abhi kuch likha hi nahi gaya
+            return
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(os.path.join(self.index_dir, "lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _new_store(self):
+        if self.use_faiss:
+            return faiss.IndexIDMap2(faiss.IndexFlatIP(self.backend.dim))
+        return _NumpyVectors(self.backend.dim)
+
+    def _load(self):
+        """Snapshot load (log baad mein _sync apply karta hai)"""
+        self.backend = EMBEDDING_BACKENDS[self.backend.name]()
+        self._store = self._new_store()
+        self._log_offset, self._loaded_mtime = 0, None
+        self._backend_mismatch = False
+        if not (os.path.exists(self._index_path) and os.path.exists(self._meta_path)):
+            return
+        with open(self._meta_path) as f:
+            meta = json.load(f)
+        self._loaded_mtime = os.path.getmtime(self._meta_path)
+        if meta.get("backend") != self.backend.name:
+            print(f"DEBUG: Semantic index built with '{meta.get('backend')}', rebuild needed")
+            self._backend_mismatch = True
+            return
+        self.backend.load_state(meta["backend_state"])
+        if self.use_faiss:
+            self._store = faiss.read_index(self._index_path)
+        else:
+            self._store = _NumpyVectors.load(self._index_path, self.backend.dim)
+
+    def _sync(self):
+        """Dusre process ke changes: naya snapshot ho toh reload, phir log ka naya hissa apply"""
+        if os.path.exists(self._meta_path) and os.path.getmtime(self._meta_path) != self._loaded_mtime:
+            self._load()
+        if self._backend_mismatch or not os.path.exists(self._log_path):
+            return
+        if os.path.getsize(self._log_path) <= self._log_offset:
+            return
+        with open(self._log_path, "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read()
+        pos = 0
+        while pos + LOG_RECORD.size <= len(data):
+            magic, n, dim = LOG_RECORD.unpack_from(data, pos)
+            end = pos + LOG_RECORD.size + n * 8 + n * dim * 4
+            if magic != LOG_MAGIC or end > len(data):
+                break   # adhoora record (writer crash) - agla writer truncate karega
+            ids = np.frombuffer(data, dtype=np.int64, count=n, offset=pos + LOG_RECORD.size)
+            vectors = np.frombuffer(data, dtype=np.float32, count=n * dim, offset=pos + LOG_RECORD.size + n * 8)
+            if dim == self.backend.dim:
+                self._apply(ids.copy(), vectors.reshape(n, dim).copy())
+            pos = end
+        self._log_offset += pos
+
+    def _apply(self, ids, vectors):
+        """Insert or replace vectors in memory; replaced docs leave the backend stats"""
+        self.backend.update_stats(vectors, _stored_vectors(self._store, ids))
+        self._store.remove_ids(ids)
+        self._store.add_with_ids(vectors, ids)
+
+    def _write_snapshot(self):
+        """Poora index + meta likho aur log khaali karo - exclusive lock ke andar"""
+        os.makedirs(self.index_dir, exist_ok=True)
+        tmp_index = self._index_path + ".tmp"
+        if self.use_faiss:
+            faiss.write_index(self._store, tmp_index)
+        else:
+            self._store.save(tmp_index)
+        os.replace(tmp_index, self._index_path)
+
+        tmp_meta = self._meta_path + ".tmp"
+        with open(tmp_meta, "w") as f:
+            json.dump({"backend": self.backend.name, "backend_state": self.backend.state()}, f)
+        os.replace(tmp_meta, self._meta_path)
+        with open(self._log_path, "wb"):
+            pass
+        self._loaded_mtime = os.path.getmtime(self._meta_path)
+        self._log_offset = 0
+        self._backend_mismatch = False
+
+    def _append(self, ids, vectors):
+        """Log mein ek record - exclusive lock ke andar, _sync ke baad"""
+        if self._backend_mismatch or not os.path.exists(self._meta_path):
+            self._write_snapshot()
+            return
+        with open(self._log_path, "ab") as f:
+            f.truncate(self._log_offset)    # crash se bacha adhoora record hatao
+            f.write(LOG_RECORD.pack(LOG_MAGIC, len(ids), vectors.shape[1]))
+            f.write(ids.astype(np.int64).tobytes())
+            f.write(vectors.astype(np.float32).tobytes())
+            self._log_offset = f.tell()
+        if self._log_offset > COMPACT_LOG_BYTES:
+            print(f"DEBUG: Compacting semantic index log ({self._log_offset} bytes)")
+            self._write_snapshot()
+
+    # ---------- public API ----------
+    def add_documents(self, items):
+        """Embed and (re)index [(resume_id, text), ...]; an existing id is replaced"""
+        # Same id do baar ho toh last wala text
+        docs = {int(i): t for i, t in items if t}
+        if not docs:
+            return 0
+        ids = np.asarray(list(docs), dtype=np.int64)
+        vectors = self.backend.embed_documents(list(docs.values()))
+        with self._lock, self._file_lock(exclusive=True):
+            self._sync()
+            if self._backend_mismatch:
+                # Purana index doosre backend ka - naye se shuru
+                self.backend = EMBEDDING_BACKENDS[self.backend.name]()
+                self._store = self._new_store()
+            self._apply(ids, vectors)
+            self._append(ids, vectors)
+        return len(docs)
+
+    def search(self, text, k=20):
+        """Top-k [(resume_id, score)] for a query / job description"""
+        with self._lock:
+            with self._file_lock(exclusive=False):
+                self._sync()
+            if self._store.ntotal == 0 or not text:
+                return []
+            scores, ids = self._store.search(self.backend.embed_query(text), min(k, self._store.ntotal))
+        return [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i != -1]
+
+    def rebuild(self, items):
+        """Re-embed everything from scratch and write a fresh snapshot"""
+        docs = {int(i): t for i, t in items if t}
+        ids = np.asarray(list(docs), dtype=np.int64)
+        with self._lock, self._file_lock(exclusive=True):
+            self.backend = EMBEDDING_BACKENDS[self.backend.name]()
+            self._store = self._new_store()
+            if docs:
+                self._apply(ids, self.backend.embed_documents(list(docs.values())))
+            self._write_snapshot()
+        return len(docs)
+
+    def __len__(self):
+        return int(self._store.ntotal)
+
+
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+
+def get_semantic_index():
+    global _shared_index
+    if _shared_index is None:
+        with _shared_index_lock:
+            if _shared_index is None:
+                _shared_index = SemanticIndex()
+    return _shared_index
+
+
+def index_resume(resume_id, resume_text):
+    """Incrementally add one resume to the shared index (errors are logged, not raised)"""
+    try:
+        get_semantic_index().add_documents([(resume_id, resume_text)])
+    except Exception as e:
+        print(f"DEBUG: Semantic indexing failed for resume {resume_id}: {e}")
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main(argv=None):
+    from database import init_db, get_all_resume_texts
+
+    parser = argparse.ArgumentParser(description="Semantic resume index")
+    parser.add_argument("--rebuild", action="store_true", help="re-embed every stored resume text")
+    parser.add_argument("--query", help="job description / query text")
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    init_db()
+    index = get_semantic_index()
+    if args.rebuild:
+        count = index.rebuild(get_all_resume_texts())
+        print(f"Indexed {count} resumes ({index.backend.name}, {'faiss' if index.use_faiss else 'numpy'})")
+    if args.query:
+        for resume_id, score in index.search(args.query, args.k):
+            print(f"{score:.4f}  resume {resume_id}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
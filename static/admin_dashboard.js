@@ -28,6 +28,15 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Full-text resume search (/api/search_resumes)
+    const searchForm = document.getElementById('resumeSearchForm');
+    if (searchForm) {
+        searchForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+            searchResumes(document.getElementById('resumeSearchInput').value, 1);
+        });
+    }
+
     // Generate summary button click handler
     const generateButtons = document.querySelectorAll('.generate-btn');
     generateButtons.forEach(function(button) {
@@ -49,3 +58,48 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 });
 
+function searchResumes(query, page) {
+    const container = document.getElementById('resumeSearchResults');
+    if (!query.trim()) {
+        container.innerHTML = '';
+        return;
+    }
+
+    fetch('/api/search_resumes?q=' + encodeURIComponent(query) + '&page=' + page)
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                container.innerHTML = '<p class="search-empty">' + data.error + '</p>';
+                return;
+            }
+            if (!data.results.length) {
+                container.innerHTML = '<p class="search-empty">No resumes found.</p>';
+                return;
+            }
+
+            // name/email escape karo; snippet server se escaped + <mark> ke saath aata hai
+            const escapeHtml = text => { const div = document.createElement('div'); div.textContent = text || ''; return div.innerHTML; };
+            let html = '<p class="search-count">' + data.total + ' results</p>';
+            data.results.forEach(r => {
+                html += '<div class="search-result">' +
+                    '<a href="/admin/candidate/' + r.id + '"><strong>' + escapeHtml(r.name) + '</strong></a> ' +
+                    '<span>' + escapeHtml(r.email) + '</span>' +
+                    '<p>' + r.snippet + '</p>' +
+                    '</div>';
+            });
+            if (page > 1) {
+                html += '<button type="button" class="pagination-btn" data-page="' + (page - 1) + '">← Previous</button> ';
+            }
+            if (data.has_next) {
+                html += '<button type="button" class="pagination-btn" data-page="' + (page + 1) + '">Next →</button>';
+            }
+            container.innerHTML = html;
+            container.querySelectorAll('button[data-page]').forEach(btn => {
+                btn.addEventListener('click', () => searchResumes(query, parseInt(btn.dataset.page)));
+            });
+        })
+        .catch(error => {
+            console.error('Search error:', error);
+            container.innerHTML = '<p class="search-empty">Search failed.</p>';
+        });
+}
@@ -1,11 +1,24 @@
-// Load jobs when page loads
+// Job post turant save hota hai; matching background run mein chalti hai
+// aur har scored candidate SSE (/api/matching_runs/<id>/events) se aata hai.
+let currentSource = null;
+let currentRunId = null;
+let currentMatches = [];
+
 document.addEventListener('DOMContentLoaded', function() {
     loadJobs();
+
+    // Server ne active run bheja (form bina JS ke submit hua ya page reload)
+    const section = document.getElementById('matchesSection');
+    if (section && section.dataset.runId) {
+        watchRun(section.dataset.runId, section.dataset.jobTitle || '');
+    }
+
+    document.getElementById('cancelRunBtn').addEventListener('click', cancelRun);
 });
 
 document.getElementById('addJobForm').addEventListener('submit', function(e) {
     e.preventDefault();
-    
+
     const title = document.getElementById('jobTitle').value;
     const requirements = document.getElementById('jobRequirements').value;
 
@@ -14,46 +27,47 @@ document.getElementById('addJobForm').addEventListener('submit', function(e) {
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ title: title, requirements: requirements })
     })
-    .then(response => response.json())
+    .then(response => {
+        if (response.status === 401) throw new Error("Please login again!");
+        return response.json();
+    })
     .then(data => {
-        if(data.success) {
-            // ✅ Alert ke baad seedhe matches dikhayenge
-            alert('✅ Job post added! Searching for candidates...');
-            
-            // Yahan hum nayi banyi hui Job ka ID use karke viewMatches call karenge
-            // Note: Backend se 'job_id' aana zaroori hai
-            if(data.job_id) {
-                viewMatches(data.job_id, title);
-            }
-            
+        if (data.success) {
+            // Reload par bhi yahi run dikhe
+            history.replaceState(null, '', '/admin/jobs?run=' + data.run_id);
+            watchRun(data.run_id, title);
             document.getElementById('addJobForm').reset();
+            loadJobs();
         } else {
-            alert('❌ Error adding job post');
+            alert('❌ Error adding job post: ' + (data.error || 'unknown error'));
         }
     })
-    .catch(error => console.error('Error:', error));
+    .catch(error => alert('❌ ' + error.message));
 });
 
-// loadJobs() function ko delete kar sakte hain kyunki ab humein list nahi chahiye
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text == null ? '' : String(text);
+    return div.innerHTML;
+}
+
 // Load all jobs
 function loadJobs() {
+    const container = document.getElementById('jobsContainer');
+    if (!container) return;
+
     fetch('/api/get_jobs')
     .then(response => response.json())
     .then(data => {
-        const container = document.getElementById('jobsContainer');
-        
-        if(data.jobs && data.jobs.length > 0) {
-            container.innerHTML = '';
-            data.jobs.forEach(job => {
-                container.innerHTML += createJobCard(job);
-            });
+        if (data.jobs && data.jobs.length > 0) {
+            container.innerHTML = data.jobs.map(createJobCard).join('');
         } else {
             container.innerHTML = '<div class="no-matches">No job posts available. Add one above!</div>';
         }
     })
     .catch(error => {
         console.error('Error:', error);
-        document.getElementById('jobsContainer').innerHTML = '<div class="no-matches">❌ Error loading jobs</div>';
+        container.innerHTML = '<div class="no-matches">❌ Error loading jobs</div>';
     });
 }
 
@@ -61,29 +75,136 @@ function loadJobs() {
 function createJobCard(job) {
     return `<div class="job-item">
         <div class="job-header">
-            <div class="job-title">${job.title}</div>
-            <button class="btn btn-success" onclick="viewMatches(${job.id}, '${job.title}')">
+            <div class="job-title">${escapeHtml(job.title)}</div>
+            <button class="btn btn-success" data-job-id="${job.id}" data-job-title="${escapeHtml(job.title)}"
+                    onclick="viewMatches(this.dataset.jobId, this.dataset.jobTitle)">
                 👥 View Matches
             </button>
         </div>
         <div class="job-requirements">
-            <strong>Requirements:</strong> ${job.requirements}
+            <strong>Requirements:</strong> ${escapeHtml(job.requirements)}
         </div>
     </div>`;
 }
 
-// 🔥 IS FUNCTION KO UPDATE KAREIN
-function viewMatches(jobId, jobTitle) {
+function showMatchesSection(title) {
     const matchesSection = document.getElementById('matchesSection');
-    const matchesContainer = document.getElementById('matchesContainer');
-    const matchesTitle = document.getElementById('matchesTitle');
-
-    matchesSection.style.display = 'block'; // Ensure it's visible
+    matchesSection.style.display = 'block';
     matchesSection.classList.add('active');
-    matchesTitle.textContent = `🎯 Matches for "${jobTitle}"`;
+    document.getElementById('matchesTitle').textContent = `🎯 Matches for "${title}"`;
+    document.getElementById('matchesContainer').innerHTML = '';
+    currentMatches = [];
+}
+
+function stopWatching() {
+    if (currentSource) {
+        currentSource.close();
+        currentSource = null;
+    }
+    currentRunId = null;
+    document.getElementById('cancelRunBtn').style.display = 'none';
+}
+
+// =========================
+// LIVE MATCHING RUN (SSE)
+// =========================
+function watchRun(runId, jobTitle) {
+    stopWatching();
+    showMatchesSection(jobTitle);
+    currentRunId = runId;
+    document.getElementById('cancelRunBtn').style.display = 'inline-block';
+    setProgress({ status: 'queued', scored: 0, total: null });
+
+    // EventSource connection tootne par khud reconnect karta hai (Last-Event-ID ke saath)
+    const source = new EventSource(`/api/matching_runs/${runId}/events`);
+    currentSource = source;
+
+    source.addEventListener('status', e => setProgress(JSON.parse(e.data)));
+
+    source.addEventListener('result', e => {
+        const data = JSON.parse(e.data);
+        insertCandidate(data.result);
+        setProgress({ status: 'scoring', scored: data.scored, total: data.total });
+    });
+
+    source.addEventListener('done', e => {
+        const data = JSON.parse(e.data);
+        setProgress(data);
+        stopWatching();
+        if (currentMatches.length === 0) {
+            document.getElementById('matchesContainer').innerHTML =
+                '<div class="no-matches">No candidates match these requirements.</div>';
+        }
+    });
+
+    source.onerror = () => {
+        // Run server restart mein kho gaya (404) - reconnect loop band karo
+        if (source.readyState === EventSource.CLOSED) {
+            setProgress({ status: 'failed', error: 'Lost connection to the matching run' });
+            stopWatching();
+        }
+    };
+}
+
+function cancelRun() {
+    if (!currentRunId) return;
+    fetch(`/api/matching_runs/${currentRunId}/cancel`, { method: 'POST' })
+        .then(res => res.json())
+        .then(data => {
+            if (!data.success) console.log('Run already finished');
+        });
+}
+
+function setProgress(data) {
+    const label = document.getElementById('runProgress');
+    const bar = document.getElementById('runProgressBar');
+    const statusText = {
+        queued: '⏳ Waiting to start...',
+        analyzing: '🧠 Analyzing job description...',
+        scoring: '🔍 Scoring candidates',
+        done: '✅ Matching complete',
+        cancelled: '✖ Matching cancelled',
+        failed: '❌ Matching failed'
+    };
+
+    let text = statusText[data.status] || data.status;
+    if (data.total != null) {
+        text += ` (${data.scored}/${data.total})`;
+        bar.style.width = data.total ? `${Math.round(100 * data.scored / data.total)}%` : '100%';
+    }
+    if (data.status === 'done') bar.style.width = '100%';
+    if (data.error) text += ': ' + data.error;
+    label.textContent = text;
+}
+
+// Ranked list: naya candidate sahi position par (binary search), poori list re-render nahi
+function insertCandidate(candidate) {
+    const container = document.getElementById('matchesContainer');
+    let lo = 0, hi = currentMatches.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (currentMatches[mid].match_percentage >= candidate.match_percentage) lo = mid + 1;
+        else hi = mid;
+    }
+    currentMatches.splice(lo, 0, candidate);
+
+    const template = document.createElement('template');
+    template.innerHTML = createCandidateCard(candidate).trim();
+    container.insertBefore(template.content.firstChild, container.children[lo] || null);
+}
+
+// Top matches of an existing job (server par bounded top-k ranking)
+const TOP_K = 20;
+
+function viewMatches(jobId, jobTitle) {
+    stopWatching();
+    showMatchesSection(jobTitle);
+    const matchesContainer = document.getElementById('matchesContainer');
+    document.getElementById('runProgress').textContent = '';
+    document.getElementById('runProgressBar').style.width = '0';
     matchesContainer.innerHTML = '<div class="loading">⏳ Searching candidates...</div>';
 
-    fetch(`/api/get_matches/${jobId}`)
+    fetch(`/api/get_matches/${jobId}?k=${TOP_K}`)
         .then(res => {
             if (res.status === 401) throw new Error("Please login again!");
             return res.json();
@@ -94,39 +215,41 @@ function viewMatches(jobId, jobTitle) {
                 matchesContainer.innerHTML = '<div class="no-matches">No candidates match these requirements.</div>';
                 return;
             }
-            // Data dikhane ke liye cards banayein
-            data.forEach(candidate => {
-                matchesContainer.innerHTML += createCandidateCard(candidate);
-            });
+            currentMatches = data;
+            matchesContainer.innerHTML = data.map(createCandidateCard).join('');
         })
         .catch(err => {
-            matchesContainer.innerHTML = `<div class="no-matches">❌ Error: ${err.message}</div>`;
+            matchesContainer.innerHTML = `<div class="no-matches">❌ Error: ${escapeHtml(err.message)}</div>`;
         });
 }
 
-// Create candidate card with match percentage
+// Create candidate card with match percentage (admin_jobs.html jaisa markup)
 function createCandidateCard(candidate) {
     // Determine badge color based on match percentage
-    let badgeClass = 'match-low';
-    if(candidate.match_percent >= 70) {
-        badgeClass = 'match-high';
-    } else if(candidate.match_percent >= 40) {
-        badgeClass = 'match-medium';
+    let badgeClass = 'low-match';
+    if (candidate.match_percentage >= 70) {
+        badgeClass = 'high-match';
+    } else if (candidate.match_percentage >= 40) {
+        badgeClass = 'medium-match';
     }
 
-    return `<div class="candidate-card">
-        <div class="candidate-header">
-            <div class="candidate-name">👤 ${candidate.name}</div>
-            <div class="match-badge ${badgeClass}">
-                ${candidate.match_percent}% Match
+    const fileName = (candidate.file_path || '').split(/[\\/]/).pop();
+    const skills = candidate.matched_skills && candidate.matched_skills.length
+        ? `<p>🎯 Matched Skills: ${escapeHtml(candidate.matched_skills.join(', '))}</p>` : '';
+    const summary = candidate.summary
+        ? `<p>📝 Summary: ${escapeHtml(candidate.summary.slice(0, 100))}...</p>` : '';
+
+    return `<div class="match-item ${badgeClass}">
+        <div class="candidate-info">
+            <h4>${escapeHtml(candidate.name)}</h4>
+            <p>📧 ${escapeHtml(candidate.email)}</p>
+            ${skills}
+            ${summary}
+            <div class="candidate-actions">
+                <a href="/admin/candidate/${candidate.id}" class="view-details-btn">👤 View Details</a>
+                ${fileName ? `<a href="/uploads/${encodeURIComponent(fileName)}" class="view-resume-btn" target="_blank">📄 View Resume</a>` : ''}
             </div>
         </div>
-        <div class="candidate-email">
-            📧 Email: ${candidate.email}
-        </div>
-        <div class="candidate-summary">
-            <strong>📄 Resume Summary:</strong><br>
-            ${candidate.summary || 'No summary available'}
-        </div>
+        <div class="match-percentage">${candidate.match_percentage}%</div>
     </div>`;
-}
\ No newline at end of file
+}
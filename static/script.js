@@ -19,4 +19,30 @@ document.addEventListener('DOMContentLoaded', () => {
         
         // Form apne aap submit hoga aur page refresh hoga
     });
-});
\ No newline at end of file
+
+    // Background processing status poll karo
+    const ingestStatus = document.getElementById('ingestStatus');
+    if (ingestStatus) {
+        pollIngestStatus(ingestStatus, ingestStatus.dataset.token);
+    }
+});
+
+const INGEST_STATUS_TEXT = {
+    queued: '⏳ Your resume is in the queue...',
+    extracting: '📄 Reading your resume...',
+    analyzing: '🤖 Analyzing your skills and experience...',
+    done: '✅ Your resume has been processed successfully!',
+    failed: '❌ We could not process your resume. Please try again.'
+};
+
+function pollIngestStatus(statusEl, token) {
+    fetch(`/api/ingest_status/${encodeURIComponent(token)}`)
+        .then(res => res.json())
+        .then(data => {
+            statusEl.textContent = INGEST_STATUS_TEXT[data.status] || data.error || 'Unknown status';
+            if (data.status !== 'done' && data.status !== 'failed') {
+                setTimeout(() => pollIngestStatus(statusEl, token), 2000);
+            }
+        })
+        .catch(() => setTimeout(() => pollIngestStatus(statusEl, token), 5000));
+}
@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Fresh SQLite DB per test (resumes.db ko haath nahi lagta)"""
+    monkeypatch.setattr(database, "DB_NAME", str(tmp_path / "test.db"))
+    database.init_db()
+    yield database
+    database.close_connection()
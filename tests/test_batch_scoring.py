@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from batch_scoring import SkillMatrix
+from benchmarks.synthetic import random_profile, random_jd
+from rag_summary import calculate_match_percentage
+from matching_engine import run_matching
+
+# Edge cases jo random profiles mein kam aate hain
+FIXED_PROFILES = [
+    {"skills": ["Python", "FLASK", "python"], "projects": ["Resume-Scanner"], "experience_years": 3},
+    {"skills": [], "projects": [], "experience_years": 0},
+    {"skills": ["sql"], "projects": ["data pipeline", "chat app"], "experience_years": 1.5},
+]
+FIXED_JDS = [
+    {"skills": ["python", "PYTHON", "flask"], "projects": ["resume-scanner"], "experience_years": 2},
+    {"skills": [], "projects": ["chat"], "experience_years": 1},
+    {"skills": ["sql", "docker"], "projects": [], "experience_years": 0},
+]
+
+
+def _matched_skills(jd, resume):
+    """JD skills jinhe calculate_match_percentage matched unit ginta hai (lowercase set)"""
+    resume_skills = [s.lower() for s in resume.get("skills", [])]
+    return {s.lower() for s in jd.get("must_have", jd.get("skills", [])) if s.lower() in resume_skills}
+
+
+@pytest.fixture
+def seeded(temp_db):
+    """(resumes with stored analysis, {job_id: stored JD profile})"""
+    rng = random.Random(5)
+    profiles = FIXED_PROFILES + [random_profile(rng) for _ in range(60)]
+    temp_db.save_import_batch("test", [{
+        "item": str(i), "name": f"Candidate {i}", "email": f"c{i}@example.com", "phone": "",
+        "file_path": "", "summary": "", "text_sha256": None, "text": None, "analysis": p,
+    } for i, p in enumerate(profiles)])
+
+    jobs = {}
+    for i, jd in enumerate(FIXED_JDS + [random_jd(rng) for _ in range(12)]):
+        job_id = temp_db.add_job_post(f"Job {i}", "requirements")
+        temp_db.save_job_analysis(job_id, jd)
+        jobs[job_id] = temp_db.get_job_analysis(job_id)
+    return temp_db.get_resumes_with_analysis(), jobs
+
+
+def test_batch_scores_match_calculate_match_percentage(seeded):
+    resumes, jobs = seeded
+    matrix = SkillMatrix.from_profiles((r["id"], r["analysis"]) for r in resumes)
+
+    for job_id, jd in jobs.items():
+        scores = matrix.score(jd)
+        for row, resume in enumerate(resumes):
+            want = calculate_match_percentage(jd, resume["analysis"])
+            got = float(scores.percentages[row])
+            assert got == want, (
+                f"job {job_id} / resume {resume['id']}: BatchScores {got} != calculate_match_percentage {want}\n"
+                f"jd={jd}\nresume={resume['analysis']}"
+            )
+            assert set(scores.matched_skills(row)) == _matched_skills(jd, resume["analysis"]), (
+                f"job {job_id} / resume {resume['id']}: matched skills differ\njd={jd}\nresume={resume['analysis']}"
+            )
+
+
+def test_run_matching_stores_same_scores(seeded):
+    resumes, jobs = seeded
+    analysis = {r["id"]: r["analysis"] for r in resumes}
+
+    for job_id, jd in jobs.items():
+        results = run_matching(job_id)
+        assert len(results) == len(resumes)
+        for r in results:
+            want = calculate_match_percentage(jd, analysis[r["id"]])
+            assert r["match_percentage"] == want, (
+                f"job {job_id} / resume {r['id']}: run_matching {r['match_percentage']} != {want}"
+            )
+            assert set(r["matched_skills"]) == _matched_skills(jd, analysis[r["id"]]), (
+                f"job {job_id} / resume {r['id']}: matched skills differ"
+            )
+
+
+def test_save_job_matches_keeps_rows_scored_during_run(temp_db):
+    job_id = temp_db.add_job_post("Job", "requirements")
+    conn = temp_db.get_connection()
+    conn.executemany(
+        "INSERT INTO job_matches (job_id, resume_id, score, matched_skills, scorer_version, scored_at) "
+        "VALUES (?, ?, 50, '[]', 'v1', ?)",
+        [(job_id, 1, "2026-01-01 10:00:00"),    # run se pehle ka - resume ab run mein nahi
+         (job_id, 2, "2026-01-01 10:00:10")]    # run ke dauran naya resume (incremental)
+    )
+    conn.commit()
+
+    temp_db.save_job_matches(job_id, [(3, 75.0, ["python"])], "v1", started_at="2026-01-01 10:00:05")
+
+    rows = conn.execute("SELECT resume_id, score FROM job_matches WHERE job_id = ? ORDER BY resume_id", (job_id,)).fetchall()
+    assert rows == [(2, 50.0), (3, 75.0)]
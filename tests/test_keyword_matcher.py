@@ -0,0 +1,63 @@
+import re
+import random
+
+import pytest
+
+from keyword_matcher import KeywordMatcher, find_keywords
+
+VOCAB = ["java", "javascript", "c", "c++", "c#", "go", "node", "node.js", "sql", "mysql",
+         "machine learning", "learning", "ai", "r", "react", "rest", "api"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    # java vs javascript - substring match nahi
+    ("JavaScript developer", ["javascript"]),
+    ("java and javascript", ["java", "javascript"]),
+    ("Java/JavaScript", ["java", "javascript"]),
+    # Symbol wale keywords
+    ("C++ and C#", ["c", "c++", "c#"]),
+    ("c++17", ["c", "c++"]),
+    ("worked in C", ["c"]),
+    ("Node.js backend", ["node", "node.js"]),
+    ("node.jsx", ["node"]),
+    ("nodejs", []),
+    # Text ke start / end par
+    ("java", ["java"]),
+    ("sql, react", ["sql", "react"]),
+    ("knows mysql", ["mysql"]),
+    ("r", ["r"]),
+    # Multi-word aur andar wale words
+    ("Machine Learning engineer", ["machine learning", "learning"]),
+    ("restful apis", []),
+    ("", []),
+])
+def test_find_word_boundaries(text, expected):
+    assert KeywordMatcher(VOCAB).find(text) == expected
+
+
+def test_find_keeps_vocabulary_spelling():
+    assert find_keywords("uses PYTHON and flask", ["Flask", "Python"]) == ["Flask", "Python"]
+
+
+def test_iter_matches_positions():
+    matches = list(KeywordMatcher(["java", "c++"]).iter_matches("java c++ javac"))
+    assert matches == [(0, 4, "java"), (5, 8, "c++")]
+
+
+def _regex_reference(text, keywords):
+    found = []
+    for keyword in keywords:
+        left = r"(?<!\w)" if re.match(r"\w", keyword[0]) else ""
+        right = r"(?!\w)" if re.match(r"\w", keyword[-1]) else ""
+        if re.search(left + re.escape(keyword.lower()) + right, text.lower()):
+            found.append(keyword)
+    return found
+
+
+def test_find_matches_regex_reference():
+    rng = random.Random(3)
+    filler = ["and", "with", "-", ",", "/", "(", ")", ".", " ", "x", "JAVA", "Script", "++", "my"]
+    matcher = KeywordMatcher(VOCAB)
+    for _ in range(2000):
+        text = "".join(rng.choice(VOCAB + filler) + rng.choice(["", " ", ", ", "/"]) for _ in range(rng.randint(0, 12)))
+        assert matcher.find(text) == _regex_reference(text, VOCAB), text
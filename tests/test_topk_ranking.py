@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from batch_scoring import SkillMatrix
+from benchmarks.synthetic import random_profile, random_jd
+from topk_ranking import top_k_matches
+
+K_VALUES = (1, 5, 20, 100)
+
+
+def _import(db, source, profiles):
+    return db.save_import_batch(source, [{
+        "item": str(i), "name": f"Candidate {i}", "email": f"c{i}@example.com", "phone": "",
+        "file_path": "", "summary": "", "text_sha256": None, "text": None, "analysis": p,
+    } for i, p in enumerate(profiles)])
+
+
+def _assert_same_as_full_sort(rng, ids, profiles, jds=30):
+    """top_k_matches == first k rows of a full SkillMatrix sort (score DESC, id DESC)"""
+    matrix = SkillMatrix.from_profiles(zip(ids, profiles))
+    for _ in range(jds):
+        jd = random_jd(rng)
+        scores = matrix.score(jd)
+        full = sorted(zip(scores.percentages.tolist(), ids, range(len(ids))), reverse=True)
+        for k in K_VALUES:
+            got = [(r["match_percentage"], r["id"], r["matched_skills"]) for r in top_k_matches(jd, k)]
+            # Koi required skill nahi = sabka 0%, ranking nahi
+            want = [(pct, rid, scores.matched_skills(row)) for pct, rid, row in full[:k]] if jd.get("skills") else []
+            assert got == want, f"k={k} jd={jd}"
+
+
+@pytest.fixture
+def rng():
+    return random.Random(11)
+
+
+def test_top_k_matches_full_sort_parity(temp_db, rng):
+    profiles = [random_profile(rng) for _ in range(1500)]
+    ids = _import(temp_db, "topk", profiles)
+    _assert_same_as_full_sort(rng, ids, profiles)
+
+
+def test_top_k_matches_after_skill_changes(temp_db, rng):
+    """In-memory skill counts follow re-analyzed and newly imported resumes (changelog deltas)"""
+    profiles = [random_profile(rng) for _ in range(1500)]
+    ids = _import(temp_db, "topk", profiles)
+    _assert_same_as_full_sort(rng, ids, profiles, jds=5)   # counts load ho jayein
+
+    for i in rng.sample(range(len(ids)), 150):
+        profiles[i] = random_profile(rng)
+        if i % 5 == 0:
+            profiles[i]["skills"] = []
+        temp_db.save_resume_analysis(ids[i], profiles[i])
+    extra = [random_profile(rng) for _ in range(150)]
+    ids += _import(temp_db, "topk-extra", extra)
+    profiles += extra
+
+    _assert_same_as_full_sort(rng, ids, profiles)
+
+
+def test_top_k_matches_reloads_after_changelog_prune(temp_db, rng):
+    profiles = [random_profile(rng) for _ in range(300)]
+    ids = _import(temp_db, "topk", profiles)
+    _assert_same_as_full_sort(rng, ids, profiles, jds=3)
+
+    temp_db.prune_resume_skill_changes(0)
+    profiles[0] = random_profile(rng)
+    temp_db.save_resume_analysis(ids[0], profiles[0])
+    _assert_same_as_full_sort(rng, ids, profiles, jds=10)